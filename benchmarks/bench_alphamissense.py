@@ -0,0 +1,88 @@
+"""Benchmark AlphaMissense lookups from the local SQLite store against parsing the CSV.
+
+Usage:
+    python benchmarks/bench_alphamissense.py [--residues 2000] [--repeat 200]
+
+Writes an AlphaMissense CSV with every substitution of a synthetic protein,
+loads it into the store once, and compares single-variant and residue-range
+lookups with parsing the CSV into dictionaries on every request.
+"""
+
+import argparse
+import csv
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from mcp_alphafold.tools.alphamissense import AlphaMissenseStore
+from mcp_alphafold.utils.store import StoredFile
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def write_csv(path: Path, n_residues: int) -> int:
+    rng = np.random.default_rng(0)
+    sequence = rng.choice(list(AMINO_ACIDS), size=n_residues)
+    rows = 0
+    with open(path, "w") as fh:
+        fh.write("protein_variant,am_pathogenicity,am_class\n")
+        for position, ref in enumerate(sequence, start=1):
+            for alt in AMINO_ACIDS:
+                if alt != ref:
+                    score = rng.uniform()
+                    am_class = "LPath" if score > 0.564 else "Amb" if score > 0.34 else "LBen"
+                    fh.write(f"{ref}{position}{alt},{score:.4f},{am_class}\n")
+                    rows += 1
+    return rows
+
+
+def lookup_with_csv(path: Path, variant: str) -> Any:
+    """Reference lookup that parses the whole CSV into dictionaries."""
+    with open(path, newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    return [row for row in rows if row["protein_variant"] == variant]
+
+
+def timeit(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--residues", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "am.csv"
+        rows = write_csv(csv_path, args.residues)
+        stored = StoredFile(
+            url="bench", sha256="0" * 64, size=csv_path.stat().st_size, path=str(csv_path), fetched_at=0
+        )
+        store = AlphaMissenseStore(str(Path(tmp) / "alphamissense.sqlite3"))
+        print(f"AlphaMissense CSV: {rows} variants, {stored.size / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        store.load("P12345", "protein", stored)
+        print(f"  load once: {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+        variant = store.protein_variants("P12345", start=args.residues // 2, limit=1)[0]["variant"]
+        parse = timeit(lambda: lookup_with_csv(csv_path, variant), max(1, args.repeat // 20))
+        single = timeit(lambda: store.protein_variants("P12345", variants=[variant]), args.repeat)
+        window = timeit(lambda: store.protein_variants("P12345", start=100, end=110), args.repeat)
+        print(f"  csv parse per lookup: {parse * 1000:9.2f} ms")
+        print(f"  store single variant: {single * 1e6:9.1f} µs")
+        print(f"  store 11-residue range: {window * 1e6:7.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
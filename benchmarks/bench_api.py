@@ -0,0 +1,185 @@
+"""Benchmark request_api against a local stand-in AlphaFold API.
+
+Usage:
+    python benchmarks/bench_api.py [--requests 1000] [--concurrency 32] [--latency 0.005] [--jitter 0.005]
+                                   [--error-rate 0] [--scale 20] [--save-baseline] [--check]
+
+Starts the fake AlphaFold API of `mcp_alphafold.fake_api` in a separate process
+on a free local port and measures throughput and p50/p99 latency of:
+- cache misses, fetched from the fake API with the configured latency, jitter and error rate
+- cache hits from the memory tier (validated models) and from the disk tier
+- parsing of UniProt summary and annotations payloads enlarged `--scale` times
+
+Results are compared with the baseline in `benchmarks/baselines/bench_api.json`,
+recorded with `--save-baseline`. With `--check`, the script exits with status 1
+when throughput drops or p99 latency rises by more than `--tolerance`.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from mcp_alphafold.fake_api import load_payloads, run_fake_api
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.alphafold import RemoteBackend
+from mcp_alphafold.tools.models import AnnotationResponse, UniprotSummaryResponse
+from mcp_alphafold.utils import http
+from mcp_alphafold.utils.http import close_cache, close_http_client, parse_response
+
+BASELINE = Path(__file__).parent / "baselines" / "bench_api.json"
+BASELINE_OPTIONS = ("requests", "concurrency", "latency", "jitter", "error_rate", "scale")
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    return {
+        "throughput": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 4),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 4),
+        "errors": errors,
+    }
+
+
+async def run_requests(
+    request: Callable[[str], Awaitable[Tuple[Any, Any]]],
+    accessions: List[str],
+    concurrency: int,
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(accessions)
+
+    async def worker() -> None:
+        nonlocal errors
+        for accession in pending:
+            start = time.perf_counter()
+            _, error = await request(accession)
+            latencies.append(time.perf_counter() - start)
+            errors += error is not None
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def run_parse(content: str, model_type: Any, repeat: int) -> Dict[str, float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model, error = parse_response(200, content, model_type)
+        latencies.append(time.perf_counter() - start)
+        assert error is None and model is not None
+    return summarize(latencies, sum(latencies))
+
+
+async def run_benchmarks(base_url: str, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    backend = RemoteBackend(base_url)
+    accessions = [f"Q{i:05d}" for i in range(args.requests)]
+    results = {}
+
+    results["miss"] = await run_requests(backend.get_prediction, accessions, args.concurrency)
+    results["memory hit"] = await run_requests(backend.get_prediction, accessions, args.concurrency)
+
+    # Without the memory tier, every request reads and validates the disk entry
+    settings.MEMORY_CACHE_MAX_ENTRIES = 0
+    http._memory_cache = None
+    results["disk hit"] = await run_requests(backend.get_prediction, accessions, args.concurrency)
+
+    payloads = load_payloads(args.scale)
+    repeat = max(10, args.requests // 20)
+    results[f"parse uniprot summary x{args.scale}"] = run_parse(
+        payloads["uniprot_summary"], UniprotSummaryResponse, repeat
+    )
+    results[f"parse annotations x{args.scale}"] = run_parse(payloads["annotations"], AnnotationResponse, repeat)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Optional[Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """Print the results next to the baseline and return the regressions."""
+    regressions = []
+    base_results = (baseline or {}).get("results", {})
+    print(f"{'scenario':>28} | {'req/s':>10} | {'p50 ms':>9} | {'p99 ms':>9} | errors | vs baseline")
+    for name, result in results.items():
+        base = base_results.get(name)
+        delta = ""
+        if base:
+            throughput = result["throughput"] / base["throughput"] - 1
+            p99 = result["p99_ms"] / base["p99_ms"] - 1 if base["p99_ms"] else 0.0
+            delta = f"req/s {throughput:+.0%}, p99 {p99:+.0%}"
+            if throughput < -tolerance or p99 > tolerance:
+                regressions.append(name)
+                delta += "  REGRESSION"
+        print(
+            f"{name:>28} | {result['throughput']:>10.1f} | {result['p50_ms']:>9.3f} | {result['p99_ms']:>9.3f} | "
+            f"{int(result['errors']):>6} | {delta}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds before each fake API response")
+    parser.add_argument("--jitter", type=float, default=0.005, help="largest random delay added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake API requests failing with 503")
+    parser.add_argument("--scale", type=int, default=20, help="enlarge the payloads parsed this many times")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="record the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative change before a regression")
+    args = parser.parse_args()
+
+    # The stand-in API is local: no rate limit, no circuit breaker
+    settings.UPSTREAM_RATE_LIMIT = 0
+    settings.UPSTREAM_MAX_IN_FLIGHT = 0
+    settings.CIRCUIT_FAILURE_THRESHOLD = 0
+    options = {name: getattr(args, name) for name in BASELINE_OPTIONS}
+
+    fake_api = run_fake_api(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=0)
+    with tempfile.TemporaryDirectory() as tmp, fake_api as base_url:
+        settings.CACHE_DIR = tmp
+
+        async def run() -> Dict[str, Dict[str, float]]:
+            try:
+                return await run_benchmarks(base_url, args)
+            finally:
+                await close_http_client()
+
+        results = asyncio.run(run())
+        close_cache()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline and baseline.get("options") != options:
+        print(f"Baseline was recorded with {baseline.get('options')}, not comparing")
+        baseline = None
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "options": options,
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(record, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+    elif args.check and regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark compressed cache values: bytes saved and hit latency.
+
+Usage:
+    python benchmarks/bench_cache.py [--structures 300] [--residues 2000] [--repeat 200]
+
+Builds a UniProt summary with many structures and an AlphaMissense annotation
+response, stores them in a temporary disk cache with every available codec,
+and reports the stored size, the write time and the latency of a disk hit
+(read and decompress).
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils import compression, http
+from mcp_alphafold.utils.http import cache_response, close_cache, get_cache, get_cache_entry
+
+
+def make_uniprot_summary(n_structures: int) -> str:
+    structures = [
+        {
+            "summary": {
+                "model_identifier": f"{i:04d}",
+                "model_category": "EXPERIMENTALLY DETERMINED",
+                "model_url": f"https://www.ebi.ac.uk/pdbe/static/entry/{i:04d}_updated.cif",
+                "model_format": "MMCIF",
+                "model_page_url": f"https://www.ebi.ac.uk/pdbe/entry/pdb/{i:04d}",
+                "provider": "PDBe",
+                "created": "2020-01-01",
+                "sequence_identity": 1.0,
+                "uniprot_start": 1 + i % 50,
+                "uniprot_end": 500 + i % 300,
+                "coverage": round(0.5 + (i % 50) / 100, 2),
+                "experimental_method": "X-RAY DIFFRACTION",
+                "resolution": round(1.5 + (i % 20) / 10, 1),
+                "confidence_type": "pLDDT",
+                "entities": [
+                    {
+                        "entity_type": "POLYMER",
+                        "entity_poly_type": "POLYPEPTIDE(L)",
+                        "identifier": "P00520",
+                        "identifier_category": "UNIPROT",
+                        "description": "Tyrosine-protein kinase ABL1",
+                        "chain_ids": ["A", "B"],
+                    }
+                ],
+            }
+        }
+        for i in range(n_structures)
+    ]
+    return json.dumps({"uniprot_entry": {"ac": "P00520", "id": "ABL1_MOUSE"}, "structures": structures})
+
+
+def make_annotations(n_residues: int) -> str:
+    rng = np.random.default_rng(0)
+    scores = rng.uniform(0, 1, size=n_residues).round(4).tolist()
+    return json.dumps({
+        "accession": "P00520",
+        "id": "ABL1_MOUSE",
+        "sequence": "M" * n_residues,
+        "annotation": [
+            {
+                "type": "MUTAGEN",
+                "description": "AlphaMissense",
+                "source_name": "AlphaMissense",
+                "evidence": "COMPUTATIONAL/PREDICTED",
+                "regions": [{"start": 1, "end": n_residues, "annotation_value": scores}],
+            }
+        ],
+    })
+
+
+def timeit(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--structures", type=int, default=300)
+    parser.add_argument("--residues", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads: Dict[str, str] = {
+        "uniprot summary": make_uniprot_summary(args.structures),
+        "annotations": make_annotations(args.residues),
+    }
+    codecs = ["none", "zlib"] + (["zstd"] if compression.zstandard is not None else [])
+    if compression.zstandard is None:
+        print("zstandard is not installed; install the 'zstd' extra to compare it")
+
+    for name, content in payloads.items():
+        print(f"{name}: {len(content) / 1e3:.1f} kB")
+        for codec in codecs:
+            with tempfile.TemporaryDirectory() as tmp:
+                settings.CACHE_DIR = tmp
+                settings.CACHE_COMPRESSION = codec  # type: ignore[assignment]
+                http._cache = None
+                key = f"bench:{codec}"
+                write = timeit(
+                    lambda key=key, content=content: cache_response(key, content, 3600, memory=False), args.repeat
+                )
+                stored = get_cache().get(key)
+                read = timeit(lambda key=key: get_cache_entry(key, memory=False), args.repeat)
+                assert get_cache_entry(key, memory=False)[0] == content
+                close_cache()
+            print(
+                f"  {codec:>4}: stored {len(stored) / 1e3:7.1f} kB ({len(stored) / len(content):6.1%}) | "
+                f"write {write * 1000:6.2f} ms | disk hit {read * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
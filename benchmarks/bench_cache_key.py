@@ -0,0 +1,85 @@
+"""Benchmark cache key generation: legacy SHA-256 keys against normalized BLAKE2b keys.
+
+Usage:
+    python benchmarks/bench_cache_key.py [--requests 10000] [--repeat 5]
+
+Generates the cache keys of the prediction, UniProt summary and annotations
+requests of many accessions, as `request_api` does on every call, and reports
+the time per key and the number of distinct keys produced for requests that
+only differ in spelling (accession case, parameter order, host case).
+"""
+
+import argparse
+import hashlib
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp_alphafold.tools.alphafold import RemoteBackend
+from mcp_alphafold.utils.http import generate_cache_key
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def legacy_cache_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """The cache key used before requests were normalized."""
+    key_source = f"{method.upper()}:{url}:{json.dumps(params, sort_keys=True)}"
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+def make_requests(n_requests: int) -> List[Request]:
+    backend = RemoteBackend()
+    requests: List[Request] = []
+    for i in range(n_requests // 3 + 1):
+        accession = f"Q{i:05d}"
+        for request in (
+            backend.prediction_request(accession),
+            backend.uniprot_summary_request(accession),
+            backend.annotations_request(accession, "MUTAGEN"),
+        ):
+            requests.append(("GET", *request))
+    return requests[:n_requests]
+
+
+def make_variants() -> List[Request]:
+    """Spellings of the same annotations request."""
+    url = "https://alphafold.ebi.ac.uk/api/annotations/P00520"
+    return [
+        ("GET", url, {"annotation_type": "MUTAGEN"}),
+        ("get", url, {"annotation_type": "MUTAGEN"}),
+        ("GET", f"{url}?annotation_type=MUTAGEN", None),
+        ("GET", "https://AlphaFold.EBI.ac.uk:443/api/annotations/P00520", {"annotation_type": "MUTAGEN"}),
+        ("GET", *RemoteBackend().annotations_request(" p00520 ", "MUTAGEN")),
+    ]
+
+
+def timeit(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    requests = make_requests(args.requests)
+    variants = make_variants()
+    print(f"{len(requests)} requests")
+    for name, key_fn in (("legacy sha256", legacy_cache_key), ("blake2b", generate_cache_key)):
+        elapsed = timeit(lambda key_fn=key_fn: [key_fn(*request) for request in requests], args.repeat)
+        distinct = len({key_fn(*variant) for variant in variants})
+        print(
+            f"  {name:>13}: {elapsed / len(requests) * 1e6:6.2f} us/key | "
+            f"{distinct} distinct keys for {len(variants)} spellings of one request"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark PAE conversion and memory-mapped block reads on a large synthetic matrix.
+
+Usage:
+    python benchmarks/bench_pae.py [--residues 2000] [--repeat 5]
+
+Writes a PAE JSON file in the AlphaFold format, converts it with the streaming
+parser and with `json.load`, and reports time and peak traced memory. Then
+times block reads and domain statistics on the stored float16 and uint8 files.
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Tuple
+
+import numpy as np
+
+from mcp_alphafold.tools.pae import PaeMatrix, encode_pae, parse_pae
+
+
+def write_pae(path: Path, n_residues: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    matrix = (np.round(rng.uniform(0, 31.75, size=(n_residues, n_residues)) * 4) / 4).astype(np.float32)
+    with open(path, "w") as fh:
+        json.dump([{"predicted_aligned_error": matrix.tolist(), "max_predicted_aligned_error": 31.75}], fh)
+    return matrix
+
+
+def parse_with_json(path: Path) -> np.ndarray:
+    """Reference conversion that loads the whole document into Python lists."""
+    with open(path) as fh:
+        return np.array(json.load(fh)[0]["predicted_aligned_error"], dtype=np.float32)
+
+
+def parse_streaming(path: Path) -> np.ndarray:
+    with open(path, "rb") as fh:
+        return parse_pae(fh)
+
+
+def measure(fn: Callable[[], Any]) -> Tuple[float, float]:
+    """Return the run time in seconds and peak traced memory in MB of a call.
+
+    Tracing slows allocations down, so time and memory are measured in separate runs.
+    """
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def timeit(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--residues", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    n = args.residues
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "pae.json"
+        matrix = write_pae(json_path, n)
+        np.testing.assert_array_equal(parse_streaming(json_path), matrix)
+        print(f"PAE JSON: {n}x{n}, {json_path.stat().st_size / 1e6:.1f} MB")
+
+        for name, fn in (("streaming", parse_streaming), ("json.load", parse_with_json)):
+            elapsed, peak = measure(lambda fn=fn: fn(json_path))
+            print(f"  convert {name:>9}: {elapsed * 1000:7.1f} ms, peak {peak:6.1f} MB")
+
+        half = n // 2
+        for dtype in ("float16", "uint8"):
+            npy_path = Path(tmp) / f"pae.{dtype}.npy"
+            np.save(npy_path, encode_pae(matrix, dtype))
+            open_time = timeit(lambda npy_path=npy_path: PaeMatrix(npy_path), args.repeat)
+            pae = PaeMatrix(npy_path)
+            block = timeit(lambda pae=pae: pae.block(slice(0, 256), slice(half, half + 256)), args.repeat)
+            overview = timeit(lambda pae=pae: pae.block(slice(0, n, 10), slice(0, n, 10)), args.repeat)
+            stats = timeit(lambda pae=pae: pae.block_stats((1, half), (half + 1, n)), args.repeat)
+            print(
+                f"  {dtype:>7}: {npy_path.stat().st_size / 1e6:5.1f} MB | open {open_time * 1000:5.2f} ms | "
+                f"256x256 block {block * 1000:5.2f} ms | stride-10 overview {overview * 1000:5.2f} ms | "
+                f"domain stats {stats * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark the cold start of the server launched by an MCP client over stdio.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 850] [--check] [--importtime 15]
+
+Launches `python -m mcp_alphafold --transport stdio` the way MCP clients do,
+sends `initialize` then `tools/list`, and reports the median time from the
+launch to each response. With `--check`, exits with an error when the median
+time to `initialize` exceeds the budget. With `--importtime`, also lists the
+modules with the largest cumulative import time, from `python -X importtime`.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import IO, Any, Dict, List, Tuple
+
+SERVER_ARGS = ["-m", "mcp_alphafold", "--transport", "stdio"]
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "bench", "version": "0"}},
+}
+
+
+def send(stdin: IO[bytes], message: Dict[str, Any]) -> None:
+    stdin.write((json.dumps(message) + "\n").encode())
+    stdin.flush()
+
+
+def launch() -> Tuple[float, float]:
+    """Return the seconds from the launch to the `initialize` and `tools/list` responses."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *SERVER_ARGS], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    assert process.stdin is not None and process.stdout is not None
+    try:
+        send(process.stdin, INITIALIZE)
+        json.loads(process.stdout.readline())
+        initialized = time.perf_counter() - start
+
+        send(process.stdin, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(process.stdin, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = json.loads(process.stdout.readline())["result"]["tools"]
+        listed = time.perf_counter() - start
+        assert tools, "the server lists no tools"
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return initialized, listed
+
+
+def import_times(top: int) -> List[Tuple[float, str]]:
+    """
+    Return the largest cumulative import times of the server, in ms.
+
+    Third-party modules are grouped by top-level package, the modules of
+    `mcp_alphafold` are listed on their own.
+    """
+    script = "import mcp_alphafold.__main__, mcp_alphafold.server; mcp_alphafold.server.AlphaFoldMCP()"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True)
+    times: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        if not name.startswith("mcp_alphafold."):
+            name = name.split(".")[0]
+        times[name] = max(times.get(name, 0.0), int(cumulative) / 1000)
+    return sorted(((ms, name) for name, ms in times.items()), reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=850.0, help="budget of the median time to initialize")
+    parser.add_argument("--check", action="store_true", help="exit with an error when the budget is exceeded")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="list the N slowest imports")
+    args = parser.parse_args()
+
+    launch()  # warm the filesystem cache and the bytecode
+    runs = [launch() for _ in range(args.runs)]
+    initialize_ms = statistics.median(run[0] for run in runs) * 1000
+    tools_ms = statistics.median(run[1] for run in runs) * 1000
+    print(f"{'initialize':>12} | {initialize_ms:>9.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"{'tools/list':>12} | {tools_ms:>9.1f} ms")
+
+    if args.importtime:
+        print(f"\n{'cumulative':>12} | module")
+        for cumulative, name in import_times(args.importtime):
+            print(f"{cumulative:>9.1f} ms | {name}")
+
+    if args.check and initialize_ms > args.budget_ms:
+        sys.exit(f"Startup regression: initialize took {initialize_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
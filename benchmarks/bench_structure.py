@@ -0,0 +1,140 @@
+"""Benchmark the structure parser on large synthetic AlphaFold models.
+
+Usage:
+    python benchmarks/bench_structure.py [--residues 2700] [--repeat 5]
+
+Writes an mmCIF and a PDB model with the layout of AlphaFold model files and
+compares the vectorized parser with a line-by-line parser that builds Python
+objects for every atom.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+from mcp_alphafold.tools.structure import parse_model_file
+
+RESIDUE_ATOMS = ["N", "CA", "C", "O", "CB", "CG", "CD", "CE"]
+ATOM_SITE_ITEMS = [
+    "group_PDB",
+    "id",
+    "type_symbol",
+    "label_atom_id",
+    "label_alt_id",
+    "label_comp_id",
+    "label_asym_id",
+    "label_entity_id",
+    "label_seq_id",
+    "pdbx_PDB_ins_code",
+    "Cartn_x",
+    "Cartn_y",
+    "Cartn_z",
+    "occupancy",
+    "B_iso_or_equiv",
+    "pdbx_formal_charge",
+    "auth_seq_id",
+    "auth_comp_id",
+    "auth_asym_id",
+    "auth_atom_id",
+    "pdbx_PDB_model_num",
+]
+
+
+def write_models(directory: Path, n_residues: int) -> List[Path]:
+    """Write a synthetic model with `n_residues` residues as mmCIF and PDB."""
+    rng = np.random.default_rng(0)
+    coords = rng.uniform(-99, 99, size=(n_residues * len(RESIDUE_ATOMS), 3))
+    plddt = rng.uniform(20, 99, size=n_residues)
+
+    cif_lines = ["data_AF-BENCH-F1", "#", "loop_"] + [f"_atom_site.{item}" for item in ATOM_SITE_ITEMS]
+    pdb_lines = ["HEADER    SYNTHETIC MODEL"]
+    for i, (x, y, z) in enumerate(coords):
+        residue = i // len(RESIDUE_ATOMS) + 1
+        atom = RESIDUE_ATOMS[i % len(RESIDUE_ATOMS)]
+        b = plddt[residue - 1]
+        cif_lines.append(
+            f"ATOM {i + 1} {atom[0]} {atom:<3} . LYS A 1 {residue} ? {x:.3f} {y:.3f} {z:.3f} 1.0 {b:.2f} ? "
+            f"{residue} LYS A {atom:<3} 1"
+        )
+        pdb_lines.append(
+            f"ATOM  {i + 1:5d}  {atom:<3} LYS A{residue:4d}    {x:8.3f}{y:8.3f}{z:8.3f}  1.00{b:6.2f}           {atom[0]}"
+        )
+    cif_lines.append("#")
+    pdb_lines.append("END")
+
+    cif_path = directory / "model.cif"
+    pdb_path = directory / "model.pdb"
+    cif_path.write_text("\n".join(cif_lines) + "\n")
+    pdb_path.write_text("\n".join(pdb_lines) + "\n")
+    return [cif_path, pdb_path]
+
+
+def parse_line_by_line(path: Path) -> np.ndarray:
+    """Reference parser that splits every line and keeps a dict per atom."""
+    atoms = []
+    columns: List[str] = []
+    with open(path) as fh:
+        for line in fh:
+            if line.startswith("_atom_site."):
+                columns.append(line.strip()[len("_atom_site.") :])
+            elif line.startswith("ATOM"):
+                if path.suffix == ".pdb":
+                    atom = {
+                        "name": line[12:16].strip(),
+                        "x": float(line[30:38]),
+                        "y": float(line[38:46]),
+                        "z": float(line[46:54]),
+                        "b": float(line[60:66]),
+                    }
+                else:
+                    row = dict(zip(columns, line.split(), strict=False))
+                    atom = {
+                        "name": row["label_atom_id"],
+                        "x": float(row["Cartn_x"]),
+                        "y": float(row["Cartn_y"]),
+                        "z": float(row["Cartn_z"]),
+                        "b": float(row["B_iso_or_equiv"]),
+                    }
+                atoms.append(atom)
+    return np.array([[a["x"], a["y"], a["z"]] for a in atoms], dtype=np.float32)
+
+
+def timeit(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--residues", type=int, default=2700)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if not 0 < args.residues <= 9999:
+        parser.error("--residues must be between 1 and 9999 to fit the PDB residue number columns")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in write_models(Path(tmp), args.residues):
+            model = parse_model_file(path)
+            np.testing.assert_allclose(model.coords, parse_line_by_line(path), rtol=1e-6)
+
+            vectorized = timeit(lambda path=path: parse_model_file(path), args.repeat)
+            line_by_line = timeit(lambda path=path: parse_line_by_line(path), args.repeat)
+            size_mb = path.stat().st_size / 1e6
+            print(
+                f"{path.suffix[1:]:>5}: {args.residues} residues, {model.n_atoms} atoms, {size_mb:.1f} MB | "
+                f"vectorized {vectorized * 1000:7.1f} ms | line-by-line {line_by_line * 1000:7.1f} ms | "
+                f"{line_by_line / vectorized:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
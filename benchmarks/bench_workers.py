@@ -0,0 +1,78 @@
+"""Benchmark the throughput of the streamable-http server with an increasing number of worker processes.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1,2,4] [--sessions 32] [--duration 10] [--warmup 3]
+                                       [--mix get_annotations] [--scale 20] [--accessions 50]
+
+Starts the fake AlphaFold API of `mcp_alphafold.fake_api`, then for each worker
+count a local server with `SERVER_WORKERS` workers, and loads it with
+`mcp_alphafold.loadtest`. The memory cache is disabled and the payloads are
+enlarged `--scale` times, so every call reads the disk cache and validates a
+large response: the work is CPU-bound and spreads over the workers. After a
+warmup filling the disk cache, throughput and p50/p99 latency are reported
+with the speedup over one worker.
+
+The load generator runs in this process and competes with the workers for the
+cores, so the speedup flattens before the core count is reached.
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Any, Dict, List
+
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+from mcp_alphafold.fake_api import run_fake_api
+from mcp_alphafold.loadtest import parse_mix, run_load_test, run_local_server
+
+
+def default_workers() -> str:
+    cores = os.cpu_count() or 1
+    return ",".join(str(n) for n in (1, 2, 4, 8, 16) if n == 1 or n <= cores)
+
+
+def load(url: str, accessions: List[str], args: argparse.Namespace, duration: float) -> Dict[str, Any]:
+    return asyncio.run(
+        run_load_test(
+            lambda: Client(StreamableHttpTransport(url)),
+            accessions,
+            sessions=args.sessions,
+            duration=duration,
+            mix=parse_mix(args.mix),
+            seed=0,
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default=default_workers(), help="comma-separated worker counts")
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per worker count")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of load before measuring")
+    parser.add_argument("--mix", default="get_annotations", help="tool mix, see `mcp-alphafold loadtest --help`")
+    parser.add_argument("--scale", type=int, default=20, help="enlarge the fake API payloads this many times")
+    parser.add_argument("--accessions", type=int, default=50, help="distinct accessions requested")
+    args = parser.parse_args()
+
+    accessions = [f"Q{i:05d}" for i in range(args.accessions)]
+    print(f"{os.cpu_count()} cores, {args.sessions} sessions, {args.mix} at x{args.scale}")
+    print(f"{'workers':>8} | {'calls/s':>9} | {'p50 ms':>9} | {'p99 ms':>9} | {'errors':>6} | speedup")
+    baseline = None
+    with run_fake_api(scale=args.scale, seed=0) as api_url:
+        for workers in (int(n) for n in args.workers.split(",")):
+            environ = {"SERVER_WORKERS": str(workers), "MEMORY_CACHE_MAX_ENTRIES": "0", "METRICS_ENABLED": "false"}
+            with run_local_server(api_url, environ) as url:
+                load(url, accessions, args, args.warmup)
+                total = load(url, accessions, args, args.duration)["total"]
+            baseline = baseline or total["throughput"]
+            print(
+                f"{workers:>8} | {total['throughput']:>9.1f} | {total['p50_ms']:>9.2f} | {total['p99_ms']:>9.2f} | "
+                f"{total['error'] + total['exception']:>6} | x{total['throughput'] / baseline:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
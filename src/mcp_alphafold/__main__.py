@@ -1,11 +1,49 @@
 """Main entry point for the AlphaFold MCP server."""
 
 import sys
+from typing import Dict, List, Optional, Union
 
-from mcp_alphafold.cli import app  # type: ignore
+# Options of the default command, served without loading the command-line interface
+SERVE_OPTIONS = {"--host": str, "--port": int, "--name": str, "--transport": str, "--workers": int}
+
+
+def parse_serve_args(args: List[str]) -> Optional[Dict[str, Union[str, int]]]:
+    """
+    Parse the arguments of a plain server launch, e.g. `--transport stdio`.
+
+    Returns:
+        The keyword arguments of `serve`, or None if the arguments need the
+        full command-line interface (a command, `--help` or an invalid value)
+    """
+    options: Dict[str, Union[str, int]] = {}
+    remaining = list(args)
+    while remaining:
+        option, _, value = remaining.pop(0).partition("=")
+        if option not in SERVE_OPTIONS:
+            return None
+        if not _:
+            if not remaining:
+                return None
+            value = remaining.pop(0)
+        try:
+            options[option[2:]] = SERVE_OPTIONS[option](value)
+        except ValueError:
+            return None
+    return options
 
 
 def main():
+    # Starting the server directly spares MCP clients the import of typer and
+    # the other commands on every launch
+    options = parse_serve_args(sys.argv[1:])
+    if options is not None:
+        from mcp_alphafold.server import serve
+
+        serve(**options)
+        return
+
+    from mcp_alphafold.cli import app
+
     try:
         app(standalone_mode=True)
     except SystemExit as e:
@@ -1,21 +1,39 @@
 # type: ignore
 """Command-line interface for the AlphaFold MCP server."""
 
+import asyncio
+import json
 import logging
-import sys
-from typing import Optional, cast
+from pathlib import Path
+from typing import Dict, List, Optional
 
 import typer
 
-from mcp_alphafold.server import AlphaFoldMCP
+from mcp_alphafold.loadtest import (
+    DEFAULT_MIX,
+    LOADTEST_TOOLS,
+    metrics_url_for,
+    parse_mix,
+    run_load_test,
+    run_local_server,
+)
 from mcp_alphafold.settings import settings
+from mcp_alphafold.utils.http import close_cache, get_cache_info, prune_cache, vacuum_cache
+from mcp_alphafold.utils.store import close_file_store, get_file_store
+from mcp_alphafold.warm import WARM_ENDPOINTS, WARM_STATUSES, read_accessions, warm_cache
+
+# The server and the stand-in API are imported by their commands, so that the
+# other commands do not load the tools and their dependencies
 
 logger = logging.getLogger(__name__)
 app = typer.Typer()
+cache_app = typer.Typer(help="Inspect and maintain the on-disk response cache.")
+app.add_typer(cache_app, name="cache")
 
 
-@app.command()
+@app.callback(invoke_without_command=True)
 def run(
+    ctx: typer.Context,
     host: Optional[str] = None,
     port: Optional[int] = None,
     name: Optional[str] = None,
@@ -23,23 +41,269 @@ def run(
         None,
         help="Transport mode for MCP server; can be 'stdio' or 'streamable-http'",
     ),
+    workers: Optional[int] = typer.Option(
+        None,
+        help="Worker processes serving the streamable-http transport; defaults to SERVER_WORKERS",
+    ),
 ) -> None:
     """Run the AlphaFold MCP server."""
+    if ctx.invoked_subcommand is not None:
+        return
+
+    from mcp_alphafold.server import serve
+
+    serve(host=host, port=port, name=name, transport=transport, workers=workers)
+
+
+@app.command()
+def warm(
+    accessions_file: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        help="File with one UniProt accession per line, e.g. a whole proteome",
+    ),
+    endpoint: List[str] = typer.Option(
+        list(WARM_ENDPOINTS),
+        help="Endpoint to warm: 'prediction', 'summary' or 'annotations'; repeat for several",
+    ),
+    annotation_type: str = typer.Option("MUTAGEN", help="Annotation type requested from the annotations endpoint"),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        help="Number of accessions processed at once; defaults to BATCH_MAX_CONCURRENCY",
+    ),
+    rate_limit: Optional[float] = typer.Option(
+        None,
+        help="Upstream requests per second; defaults to UPSTREAM_RATE_LIMIT",
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only report how many responses are already cached"),
+) -> None:
+    """Pre-populate the response cache for a list of accessions.
+
+    Cached responses are skipped, so an interrupted run resumes where it stopped.
+    """
+    if settings.BACKEND != "remote":
+        typer.echo("Cache warming only applies to the remote backend", err=True)
+        raise typer.Exit(code=1)
+    unknown = set(endpoint) - set(WARM_ENDPOINTS)
+    if unknown:
+        raise typer.BadParameter(f"Unknown endpoints: {', '.join(sorted(unknown))}", param_hint="--endpoint")
+    if rate_limit is not None:
+        settings.UPSTREAM_RATE_LIMIT = rate_limit
+
+    accessions = read_accessions(accessions_file)
+    with typer.progressbar(length=len(accessions), label="Checking" if dry_run else "Warming") as progress:
+        counts = asyncio.run(
+            warm_cache(
+                accessions,
+                endpoints=endpoint,
+                annotation_type=annotation_type,
+                max_concurrency=concurrency,
+                dry_run=dry_run,
+                on_progress=lambda accession, statuses: progress.update(1),
+            )
+        )
+    _print_warm_counts(len(accessions), counts)
+
+
+def _print_warm_counts(total: int, counts: Dict[str, Dict[str, int]]) -> None:
+    statuses = [status for status in WARM_STATUSES if any(row[status] for row in counts.values())]
+    typer.echo(f"{total} accessions")
+    typer.echo(f"{'endpoint':<12}" + "".join(f"{status:>10}" for status in statuses))
+    for endpoint, row in counts.items():
+        typer.echo(f"{endpoint:<12}" + "".join(f"{row[status]:>10}" for status in statuses))
+
+
+@app.command("fake-api")
+def fake_api(
+    host: str = typer.Option("127.0.0.1", help="Host to bind to"),
+    port: int = typer.Option(8500, help="Port to bind to"),
+    fd: Optional[int] = typer.Option(None, hidden=True, help="Serve on an inherited listening socket"),
+    latency: float = typer.Option(0.0, help="Seconds before each response"),
+    jitter: float = typer.Option(0.0, help="Largest random delay added to the latency, in seconds"),
+    error_rate: float = typer.Option(0.0, help="Fraction of requests answered with --error-status"),
+    error_status: int = typer.Option(503, help="Status code of injected errors"),
+    scale: int = typer.Option(1, help="Enlarge the UniProt summary and annotations payloads this many times"),
+    seed: Optional[int] = typer.Option(None, help="Seed of the jitter and error injection"),
+) -> None:
+    """Serve a local stand-in for the AlphaFold API, for benchmarks and load tests."""
+    from mcp_alphafold.fake_api import FakeAlphaFoldAPI, serve_fake_api
+
+    api = FakeAlphaFoldAPI(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        error_status=error_status,
+        scale=scale,
+        seed=seed,
+    )
+    if fd is None:
+        typer.echo(f"Serving the fake AlphaFold API, set ALPHAFOLD_API_URL=http://{host}:{port}/api")
+    serve_fake_api(api, host=host, port=port, fd=fd)
+
+
+@app.command()
+def loadtest(
+    url: Optional[str] = typer.Option(
+        None,
+        help="MCP endpoint to load, e.g. http://127.0.0.1:8000/mcp/; "
+        "by default a local server is started against the stand-in AlphaFold API",
+    ),
+    sessions: int = typer.Option(16, help="Number of concurrent MCP sessions"),
+    duration: float = typer.Option(30.0, help="Seconds during which tools are called"),
+    mix: str = typer.Option(
+        DEFAULT_MIX,
+        help=f"Relative weight of each tool, from: {', '.join(LOADTEST_TOOLS)}",
+    ),
+    accessions_file: Optional[Path] = typer.Option(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="File with the UniProt accessions to request, one per line; needed with --url",
+    ),
+    accessions: int = typer.Option(
+        500,
+        help="Number of distinct accessions requested from the stand-in API; fewer means more cache hits",
+    ),
+    metrics_url: Optional[str] = typer.Option(None, help="Server metrics to sample; defaults to /metrics of --url"),
+    latency: float = typer.Option(0.05, help="Seconds before each response of the stand-in API"),
+    jitter: float = typer.Option(0.05, help="Largest random delay added to the stand-in API latency"),
+    error_rate: float = typer.Option(0.0, help="Fraction of stand-in API requests failing with 503"),
+    seed: Optional[int] = typer.Option(None, help="Seed of the tool and argument choices"),
+    output: Optional[Path] = typer.Option(None, help="Also write the report to a file, as JSON"),
+) -> None:
+    """Call tools from concurrent MCP sessions and report throughput, latency, errors and server saturation.
+
+    Without --url, the stand-in AlphaFold API and a streamable-http server are
+    started locally, so the load test runs without network access.
+    """
+    from fastmcp import Client
+    from fastmcp.client.transports import StreamableHttpTransport
+
+    from mcp_alphafold.fake_api import run_fake_api
+
     try:
-        server = AlphaFoldMCP(name=name or settings.SERVER_NAME)
-        transport = transport or settings.TRANSPORT
-
-        if transport == "stdio":
-            server.run(transport=cast(str, transport))
-        else:
-            server.run(
-                transport=cast(str, transport),
-                host=host or settings.SERVER_HOST,
-                port=port or settings.SERVER_PORT,
+        tool_mix = parse_mix(mix)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--mix") from None
+    if url is not None and accessions_file is None:
+        raise typer.BadParameter("Pass the accessions to request with a remote server", param_hint="--accessions-file")
+    pool = read_accessions(accessions_file) if accessions_file else [f"Q{i:05d}" for i in range(accessions)]
+
+    def load(mcp_url: str) -> Dict:
+        typer.echo(f"Loading {mcp_url} with {sessions} sessions for {duration:g}s")
+        return asyncio.run(
+            run_load_test(
+                lambda: Client(StreamableHttpTransport(mcp_url)),
+                pool,
+                sessions=sessions,
+                duration=duration,
+                mix=tool_mix,
+                metrics_url=metrics_url or metrics_url_for(mcp_url),
+                seed=seed,
             )
-    except Exception as e:
-        logger.error(f"Server error: {e}", exc_info=True)
-        sys.exit(1)
+        )
+
+    if url is not None:
+        report = load(url)
+    else:
+        with run_fake_api(latency=latency, jitter=jitter, error_rate=error_rate, seed=seed) as api_url:
+            with run_local_server(api_url) as local_url:
+                report = load(local_url)
+    _print_load_report(report)
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def _print_load_report(report: Dict) -> None:
+    columns = ("calls", "throughput", "error_rate", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+    typer.echo(f"{'tool':<32}" + "".join(f"{column:>12}" for column in columns))
+    for name, row in [*report["tools"].items(), ("total", report["total"])]:
+        typer.echo(f"{name:<32}" + "".join(f"{row[column]:>12}" for column in columns))
+    typer.echo(
+        f"sessions {report['sessions']}, connect p50 {report['connect_p50_ms']} ms, "
+        f"max {report['connect_max_ms']} ms, {len(report['session_errors'])} failed"
+    )
+    for error in dict.fromkeys(report["session_errors"]):
+        typer.echo(f"  {error}")
+    server = report["server"]
+    if server is None:
+        typer.echo("server metrics unavailable")
+        return
+    for key, value in server.items():
+        if isinstance(value, dict):
+            value = ", ".join(f"{name} {count}" for name, count in value.items()) or "none"
+        typer.echo(f"{key:<32}{value}")
+
+
+@cache_app.command("inspect")
+def cache_inspect() -> None:
+    """Show the cache location, settings, size and entries."""
+    try:
+        info = get_cache_info()
+    finally:
+        close_cache()
+    for key in ("directory", "shards", "eviction_policy", "entries"):
+        typer.echo(f"{key:<16}{info[key]}")
+    typer.echo(f"{'volume':<16}{_format_bytes(info['volume'])} of {_format_bytes(info['size_limit'])}")
+    if info["statistics"]:
+        typer.echo(f"{'hits':<16}{info['hits']}")
+        typer.echo(f"{'misses':<16}{info['misses']}")
+
+
+@cache_app.command("prune")
+def cache_prune(
+    clear: bool = typer.Option(False, "--all", help="Remove every entry instead of expired and excess ones"),
+) -> None:
+    """Remove expired entries and evict entries above CACHE_SIZE_LIMIT.
+
+    Downloaded files are pruned as well: stale partial downloads and unused
+    files are removed, and files above FILE_STORE_SIZE_LIMIT are evicted.
+    """
+    try:
+        removed = prune_cache(clear=clear)
+        removed_files = get_file_store().prune()
+    finally:
+        close_cache()
+        close_file_store()
+    typer.echo(", ".join(f"{step} {count}" for step, count in removed.items()))
+    typer.echo("files: " + ", ".join(f"{step} {count}" for step, count in removed_files.items()))
+
+
+@cache_app.command("vacuum")
+def cache_vacuum() -> None:
+    """Fix inconsistencies and return free database pages to the filesystem."""
+    try:
+        volume = vacuum_cache()
+        index_volume = get_file_store().vacuum()
+    finally:
+        close_cache()
+        close_file_store()
+    typer.echo(f"volume {_format_bytes(volume['before'])} -> {_format_bytes(volume['after'])}")
+    typer.echo(f"files index {_format_bytes(index_volume['before'])} -> {_format_bytes(index_volume['after'])}")
+
+
+@cache_app.command("stats")
+def cache_stats(
+    output: Optional[Path] = typer.Option(None, help="Write the statistics to a file instead of stdout"),
+) -> None:
+    """Export the cache statistics, per shard, as JSON."""
+    try:
+        content = json.dumps(get_cache_info(), indent=2)
+    finally:
+        close_cache()
+    if output is None:
+        typer.echo(content)
+    else:
+        output.write_text(content + "\n")
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
 
 
 __all__ = ["app"]
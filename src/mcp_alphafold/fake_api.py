@@ -0,0 +1,178 @@
+"""Local stand-in for the AlphaFold API, for benchmarks and load tests.
+
+Serves the fixture payloads in `fixtures/` for any accession on the
+`/api/prediction`, `/api/uniprot/summary` and `/api/annotations` routes,
+with configurable latency, jitter and error rate, and counts its requests on
+`/api/stats`. Start it with `mcp-alphafold fake-api` and point the server at
+it with `ALPHAFOLD_API_URL`, e.g. `http://127.0.0.1:8500/api`.
+"""
+
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FIXTURE_ACCESSION = "P00520"  # accession in the fixtures, replaced by the requested one
+ENDPOINTS = ("prediction", "uniprot_summary", "annotations")
+
+
+def load_payloads(scale: int = 1) -> Dict[str, str]:
+    """
+    Load the fixture payloads, enlarged `scale` times.
+
+    Scaling repeats the structures of the UniProt summary and lengthens the
+    sequence and scores of the annotations, to benchmark large responses.
+    """
+    payloads: Dict[str, Any] = {name: json.loads((FIXTURES_DIR / f"{name}.json").read_text()) for name in ENDPOINTS}
+    if scale > 1:
+        summary = payloads["uniprot_summary"]
+        summary["structures"] = summary["structures"] * scale
+
+        annotations = payloads["annotations"]
+        annotations["sequence"] = annotations["sequence"] * scale
+        for annotation in annotations["annotation"]:
+            for region in annotation["regions"]:
+                region["annotation_value"] = region["annotation_value"] * scale
+                region["end"] = region["start"] + len(region["annotation_value"]) - 1
+    return {name: json.dumps(payload, separators=(",", ":")) for name, payload in payloads.items()}
+
+
+class FakeAlphaFoldAPI:
+    """Starlette application answering like the AlphaFold API."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        scale: int = 1,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Seconds before each response
+            jitter: Largest random delay added to the latency, in seconds
+            error_rate: Fraction of requests answered with `error_status`
+            error_status: Status code of injected errors
+            scale: Enlarge the UniProt summary and annotations payloads this many times
+            seed: Seed of the jitter and error injection
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payloads = load_payloads(scale)
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self.app = Starlette(
+            routes=[
+                Route("/api/prediction/{qualifier}", self._prediction),
+                Route("/api/uniprot/summary/{qualifier}.json", self._uniprot_summary),
+                Route("/api/annotations/{qualifier}", self._annotations),
+                Route("/api/stats", self._stats),
+            ]
+        )
+
+    async def _respond(self, endpoint: str, qualifier: str) -> Response:
+        self.requests += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return Response("Injected error", status_code=self.error_status)
+        content = self.payloads[endpoint].replace(FIXTURE_ACCESSION, qualifier)
+        return Response(content, media_type="application/json")
+
+    async def _stats(self, request: Request) -> JSONResponse:
+        return JSONResponse({"requests": self.requests, "errors": self.errors})
+
+    async def _prediction(self, request: Request) -> Response:
+        return await self._respond("prediction", request.path_params["qualifier"])
+
+    async def _uniprot_summary(self, request: Request) -> Response:
+        return await self._respond("uniprot_summary", request.path_params["qualifier"])
+
+    async def _annotations(self, request: Request) -> Response:
+        return await self._respond("annotations", request.path_params["qualifier"])
+
+
+def serve_fake_api(api: FakeAlphaFoldAPI, host: str = "127.0.0.1", port: int = 8500, fd: Optional[int] = None) -> None:
+    """Serve the fake API until interrupted, on a host and port or on an inherited listening socket."""
+    config = uvicorn.Config(api.app, host=host, port=port, log_level="warning", access_log=False, lifespan="off")
+    server = uvicorn.Server(config)
+    # The socket family is detected from the descriptor; uvicorn's own `fd` option assumes a Unix socket
+    server.run(sockets=[socket.socket(fileno=fd)] if fd is not None else None)
+
+
+@contextmanager
+def run_fake_api(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    scale: int = 1,
+    seed: Optional[int] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> Iterator[str]:
+    """
+    Serve the fake API from a separate process, see `FakeAlphaFoldAPI` for the options.
+
+    A separate process does not compete with the caller for the GIL, so the
+    measured latency is the configured one. The listening socket is bound here
+    and inherited by the process, so `port=0` picks any free port without races.
+
+    Yields:
+        The base URL of the API, to be used as `ALPHAFOLD_API_URL`
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    args = [
+        sys.executable, "-m", "mcp_alphafold", "fake-api",
+        "--fd", str(sock.fileno()),
+        "--latency", str(latency),
+        "--jitter", str(jitter),
+        "--error-rate", str(error_rate),
+        "--error-status", str(error_status),
+        "--scale", str(scale),
+    ]  # fmt: skip
+    if seed is not None:
+        args += ["--seed", str(seed)]
+    process = subprocess.Popen(args, pass_fds=(sock.fileno(),))
+    base_url = f"http://{host}:{sock.getsockname()[1]}/api"
+    try:
+        # Connections wait in the socket backlog until the process accepts them
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"The fake AlphaFold API exited with status {process.returncode}")
+            try:
+                httpx.get(f"{base_url}/stats", timeout=1.0).raise_for_status()
+                break
+            except httpx.TimeoutException:
+                continue
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        sock.close()
@@ -0,0 +1,322 @@
+"""Replay a mix of tool calls over concurrent MCP sessions and report the load the server sustains."""
+
+import asyncio
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+if TYPE_CHECKING:
+    from fastmcp import Client
+
+LOADTEST_TOOLS: Dict[str, Callable[[random.Random, List[str]], Dict[str, Any]]] = {
+    "get_alphafold_prediction": lambda rng, accessions: {"qualifier": rng.choice(accessions)},
+    "get_alphafold_predictions_batch": lambda rng, accessions: {
+        "qualifiers": rng.sample(accessions, min(5, len(accessions)))
+    },
+    "get_uniprot_summary": lambda rng, accessions: {"qualifier": rng.choice(accessions)},
+    "get_annotations": lambda rng, accessions: {"qualifier": rng.choice(accessions), "top_k": 20},
+}
+DEFAULT_MIX = "get_alphafold_prediction=4,get_uniprot_summary=3,get_annotations=3"
+OUTCOMES = ("ok", "error", "exception")
+
+# A sample of the Prometheus text format: name, labels and value
+Sample = Tuple[str, Dict[str, str], float]
+_SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$")
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse a tool mix such as 'get_uniprot_summary=3,get_annotations=1'.
+
+    Weights are relative; a tool without a weight counts once.
+    """
+    mix: Dict[str, float] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in LOADTEST_TOOLS:
+            raise ValueError(f"Unknown tool '{name}', expected one of: {', '.join(LOADTEST_TOOLS)}")
+        try:
+            mix[name] = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight '{weight}' for tool '{name}'") from None
+        if mix[name] < 0:
+            raise ValueError(f"Invalid weight '{weight}' for tool '{name}'")
+    if not any(mix.values()):
+        raise ValueError("The tool mix is empty")
+    return mix
+
+
+def parse_metrics(text: str) -> List[Sample]:
+    """Parse the samples of a Prometheus text exposition, skipping comments."""
+    samples: List[Sample] = []
+    for line in text.splitlines():
+        match = _SAMPLE_RE.match(line.strip())
+        if match is None:
+            continue
+        name, labels, value = match.groups()
+        samples.append((name, dict(_LABEL_RE.findall(labels or "")), float(value)))
+    return samples
+
+
+def _metric_by_label(samples: List[Sample], name: str, label: Optional[str] = None) -> Dict[str, float]:
+    """Sum the samples of a metric, grouped by the value of one label."""
+    values: Dict[str, float] = {}
+    for sample_name, labels, value in samples:
+        if sample_name == name:
+            key = labels.get(label, "") if label else ""
+            values[key] = values.get(key, 0.0) + value
+    return values
+
+
+def _metric_total(samples: List[Sample], name: str) -> float:
+    return sum(_metric_by_label(samples, name).values())
+
+
+def _delta(after: Dict[str, float], before: Dict[str, float]) -> Dict[str, int]:
+    return {key: round(value - before.get(key, 0.0)) for key, value in sorted(after.items())}
+
+
+def summarize_calls(calls: List[Tuple[float, str]], elapsed: float) -> Dict[str, Any]:
+    """Summarize (latency, outcome) pairs: throughput, latency percentiles and error rates."""
+    import numpy as np
+
+    latencies = np.array([latency for latency, _ in calls]) * 1000
+    summary: Dict[str, Any] = {"calls": len(calls), "throughput": round(len(calls) / elapsed, 1) if elapsed else 0.0}
+    for outcome in OUTCOMES:
+        summary[outcome] = sum(1 for _, call_outcome in calls if call_outcome == outcome)
+    summary["error_rate"] = round((summary["error"] + summary["exception"]) / len(calls), 4) if calls else 0.0
+    for name, q in (("p50_ms", 50), ("p90_ms", 90), ("p99_ms", 99), ("max_ms", 100)):
+        summary[name] = round(float(np.percentile(latencies, q)), 2) if calls else 0.0
+    return summary
+
+
+def summarize_server(scrapes: List[Tuple[float, List[Sample]]]) -> Optional[Dict[str, Any]]:
+    """
+    Summarize the server side of a load test from `/metrics` scrapes.
+
+    Peaks of the in-progress gauges are taken over all scrapes; counters are
+    compared between the first and the last scrape.
+    """
+    if len(scrapes) < 2:
+        return None
+    (start, first), (end, last) = scrapes[0], scrapes[-1]
+    tool_count = _metric_total(last, "alphafold_mcp_tool_duration_seconds_count") - _metric_total(
+        first, "alphafold_mcp_tool_duration_seconds_count"
+    )
+    tool_sum = _metric_total(last, "alphafold_mcp_tool_duration_seconds_sum") - _metric_total(
+        first, "alphafold_mcp_tool_duration_seconds_sum"
+    )
+    cpu = _metric_total(last, "process_cpu_seconds_total") - _metric_total(first, "process_cpu_seconds_total")
+    return {
+        "cpu_utilization": round(cpu / (end - start), 3),
+        "tool_mean_ms": round(tool_sum / tool_count * 1000, 2) if tool_count else 0.0,
+        "peak_tool_calls_in_progress": max(
+            _metric_total(samples, "alphafold_mcp_tool_calls_in_progress") for _, samples in scrapes
+        ),
+        "peak_inflight_fetches": max(
+            _metric_total(samples, "alphafold_mcp_inflight_fetches") for _, samples in scrapes
+        ),
+        "peak_upstream_in_flight": max(
+            _metric_total(samples, "alphafold_mcp_upstream_requests_in_flight") for _, samples in scrapes
+        ),
+        "api_requests": _delta(
+            _metric_by_label(last, "alphafold_mcp_api_request_duration_seconds_count", "result"),
+            _metric_by_label(first, "alphafold_mcp_api_request_duration_seconds_count", "result"),
+        ),
+        "upstream_requests": _delta(
+            _metric_by_label(last, "alphafold_mcp_upstream_requests_total", "status"),
+            _metric_by_label(first, "alphafold_mcp_upstream_requests_total", "status"),
+        ),
+        "upstream_retries": _delta(
+            _metric_by_label(last, "alphafold_mcp_upstream_retries_total", "reason"),
+            _metric_by_label(first, "alphafold_mcp_upstream_retries_total", "reason"),
+        ),
+    }
+
+
+def _is_error(result: Any) -> bool:
+    # Tools report errors as an {"error": ...} payload, or the call fails
+    if result.isError:
+        return True
+    return any(getattr(content, "text", "").startswith('{"error"') for content in result.content)
+
+
+async def run_load_test(
+    connect: Callable[[], "Client"],
+    accessions: List[str],
+    sessions: int = 16,
+    duration: float = 30.0,
+    mix: Optional[Dict[str, float]] = None,
+    metrics_url: Optional[str] = None,
+    sample_interval: float = 0.5,
+    timeout: float = 60.0,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Call tools from concurrent MCP sessions for a while and report the load.
+
+    Every session opens its own client, then calls tools drawn from `mix` one
+    after the other, with arguments drawn from `accessions`, until `duration`
+    has elapsed. A smaller accession pool means more cache hits on the server.
+
+    Args:
+        connect: Return a new, not yet connected, MCP client
+        accessions: UniProt accessions passed to the tools
+        sessions: Number of concurrent sessions
+        duration: Seconds during which tools are called
+        mix: Relative weight of each tool, defaults to `DEFAULT_MIX`
+        metrics_url: URL of the server's `/metrics`, scraped every `sample_interval` seconds
+        sample_interval: Seconds between two scrapes of the metrics
+        timeout: Seconds before a tool call fails
+        seed: Seed of the tool and argument choices
+
+    Returns:
+        The calls per tool and overall, the failed sessions and the server side summary
+    """
+    mix = mix or parse_mix(DEFAULT_MIX)
+    tools = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in tools]
+    rng = random.Random(seed)
+    calls: Dict[str, List[Tuple[float, str]]] = {name: [] for name in tools}
+    session_errors: List[str] = []
+    connect_times: List[float] = []
+    scrapes: List[Tuple[float, List[Sample]]] = []
+    connected, started, stop = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+    def session_ready() -> None:
+        if len(connect_times) + len(session_errors) == sessions:
+            connected.set()
+
+    async def session() -> None:
+        connect_start = time.perf_counter()
+        try:
+            async with connect() as client:
+                connect_times.append(time.perf_counter() - connect_start)
+                session_ready()
+                await started.wait()
+                while not stop.is_set():
+                    name = rng.choices(tools, weights)[0]
+                    arguments = LOADTEST_TOOLS[name](rng, accessions)
+                    call_start = time.perf_counter()
+                    try:
+                        result = await client.call_tool_mcp(name, arguments, timeout=timeout)
+                        outcome = "error" if _is_error(result) else "ok"
+                    except Exception:
+                        outcome = "exception"
+                    calls[name].append((time.perf_counter() - call_start, outcome))
+        except Exception as e:
+            session_errors.append(f"{type(e).__name__}: {e}")
+            session_ready()
+
+    async def scrape(client: httpx.AsyncClient) -> None:
+        try:
+            response = await client.get(metrics_url or "")
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return
+        scrapes.append((time.perf_counter(), parse_metrics(response.text)))
+
+    async def sample_metrics() -> None:
+        async with httpx.AsyncClient(timeout=sample_interval * 4) as client:
+            await scrape(client)
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), sample_interval)
+                except asyncio.TimeoutError:
+                    pass
+                await scrape(client)
+
+    # All sessions connect first, so connecting does not count in the throughput
+    tasks = [asyncio.create_task(session()) for _ in range(sessions)]
+    await connected.wait()
+    sampler = asyncio.create_task(sample_metrics()) if metrics_url else None
+    start = time.perf_counter()
+    started.set()
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    if sampler is not None:
+        await sampler
+
+    return {
+        "sessions": sessions,
+        "duration": round(elapsed, 2),
+        "tools": {name: summarize_calls(tool_calls, elapsed) for name, tool_calls in calls.items()},
+        "total": summarize_calls([call for tool_calls in calls.values() for call in tool_calls], elapsed),
+        "connect_p50_ms": round(statistics.median(connect_times) * 1000, 2) if connect_times else 0.0,
+        "connect_max_ms": round(max(connect_times) * 1000, 2) if connect_times else 0.0,
+        "session_errors": session_errors,
+        "server": summarize_server(scrapes),
+    }
+
+
+def metrics_url_for(url: str) -> str:
+    """Return the `/metrics` URL of the server of an MCP endpoint."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/metrics"
+
+
+@contextmanager
+def run_local_server(api_url: str, environ: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """
+    Run the MCP server with the streamable-http transport from a separate process.
+
+    The server uses the AlphaFold API at `api_url`, serves its metrics and
+    caches responses in a new temporary directory, so every run starts cold.
+
+    Yields:
+        The URL of the MCP endpoint
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {
+            **os.environ,
+            "ALPHAFOLD_API_URL": api_url,
+            "BACKEND": "remote",
+            "CACHE_DIR": cache_dir,
+            "METRICS_ENABLED": "true",
+            "UPSTREAM_RATE_LIMIT": "0",
+            **(environ or {}),
+        }
+        args = [sys.executable, "-m", "mcp_alphafold", "--transport", "streamable-http", "--host", "127.0.0.1"]
+        process = subprocess.Popen(
+            [*args, "--port", str(port)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"The MCP server exited with status {process.returncode}")
+                try:
+                    httpx.get(f"{base_url}/health", timeout=1.0).raise_for_status()
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.1)
+            yield f"{base_url}/mcp/"
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
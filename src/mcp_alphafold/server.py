@@ -1,13 +1,30 @@
+import asyncio
 import logging
+import os
+import shutil
 import signal
 import sys
-from contextlib import contextmanager
-from typing import Generator, Literal, cast
+import tempfile
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Generator, Literal, Optional, cast
 
+import uvicorn
 from fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
 from mcp_alphafold.settings import settings
-from mcp_alphafold.tools.alphafold import alphafold_tools
+from mcp_alphafold.tools.alphafold import alphafold_tools, get_backend
+from mcp_alphafold.tools.alphamissense import alphamissense_tools
+from mcp_alphafold.tools.confidence import confidence_tools
+from mcp_alphafold.tools.files import files_resources, files_tools
+from mcp_alphafold.tools.pae import pae_tools
+from mcp_alphafold.utils.circuit import CircuitState, get_circuit_states
+from mcp_alphafold.utils.http import close_cache, close_http_client, get_cache, get_cache_stats
+from mcp_alphafold.utils.metrics import CONTENT_TYPE, enable_multiprocess, render_metrics, write_snapshots
+from mcp_alphafold.utils.throttle import share_limits
+from mcp_alphafold.utils.tracing import setup_tracing
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +34,107 @@ class AlphaFoldMCP:
         self,
         name: str = settings.SERVER_NAME,
     ):
+        setup_tracing()
         self.app: FastMCP = FastMCP(
             name=name,
             instructions="AlphaFold MCP server for protein structure prediction",
+            lifespan=self._lifespan,
         )
         self._register_tools()
+        self._register_resources()
+        self._register_routes()
         self._shutdown_requested = False
+        self._active_sessions = 0
+        self._backend_start: Optional[asyncio.Future[None]] = None
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+        """Manage resources shared by all sessions of the server.
+
+        FastMCP enters the lifespan once per session, before answering the
+        client, so nothing slow is done here: the shared HTTP client is opened
+        by the first upstream request, and the first session prepares the
+        backend in the background, e.g. refreshes the local mirror index. The
+        client is closed when the last session ends.
+        """
+        self._active_sessions += 1
+        if self._active_sessions == 1:
+            self._backend_start = asyncio.ensure_future(self._start_backend())
+        try:
+            yield {}
+        finally:
+            self._active_sessions -= 1
+            if self._active_sessions == 0:
+                if self._backend_start is not None and not self._backend_start.done():
+                    self._backend_start.cancel()
+                self._backend_start = None
+                await close_http_client()
+
+    async def _start_backend(self) -> None:
+        try:
+            await get_backend().start()
+        except Exception as e:
+            # The backend starts again on first use, and reports the error then
+            logger.warning(f"Backend preparation failed: {e}")
+
+    def http_app(self, stateless: bool = False) -> Starlette:
+        """Create the ASGI application of the streamable-http transport.
+
+        Args:
+            stateless: Handle every request in a new MCP session. Required when
+                requests of one client may reach different worker processes,
+                which do not share their sessions.
+        """
+        self.app.settings.stateless_http = stateless
+        app = self.app.http_app(path="/mcp/")
+        session_manager_lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[None]:
+            # Hold a session for the lifetime of the application, so that the shared
+            # HTTP client is not closed after every stateless request
+            async with session_manager_lifespan(app), self._lifespan(self.app):
+                snapshots = None
+                if settings.METRICS_DIR:
+                    snapshots = asyncio.create_task(write_snapshots(settings.METRICS_SNAPSHOT_INTERVAL))
+                try:
+                    yield
+                finally:
+                    if snapshots is not None:
+                        snapshots.cancel()
+                        await asyncio.gather(snapshots, return_exceptions=True)
+
+        app.router.lifespan_context = lifespan
+        return app
 
     def _register_tools(self) -> None:
         """Register tools with the MCP server."""
         alphafold_tools(mcp=self.app)
+        files_tools(mcp=self.app)
+        confidence_tools(mcp=self.app)
+        pae_tools(mcp=self.app)
+        alphamissense_tools(mcp=self.app)
+
+    def _register_routes(self) -> None:
+        """Register custom HTTP routes (only served with streamable-http transport)."""
+        self.app.custom_route("/health", methods=["GET"])(self._health_check)
+        if settings.METRICS_ENABLED:
+            self.app.custom_route("/metrics", methods=["GET"])(self._metrics)
+
+    async def _health_check(self, request: Request) -> JSONResponse:
+        """Report upstream circuit breaker states and cache statistics of the worker process answering."""
+        circuits = get_circuit_states()
+        degraded = any(circuit["state"] != CircuitState.CLOSED.value for circuit in circuits.values())
+        return JSONResponse({
+            "status": "degraded" if degraded else "ok",
+            "pid": os.getpid(),
+            "circuits": circuits,
+            "cache": get_cache_stats(),
+        })
+
+    async def _metrics(self, request: Request) -> Response:
+        """Expose tool, cache and upstream metrics in the Prometheus text format."""
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
 
     def _register_prompts(self) -> None:
         """Register prompts with the MCP server."""
@@ -34,7 +142,7 @@ class AlphaFoldMCP:
 
     def _register_resources(self) -> None:
         """Register resources with the MCP server."""
-        pass
+        files_resources(mcp=self.app)
 
     def _handle_shutdown(self, signum: int, frame) -> None:
         """Handle shutdown signals gracefully.
@@ -71,6 +179,7 @@ class AlphaFoldMCP:
         transport: Literal["stdio", "streamable-http"],
         host: str | None = None,
         port: int | None = None,
+        workers: int | None = None,
     ) -> None:
         """Run the AlphaFold MCP server.
 
@@ -78,7 +187,9 @@ class AlphaFoldMCP:
             transport: Transport to use for MCP communication
             host: Host to bind the server to (only used with streamable-http transport)
             port: Port to bind the server to (only used with streamable-http transport)
+            workers: Number of worker processes, defaults to `SERVER_WORKERS` (only used with streamable-http transport)
         """
+        workers = workers or settings.SERVER_WORKERS
         with self._setup_signal_handlers():
             try:
                 if transport == "stdio":
@@ -87,6 +198,9 @@ class AlphaFoldMCP:
                     if host is None or port is None:
                         raise ValueError("host and port are required for streamable-http transport")
 
+                    if workers > 1:
+                        self._run_workers(host, port, workers)
+                        return
                     self.app.run(
                         host=host,
                         port=port,
@@ -96,3 +210,76 @@ class AlphaFoldMCP:
             except Exception as e:
                 logger.error(f"Server error: {e}", exc_info=True)
                 sys.exit(1)
+
+    def _run_workers(self, host: str, port: int, workers: int) -> None:
+        """Serve the streamable-http transport from several worker processes.
+
+        uvicorn's supervisor binds the socket, shares it with the workers and
+        starts a new worker when one dies. Workers are spawned, so they create
+        their own server with `create_http_app` from the same settings; they
+        share the on-disk cache, which is safe across processes, but not the
+        memory cache or the circuit breakers. Their metrics are saved to a
+        temporary directory, so that `/metrics` reports the sum of all workers.
+        """
+        os.environ["SERVER_NAME"] = self.app.name
+        os.environ["SERVER_WORKERS"] = str(workers)
+        metrics_dir = tempfile.mkdtemp(prefix="alphafold-mcp-metrics-")
+        os.environ["METRICS_DIR"] = metrics_dir
+        if settings.BACKEND == "local":
+            # Workers then find the mirror index up to date instead of refreshing it together
+            asyncio.run(get_backend().start())
+        # Entries of an older cache layout are imported once, before the workers open the cache
+        get_cache()
+        close_cache()
+        try:
+            uvicorn.run(
+                "mcp_alphafold.server:create_http_app",
+                factory=True,
+                host=host,
+                port=port,
+                workers=workers,
+                lifespan="on",
+                timeout_graceful_shutdown=0,
+            )
+        finally:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def create_http_app() -> Starlette:
+    """Create the streamable-http application of a worker process.
+
+    Upstream throttling is applied per process, so the rate limit, burst and
+    in-flight limit are split between the `SERVER_WORKERS` workers to keep
+    their sum within the configured limits. The settings are left unchanged.
+    Metrics are shared through `METRICS_DIR`, set by the supervisor.
+    """
+    share_limits(settings.SERVER_WORKERS)
+    if settings.METRICS_DIR:
+        enable_multiprocess(settings.METRICS_DIR)
+    return AlphaFoldMCP(name=settings.SERVER_NAME).http_app(stateless=True)
+
+
+def serve(
+    host: str | None = None,
+    port: int | None = None,
+    name: str | None = None,
+    transport: str | None = None,
+    workers: int | None = None,
+) -> None:
+    """Run the AlphaFold MCP server, with the settings for the options that are not given."""
+    try:
+        server = AlphaFoldMCP(name=name or settings.SERVER_NAME)
+        transport = transport or settings.TRANSPORT
+
+        if transport == "stdio":
+            server.run(transport=cast(Literal["stdio", "streamable-http"], transport))
+        else:
+            server.run(
+                transport=cast(Literal["stdio", "streamable-http"], transport),
+                host=host or settings.SERVER_HOST,
+                port=port or settings.SERVER_PORT,
+                workers=workers,
+            )
+    except Exception as e:
+        logger.error(f"Server error: {e}", exc_info=True)
+        sys.exit(1)
@@ -1,6 +1,6 @@
 """Configuration settings for AlphaFold MCP server."""
 
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,14 +11,92 @@ class Settings(BaseSettings):
     SERVER_HOST: str = "0.0.0.0"
     SERVER_PORT: int = 9000
     TRANSPORT: Literal["stdio", "streamable-http"] = "streamable-http"
+    SERVER_WORKERS: int = 1  # processes serving the streamable-http transport; upstream limits are split between them
+    METRICS_ENABLED: bool = True  # serve Prometheus metrics on /metrics (streamable-http transport only)
+    METRICS_DIR: Optional[str] = None  # set for the worker processes, which save their metrics there to be summed
+    METRICS_SNAPSHOT_INTERVAL: float = 1.0  # seconds between the metric snapshots of a worker process
+    TRACING_ENABLED: bool = (
+        False  # OpenTelemetry spans, requires the 'tracing' extra; export is set with OTEL_* variables
+    )
+
+    # Backend settings
+    BACKEND: Literal["remote", "local"] = "remote"  # "local" answers from LOCAL_MIRROR_DIR without network access
+    LOCAL_MIRROR_DIR: Optional[str] = None  # directory of AF-*-model_v*.cif files, e.g. an extracted proteome archive
+    LOCAL_MIRROR_INDEX: Optional[str] = None  # defaults to "mirror.sqlite3" next to the response cache
 
     # API settings
+    ALPHAFOLD_API_URL: str = "https://alphafold.ebi.ac.uk/api"
     MAX_RETIRES: int = 3
     REQUEST_TIMEOUT: int = 10
 
+    # Upstream throttling settings (applied per host)
+    UPSTREAM_RATE_LIMIT: float = 10.0  # requests per second; 0 disables
+    UPSTREAM_BURST: int = 20
+    UPSTREAM_MAX_IN_FLIGHT: int = 16  # 0 disables
+    UPSTREAM_MAX_RETRY_AFTER: float = 60.0  # seconds
+
+    # Circuit breaker settings (applied per host)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures before opening; 0 disables
+    CIRCUIT_RECOVERY_TIMEOUT: float = 30.0  # seconds before a trial request
+
+    # Batch settings
+    BATCH_MAX_CONCURRENCY: int = 8
+
+    # Annotation settings
+    ANNOTATION_MAX_RESULTS: int = 500  # largest number of scores returned, and largest top_k
+
+    # HTTP client settings
+    HTTP2: bool = False  # requires the optional 'h2' package
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+
     # Cache settings
     CACHE_TTL: int = 86400  # 24 hours
     CACHE_DIR: Optional[str] = None
+    CACHE_STALE_TTL: int = 3600  # serve expired entries while refreshing them; 0 disables
+    CACHE_NEGATIVE_TTL: int = 300  # cache definitive errors such as 404; 0 disables
+    CACHE_NEGATIVE_STATUS_CODES: List[int] = [400, 404, 410]
+    CACHE_SIZE_LIMIT: int = 2 * 1024 * 1024 * 1024  # 2 GiB on disk, entries are evicted above it
+    # "least-recently-used" and "least-frequently-used" update every entry on read
+    CACHE_EVICTION_POLICY: Literal["least-recently-stored", "least-recently-used", "least-frequently-used", "none"] = (
+        "least-recently-stored"
+    )
+    CACHE_SHARDS: int = (
+        8  # SQLite databases entries are spread over; entries are moved on the next start after a change
+    )
+    CACHE_TIMEOUT: float = 0.01  # seconds a shard waits for a lock; timed out writes are dropped
+    CACHE_STATISTICS: bool = False  # count hits and misses on disk, adds a write per read
+    CACHE_COMPRESSION: Literal["auto", "zstd", "zlib", "none"] = "auto"  # auto picks zstd if 'zstandard' is installed
+    CACHE_COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller responses are stored uncompressed
+    CACHE_MIGRATE_LEGACY_KEYS: bool = True  # on a miss, move entries imported from the pre-sharding cache to their key
+    MEMORY_CACHE_MAX_ENTRIES: int = 1024  # 0 disables the in-memory tier
+    MEMORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MiB
+    MEMORY_CACHE_MODELS: bool = True  # keep validated response models instead of raw text
+
+    # Model file store settings
+    FILE_STORE_DIR: Optional[str] = None  # defaults to "files" next to the response cache
+    FILE_STORE_TTL: int = 7 * 86400  # seconds before a stored file is revalidated
+    FILE_STORE_CHUNK_SIZE: int = 64 * 1024
+    FILE_STORE_SIZE_LIMIT: int = (
+        10 * 1024 * 1024 * 1024
+    )  # 10 GiB, least recently used files are evicted above it; 0 disables
+    FILE_STORE_PARTIAL_TTL: int = 86400  # seconds interrupted downloads are kept to resume them, see `cache prune`
+    FILE_READ_MAX_BYTES: int = 1024 * 1024  # largest slice returned by a single tool call
+
+    # Structure settings
+    STRUCTURE_PARSE_CHUNK_SIZE: int = 1024 * 1024  # bytes parsed per vectorized block
+    STRUCTURE_CACHE_TTL: int = 30 * 86400  # results derived from a model version never change
+
+    # PAE settings
+    PAE_DTYPE: Literal["float16", "uint8"] = "float16"  # uint8 stores 0.25 Å steps in a quarter of float32
+    PAE_MAX_SLICE_CELLS: int = 65536  # largest block returned by a single tool call
+
+    # AlphaMissense settings
+    ALPHAMISSENSE_DB: Optional[str] = None  # defaults to "alphamissense.sqlite3" next to the response cache
+    ALPHAMISSENSE_BATCH_SIZE: int = 10000  # CSV rows inserted per statement batch
+    ALPHAMISSENSE_BUSY_TIMEOUT: float = 30.0  # seconds a statement waits for a load of another process to commit
+    ALPHAMISSENSE_MAX_VARIANTS: int = 400  # substitutions per lookup, two SQL variables each (older SQLite allows 999)
 
     # SSL/TLS settings
     SSL_CERT_FILE: Optional[str] = None
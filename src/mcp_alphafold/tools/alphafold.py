@@ -1,29 +1,168 @@
+import asyncio
 import json
-from typing import Any, Dict, List, Optional, Union
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.mirror import MirrorIndex
 from mcp_alphafold.tools.models import (
     AnnotationResponse,
     EntrySummaryResponse,
     UniprotSummaryResponse,
 )
 from mcp_alphafold.utils.doc import DocLoader
-from mcp_alphafold.utils.http import request_api
+from mcp_alphafold.utils.http import RequestError, get_cache_dir, get_memory_cache, request_api
+from mcp_alphafold.utils.metrics import instrument_tool
+
+if TYPE_CHECKING:
+    # Annotation tables need numpy, imported on the first annotations request
+    from mcp_alphafold.tools.annotations import AnnotationTable
+
+logger = logging.getLogger(__name__)
 
-BASE_URL = "https://alphafold.ebi.ac.uk/api"
 doc_loader = DocLoader()
+_backend: Optional["AlphaFoldBackend"] = None
+
+
+def normalize_accession(qualifier: str) -> str:
+    """Return the canonical form of a UniProt accession, entry name or sequence checksum."""
+    return qualifier.strip().upper()
+
+
+class AlphaFoldBackend(ABC):
+    """Source of AlphaFold entries, UniProt summaries and annotations used by the tools."""
+
+    async def start(self) -> None:  # noqa: B027 - optional, backends without setup keep it empty
+        """Prepare the backend before the first request."""
+
+    @abstractmethod
+    async def get_prediction(self, qualifier: str) -> Tuple[Optional[EntrySummaryResponse], Optional[RequestError]]:
+        """Return the AlphaFold entries of a UniProt accession."""
+
+    @abstractmethod
+    async def get_uniprot_summary(
+        self,
+        qualifier: str,
+    ) -> Tuple[Optional[UniprotSummaryResponse], Optional[RequestError]]:
+        """Return the summary of the structures of a UniProt accession."""
+
+    @abstractmethod
+    async def get_annotations(
+        self,
+        qualifier: str,
+        annotation_type: str,
+    ) -> Tuple[Optional[AnnotationResponse], Optional[RequestError]]:
+        """Return the annotations of a given type for a UniProt accession."""
+
+
+class RemoteBackend(AlphaFoldBackend):
+    """Query the AlphaFold Database API."""
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = (base_url or settings.ALPHAFOLD_API_URL).rstrip("/")
+
+    def prediction_request(self, qualifier: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        return f"{self.base_url}/prediction/{normalize_accession(qualifier)}", None
+
+    def uniprot_summary_request(self, qualifier: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        return f"{self.base_url}/uniprot/summary/{normalize_accession(qualifier)}.json", None
+
+    def annotations_request(self, qualifier: str, annotation_type: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        return f"{self.base_url}/annotations/{normalize_accession(qualifier)}", {"annotation_type": annotation_type}
+
+    async def get_prediction(self, qualifier: str) -> Tuple[Optional[EntrySummaryResponse], Optional[RequestError]]:
+        url, params = self.prediction_request(qualifier)
+        return await request_api(url=url, request=params, method="GET", response_model_type=EntrySummaryResponse)
+
+    async def get_uniprot_summary(
+        self,
+        qualifier: str,
+    ) -> Tuple[Optional[UniprotSummaryResponse], Optional[RequestError]]:
+        url, params = self.uniprot_summary_request(qualifier)
+        return await request_api(url=url, request=params, method="GET", response_model_type=UniprotSummaryResponse)
+
+    async def get_annotations(
+        self,
+        qualifier: str,
+        annotation_type: str,
+    ) -> Tuple[Optional[AnnotationResponse], Optional[RequestError]]:
+        url, params = self.annotations_request(qualifier, annotation_type)
+        return await request_api(url=url, request=params, method="GET", response_model_type=AnnotationResponse)
+
+
+class LocalMirrorBackend(AlphaFoldBackend):
+    """Answer from a local mirror of AlphaFold files without network access.
+
+    Entries are synthesized from the mirror index and point at the files with
+    `file://` URLs, which the file store reads in place.
+    """
+
+    def __init__(self, index: MirrorIndex):
+        self.index = index
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Refresh the mirror index once."""
+        async with self._start_lock:
+            if not self._started:
+                counts = await asyncio.to_thread(self.index.refresh)
+                logger.info(f"Local mirror index of {self.index.root} refreshed: {counts}")
+                self._started = True
+
+    async def get_prediction(self, qualifier: str) -> Tuple[Optional[EntrySummaryResponse], Optional[RequestError]]:
+        await self.start()
+        entries = await asyncio.to_thread(self.index.entries, normalize_accession(qualifier))
+        if not entries:
+            return None, RequestError(code=404, message=f"No AlphaFold model found for {qualifier} in the local mirror")
+        return EntrySummaryResponse(root=entries), None
+
+    async def get_uniprot_summary(
+        self,
+        qualifier: str,
+    ) -> Tuple[Optional[UniprotSummaryResponse], Optional[RequestError]]:
+        return None, RequestError(code=501, message="UniProt summaries are not available from the local mirror")
+
+    async def get_annotations(
+        self,
+        qualifier: str,
+        annotation_type: str,
+    ) -> Tuple[Optional[AnnotationResponse], Optional[RequestError]]:
+        return None, RequestError(code=501, message="Annotations are not available from the local mirror")
+
+
+def get_backend() -> AlphaFoldBackend:
+    """Initialize and return the backend selected by the `BACKEND` setting."""
+    global _backend
+    if _backend is None:
+        if settings.BACKEND == "local":
+            if not settings.LOCAL_MIRROR_DIR:
+                raise ValueError("LOCAL_MIRROR_DIR is required for the local backend")
+            _backend = LocalMirrorBackend(
+                MirrorIndex(
+                    settings.LOCAL_MIRROR_DIR,
+                    settings.LOCAL_MIRROR_INDEX or os.path.join(get_cache_dir(), "mirror.sqlite3"),
+                )
+            )
+        else:
+            _backend = RemoteBackend()
+    return _backend
 
 
 def alphafold_tools(mcp: FastMCP):
     """Add AlphaFold tools to the MCP server."""
     tools = [
         get_alphafold_prediction,
+        get_alphafold_predictions_batch,
         get_uniprot_summary,
         get_annotations,
     ]
     for tool in tools:
-        mcp.add_tool(tool)
+        mcp.add_tool(instrument_tool(tool))
 
 
 @doc_loader.with_docstring("alphafold_prediction.md")
@@ -43,12 +182,7 @@ async def get_alphafold_prediction(
             - If output_json=True: JSON string
             - If output_json=False: List of entries or error dictionary
     """
-    url = f"{BASE_URL}/prediction/{qualifier}"
-    response, error = await request_api(
-        url=url,
-        method="GET",
-        response_model_type=EntrySummaryResponse,
-    )
+    response, error = await get_backend().get_prediction(qualifier)
     data: Union[List[Any], Dict[str, Any]]  # Add type annotation for data
     if response:
         data = [entry.model_dump_json(exclude_none=True) for entry in response.root]
@@ -59,6 +193,83 @@ async def get_alphafold_prediction(
     return json.dumps(data) if output_json else data  # type: ignore
 
 
+async def iter_alphafold_predictions(
+    qualifiers: List[str],
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[str, Optional[EntrySummaryResponse], Optional[RequestError]]]:
+    """
+    Get AlphaFold models for many UniProt accessions concurrently.
+
+    Results are yielded as soon as each accession completes, in completion order.
+    Duplicate accessions are fetched once.
+
+    Args:
+        qualifiers (List[str]): UniProt accessions
+        max_concurrency (int, optional): Maximum number of concurrent requests, from 1 to `BATCH_MAX_CONCURRENCY`
+
+    Yields:
+        Tuple[str, Optional[EntrySummaryResponse], Optional[RequestError]]:
+            The accession with either its response or its error
+    """
+    if max_concurrency is None:
+        max_concurrency = settings.BATCH_MAX_CONCURRENCY
+    # Callers may lower the server's limit but not raise it
+    semaphore = asyncio.Semaphore(max(1, min(max_concurrency, settings.BATCH_MAX_CONCURRENCY)))
+
+    async def fetch(qualifier: str) -> Tuple[str, Optional[EntrySummaryResponse], Optional[RequestError]]:
+        async with semaphore:
+            try:
+                response, error = await get_backend().get_prediction(qualifier)
+            except Exception as e:
+                response, error = None, RequestError(code=500, message=str(e))
+        return qualifier, response, error
+
+    tasks = [asyncio.ensure_future(fetch(qualifier)) for qualifier in dict.fromkeys(qualifiers)]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@doc_loader.with_docstring("alphafold_predictions_batch.md")
+async def get_alphafold_predictions_batch(
+    qualifiers: List[str],
+    max_concurrency: Optional[int] = None,
+    output_json: bool = True,
+    ctx: Optional[Context] = None,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Get AlphaFold models for a list of UniProt accessions.
+    Args:
+        qualifiers (List[str]): UniProt accessions (e.g., ['Q5VSL9', 'P69905'])
+        max_concurrency (int, optional): Maximum number of concurrent requests, from 1 to `BATCH_MAX_CONCURRENCY`
+
+    Returns:
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: Dictionary of entries or error per accession
+    """
+    data: Dict[str, Any] = {}
+    total = len(dict.fromkeys(qualifiers))
+
+    async for qualifier, response, error in iter_alphafold_predictions(qualifiers, max_concurrency):
+        if response:
+            item: Any = [entry.model_dump(mode="json", exclude_none=True) for entry in response.root]
+        else:
+            item = {
+                "error": f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
+            }
+        data[qualifier] = item
+
+        # Stream each result to the client as it completes
+        if ctx is not None:
+            await ctx.report_progress(len(data), total, message=json.dumps({qualifier: item}))
+
+    return json.dumps(data) if output_json else data
+
+
 @doc_loader.with_docstring("uniprot_summary.md")
 async def get_uniprot_summary(
     qualifier: str,
@@ -72,52 +283,107 @@ async def get_uniprot_summary(
                     or CRC64 checksum of the UniProt sequence
 
     Returns:
-        Optional[UniprotSummaryResponse]: Complete response including UniProt entry and structures
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: UniProt entry and structures or error dictionary
     """
-    url = f"{BASE_URL}/uniprot/summary/{qualifier}.json"
-
-    response, error = await request_api(
-        url=url,
-        method="GET",
-        response_model_type=UniprotSummaryResponse,
-    )
+    response, error = await get_backend().get_uniprot_summary(qualifier)
 
+    data: Dict[str, Any]
     if response:
-        data = response.model_dump_json(exclude_none=True)
+        data = response.model_dump(mode="json", exclude_none=True)
     else:
         error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
-        error_data: Dict[str, Any] = {"error": error_msg}
+        data = {"error": error_msg}
+
+    return json.dumps(data) if output_json else data
+
 
-    return json.dumps(data) if output_json else error_data
+async def fetch_annotation_table(
+    qualifier: str,
+    annotation_type: str = "MUTAGEN",
+) -> Tuple[Optional["AnnotationTable"], Optional[RequestError]]:
+    """
+    Get the annotations of a UniProt accession as a columnar table.
+
+    Tables are kept in the memory cache per accession and annotation type, so
+    repeated queries filter the cached columns without rebuilding them.
+
+    Args:
+        qualifier (str): UniProt accession
+        annotation_type (str): Type of annotation (e.g., MUTAGEN for AlphaMissense)
+
+    Returns:
+        Tuple[Optional[AnnotationTable], Optional[RequestError]]: The table or an error
+    """
+    from mcp_alphafold.tools.annotations import AnnotationTable
+
+    cache_key = f"annotation-table:{normalize_accession(qualifier)}:{annotation_type}"
+    table = get_memory_cache().get(cache_key)
+    if table is not None:
+        return table, None
+
+    response, error = await get_backend().get_annotations(qualifier, annotation_type)
+    if not response:
+        return None, error
+
+    table = AnnotationTable.from_response(response)
+    get_memory_cache().set(cache_key, table, expire=settings.CACHE_TTL, size=table.nbytes)
+    return table, None
 
 
 @doc_loader.with_docstring("uniprot_annotations.md")
 async def get_annotations(
     qualifier: str,
     annotation_type: str = "MUTAGEN",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    min_score: Optional[float] = None,
+    top_k: Optional[int] = None,
+    per_position: bool = False,
     output_json: bool = True,
 ) -> Union[str, Dict[str, Any]]:
     """
-    Get all annotations for a UniProt residue range.
+    Get annotation scores for a UniProt accession, filtered on the server.
 
     Args:
         qualifier (str): UniProt accession
         annotation_type (str): Type of annotation (e.g., MUTAGEN for AlphaMissense)
+        start (int, optional): First residue of the range
+        end (int, optional): Last residue of the range
+        min_score (float, optional): Lowest score to return
+        top_k (int, optional): Only return the `k` highest scores (most pathogenic), highest first
+        per_position (bool): Return the count, mean, min and max score of every position instead
 
     Returns:
-        Optional[AnnotationResponse]: Annotation data including residue scores
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: Matching scores or error dictionary
     """
-    url = f"{BASE_URL}/annotations/{qualifier}?annotation_type={annotation_type}"
+    from mcp_alphafold.tools.annotations import query_annotations
 
-    response, error = await request_api(
-        url=url,
-        method="GET",
-        response_model_type=AnnotationResponse,
-    )
-    if response:
-        data = response.model_dump_json(exclude_none=True)
+    table: Optional["AnnotationTable"] = None
+    error: Optional[RequestError] = None
+    if top_k is not None and top_k < 1:
+        error = RequestError(code=400, message="top_k must be at least 1")
+    elif top_k is not None and top_k > settings.ANNOTATION_MAX_RESULTS:
+        error = RequestError(code=400, message=f"top_k must be at most {settings.ANNOTATION_MAX_RESULTS}")
+    else:
+        table, error = await fetch_annotation_table(qualifier, annotation_type)
+
+    data: Dict[str, Any]
+    if table is not None:
+        data = query_annotations(
+            table,
+            start=start,
+            end=end,
+            min_score=min_score,
+            top_k=top_k,
+            per_position=per_position,
+            max_results=settings.ANNOTATION_MAX_RESULTS,
+        )
     else:
         error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
-        error_data: Dict[str, Any] = {"error": error_msg}
+        data = {"error": error_msg}
 
-    return json.dumps(data) if output_json else error_data
+    return json.dumps(data) if output_json else data
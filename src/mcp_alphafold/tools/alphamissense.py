@@ -0,0 +1,435 @@
+"""Local AlphaMissense variant store built from the AlphaFold Database CSV files.
+
+Each CSV is streamed into SQLite once, keyed by the SHA-256 of the file, so
+variant lookups are answered from an index instead of downloading and parsing
+the CSV again.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Literal, Optional, Tuple, Union
+
+from fastmcp import FastMCP
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.files import get_latest_entry
+from mcp_alphafold.utils.doc import DocLoader
+from mcp_alphafold.utils.http import RequestError, get_cache_dir
+from mcp_alphafold.utils.metrics import instrument_tool
+from mcp_alphafold.utils.store import StoredFile, get_file_store
+
+# CSV kinds and the EntrySummary field each one is downloaded from
+ALPHAMISSENSE_URL_FIELDS = {
+    "protein": "amAnnotationsUrl",
+    "hg19": "amAnnotationsHg19Url",
+    "hg38": "amAnnotationsHg38Url",
+}
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    accession TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    loaded_at REAL NOT NULL,
+    PRIMARY KEY (accession, kind)
+);
+CREATE TABLE IF NOT EXISTS protein_variants (
+    accession TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    ref TEXT NOT NULL,
+    alt TEXT NOT NULL,
+    score REAL NOT NULL,
+    class TEXT,
+    PRIMARY KEY (accession, position, alt)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS genomic_variants (
+    genome TEXT NOT NULL,
+    chrom TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    ref TEXT NOT NULL,
+    alt TEXT NOT NULL,
+    accession TEXT NOT NULL,
+    transcript_id TEXT NOT NULL,
+    protein_variant TEXT NOT NULL,
+    score REAL NOT NULL,
+    class TEXT,
+    PRIMARY KEY (genome, chrom, pos, ref, alt, transcript_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS genomic_variants_accession ON genomic_variants (accession, genome);
+"""
+doc_loader = DocLoader()
+_alphamissense_store: Optional["AlphaMissenseStore"] = None
+
+
+def alphamissense_tools(mcp: FastMCP):
+    """Add AlphaMissense tools to the MCP server."""
+    tools = [
+        get_alphamissense_variants,
+        get_alphamissense_genomic_variants,
+    ]
+    for tool in tools:
+        mcp.add_tool(instrument_tool(tool))
+
+
+def parse_protein_variant(variant: str) -> Tuple[str, int, str]:
+    """Split a protein variant such as 'M1A' into reference residue, position and alternative residue."""
+    variant = variant.strip()
+    if len(variant) < 3 or not variant[1:-1].isdigit():
+        raise ValueError(f"Invalid protein variant: {variant}")
+    return variant[0], int(variant[1:-1]), variant[-1]
+
+
+def _read_rows(fh: IO[str]) -> Tuple[Dict[str, int], Iterator[List[str]]]:
+    """Read the header of an open CSV or TSV file and return its column indices and an iterator over its rows."""
+    header_line = fh.readline()
+    dialect = "excel-tab" if "\t" in header_line else "excel"
+    header = next(csv.reader([header_line], dialect=dialect))
+    columns = {name.strip().lstrip("#").lower(): i for i, name in enumerate(header)}
+    return columns, csv.reader(fh, dialect=dialect)
+
+
+class AlphaMissenseStore:
+    """Store AlphaMissense scores in SQLite, indexed by protein variant and genomic coordinate."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # Loads write one at a time; lookups wait for a load of another process up to the busy timeout
+        self._load_lock = threading.Lock()
+        self.db = self._connect()
+        self.db.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=settings.ALPHAMISSENSE_BUSY_TIMEOUT, check_same_thread=False)
+        # Lookups keep running on the main connection while a load writes through its own one
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def source(self, accession: str, kind: str) -> Optional[Dict[str, Any]]:
+        """Return the loaded file of an accession and CSV kind, if any."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT url, sha256, rows, loaded_at FROM sources WHERE accession = ? AND kind = ?",
+                (accession, kind),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"url": row[0], "sha256": row[1], "rows": row[2], "loaded_at": row[3]}
+
+    def load(self, accession: str, kind: str, stored: StoredFile) -> int:
+        """
+        Load a CSV file of an accession into the store, replacing the previously loaded file.
+
+        A file with the same SHA-256 as the loaded one is skipped, including
+        when a concurrent load of the same file finished first.
+
+        Args:
+            accession: UniProt accession the file belongs to
+            kind: 'protein' for amino acid substitutions, 'hg19' or 'hg38' for genomic variants
+            stored: Downloaded CSV file
+
+        Returns:
+            The number of rows in the store for the file
+
+        Raises:
+            sqlite3.OperationalError: The database stayed locked by another process
+        """
+        with self._load_lock:
+            return self._load(accession, kind, stored)
+
+    def _load(self, accession: str, kind: str, stored: StoredFile) -> int:
+        source = self.source(accession, kind)
+        if source is not None and source["sha256"] == stored.sha256:
+            return source["rows"]
+
+        with open(stored.path, newline="") as fh:
+            columns, rows = _read_rows(fh)
+            delete: Tuple[str, Tuple[str, ...]]
+            if kind == "protein":
+                statements = self._protein_rows(accession, columns, rows)
+                delete = ("DELETE FROM protein_variants WHERE accession = ?", (accession,))
+                insert = "INSERT OR REPLACE INTO protein_variants VALUES (?, ?, ?, ?, ?, ?)"
+            else:
+                statements = self._genomic_rows(accession, kind, columns, rows)
+                delete = ("DELETE FROM genomic_variants WHERE accession = ? AND genome = ?", (accession, kind))
+                insert = "INSERT OR REPLACE INTO genomic_variants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+            count = 0
+            db = self._connect()
+            try:
+                with db:
+                    db.execute(*delete)
+                    while batch := list(islice(statements, settings.ALPHAMISSENSE_BATCH_SIZE)):
+                        db.executemany(insert, batch)
+                        count += len(batch)
+                    db.execute(
+                        "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)",
+                        (accession, kind, stored.url, stored.sha256, count, time.time()),
+                    )
+            finally:
+                db.close()
+        return count
+
+    @staticmethod
+    def _require(columns: Dict[str, int], names: List[str]) -> List[int]:
+        missing = [name for name in names if name not in columns]
+        if missing:
+            raise ValueError(f"AlphaMissense file is missing columns: {', '.join(missing)}")
+        return [columns[name] for name in names]
+
+    def _protein_rows(
+        self,
+        accession: str,
+        columns: Dict[str, int],
+        rows: Iterator[List[str]],
+    ) -> Iterator[Tuple[Any, ...]]:
+        variant, score, am_class = self._require(columns, ["protein_variant", "am_pathogenicity", "am_class"])
+        for row in rows:
+            if not row:
+                continue
+            ref, position, alt = parse_protein_variant(row[variant])
+            yield accession, position, ref, alt, float(row[score]), row[am_class]
+
+    def _genomic_rows(
+        self,
+        accession: str,
+        genome: str,
+        columns: Dict[str, int],
+        rows: Iterator[List[str]],
+    ) -> Iterator[Tuple[Any, ...]]:
+        chrom, pos, ref, alt, variant, score, am_class = self._require(
+            columns, ["chrom", "pos", "ref", "alt", "protein_variant", "am_pathogenicity", "am_class"]
+        )
+        transcript = columns.get("transcript_id")
+        for row in rows:
+            if not row:
+                continue
+            yield (
+                genome,
+                row[chrom],
+                int(row[pos]),
+                row[ref],
+                row[alt],
+                accession,
+                row[transcript] if transcript is not None else "",
+                row[variant],
+                float(row[score]),
+                row[am_class],
+            )
+
+    def protein_variants(
+        self,
+        accession: str,
+        variants: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        min_score: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the amino acid substitutions of an accession matching the given filters."""
+        query = "SELECT position, ref, alt, score, class FROM protein_variants WHERE accession = ?"
+        params: List[Any] = [accession]
+        if variants and len(variants) > settings.ALPHAMISSENSE_MAX_VARIANTS:
+            raise ValueError(f"At most {settings.ALPHAMISSENSE_MAX_VARIANTS} variants can be looked up at once")
+        if variants:
+            parsed = [parse_protein_variant(variant) for variant in variants]
+            query += " AND (" + " OR ".join("(position = ? AND alt = ?)" for _ in parsed) + ")"
+            params += [value for _, position, alt in parsed for value in (position, alt)]
+        if start is not None:
+            query += " AND position >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND position <= ?"
+            params.append(end)
+        if min_score is not None:
+            query += " AND score >= ?"
+            params.append(min_score)
+        query += " ORDER BY position, alt"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self.db.execute(query, params).fetchall()
+        return [
+            {"variant": f"{ref}{position}{alt}", "score": score, "class": am_class}
+            for position, ref, alt, score, am_class in rows
+        ]
+
+    def genomic_variants(
+        self,
+        accession: str,
+        genome: str,
+        chrom: str,
+        pos: int,
+        ref: Optional[str] = None,
+        alt: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the variants of an accession at a genomic coordinate of the given genome build."""
+        query = (
+            "SELECT chrom, pos, ref, alt, accession, transcript_id, protein_variant, score, class "
+            "FROM genomic_variants WHERE genome = ? AND chrom = ? AND pos = ? AND accession = ?"
+        )
+        params: List[Any] = [genome, chrom, pos, accession]
+        if ref is not None:
+            query += " AND ref = ?"
+            params.append(ref)
+        if alt is not None:
+            query += " AND alt = ?"
+            params.append(alt)
+
+        with self._lock:
+            rows = self.db.execute(query, params).fetchall()
+        keys = ["chrom", "pos", "ref", "alt", "accession", "transcript_id", "protein_variant", "score", "class"]
+        return [dict(zip(keys, row, strict=True)) for row in rows]
+
+
+def get_alphamissense_store() -> AlphaMissenseStore:
+    """Initialize and return the AlphaMissense store."""
+    global _alphamissense_store
+    if _alphamissense_store is None:
+        _alphamissense_store = AlphaMissenseStore(
+            settings.ALPHAMISSENSE_DB or os.path.join(get_cache_dir(), "alphamissense.sqlite3")
+        )
+    return _alphamissense_store
+
+
+async def load_alphamissense(qualifier: str, kind: str = "protein") -> Tuple[Optional[str], Optional[RequestError]]:
+    """
+    Make sure the AlphaMissense CSV of an accession is loaded into the local store.
+
+    The CSV is downloaded through the file store, which revalidates it after
+    `FILE_STORE_TTL`, and loaded again only when its content changed.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'P00520')
+        kind (str): 'protein' for amino acid substitutions, 'hg19' or 'hg38' for genomic variants
+
+    Returns:
+        Tuple[Optional[str], Optional[RequestError]]: The accession the rows are stored under, or an error
+    """
+    field = ALPHAMISSENSE_URL_FIELDS.get(kind)
+    if field is None:
+        return None, RequestError(code=400, message=f"Unsupported AlphaMissense file: {kind}")
+
+    entry, error = await get_latest_entry(qualifier)
+    if not entry:
+        return None, error
+    url = getattr(entry, field)
+    if not url:
+        return None, RequestError(code=404, message=f"No AlphaMissense {kind} annotations for {qualifier}")
+
+    stored, error = await get_file_store().fetch(url)
+    if not stored:
+        return None, error
+
+    store = get_alphamissense_store()
+    source = store.source(entry.uniprotAccession, kind)
+    if source is None or source["sha256"] != stored.sha256:
+        try:
+            await asyncio.to_thread(store.load, entry.uniprotAccession, kind, stored)
+        except (ValueError, IndexError, csv.Error) as e:
+            return None, RequestError(code=502, message=f"Could not parse AlphaMissense file: {str(e)}")
+        except sqlite3.OperationalError as e:
+            return None, RequestError(code=503, message=f"AlphaMissense store is busy: {str(e)}")
+    return entry.uniprotAccession, None
+
+
+@doc_loader.with_docstring("alphamissense_variants.md")
+async def get_alphamissense_variants(
+    qualifier: str,
+    variants: Optional[List[str]] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    min_score: Optional[float] = None,
+    output_json: bool = True,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Get AlphaMissense pathogenicity scores of amino acid substitutions from the local store.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'P00520')
+        variants (List[str], optional): Substitutions such as 'M1A'
+        start (int, optional): First residue of the range
+        end (int, optional): Last residue of the range
+        min_score (float, optional): Lowest score to return
+
+    Returns:
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: Matching variants or error dictionary
+    """
+    accession, error = await load_alphamissense(qualifier, "protein")
+
+    data: Dict[str, Any]
+    if accession and not error:
+        limit = settings.ANNOTATION_MAX_RESULTS
+        try:
+            rows = get_alphamissense_store().protein_variants(
+                accession, variants=variants, start=start, end=end, min_score=min_score, limit=limit + 1
+            )
+        except ValueError as e:
+            error = RequestError(code=400, message=str(e))
+        except sqlite3.OperationalError as e:
+            error = RequestError(code=503, message=f"AlphaMissense store is busy: {str(e)}")
+        else:
+            data = {"accession": accession, "variants": rows[:limit], "truncated": len(rows) > limit}
+
+    if error:
+        error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
+        data = {"error": error_msg}
+
+    return json.dumps(data) if output_json else data
+
+
+@doc_loader.with_docstring("alphamissense_genomic_variants.md")
+async def get_alphamissense_genomic_variants(
+    qualifier: str,
+    chrom: str,
+    pos: int,
+    ref: Optional[str] = None,
+    alt: Optional[str] = None,
+    genome: Literal["hg38", "hg19"] = "hg38",
+    output_json: bool = True,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Get AlphaMissense pathogenicity scores of the variants at a genomic coordinate from the local store.
+
+    Args:
+        qualifier (str): UniProt accession of the protein the variant falls in (e.g., 'P00520')
+        chrom (str): Chromosome, e.g. 'chr9'
+        pos (int): 1-based genomic position
+        ref (str, optional): Reference nucleotide
+        alt (str, optional): Alternative nucleotide
+        genome (str): Genome build, 'hg38' or 'hg19'
+
+    Returns:
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: Matching variants or error dictionary
+    """
+    accession, error = await load_alphamissense(qualifier, genome)
+
+    data: Dict[str, Any]
+    if accession and not error:
+        try:
+            rows = get_alphamissense_store().genomic_variants(accession, genome, chrom, pos, ref=ref, alt=alt)
+        except sqlite3.OperationalError as e:
+            error = RequestError(code=503, message=f"AlphaMissense store is busy: {str(e)}")
+        else:
+            data = {"genome": genome, "variants": rows}
+
+    if error:
+        error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
+        data = {"error": error_msg}
+
+    return json.dumps(data) if output_json else data
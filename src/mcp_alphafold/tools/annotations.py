@@ -0,0 +1,212 @@
+"""Columnar store of per-residue annotation scores.
+
+Annotation responses are flattened into NumPy columns (position, substitution,
+score) so that filters, rankings and per-position aggregates are computed with
+vectorized operations instead of walking nested lists of regions.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from mcp_alphafold.tools.models import AnnotationResponse
+
+
+class AnnotationTable(BaseModel):
+    """Annotation scores of one accession, one row per (position, substitution).
+
+    `substitution` holds codes into `labels`.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    accession: str
+    id: str
+    sequence: str
+    sources: List[Dict[str, Any]]  # annotation metadata without the scores
+    labels: List[str]
+    position: np.ndarray  # (n,) int32, 1-based residue number
+    substitution: np.ndarray  # (n,) int16
+    score: np.ndarray  # (n,) float32
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    @property
+    def nbytes(self) -> int:
+        return self.position.nbytes + self.substitution.nbytes + self.score.nbytes + len(self.sequence)
+
+    @classmethod
+    def from_response(cls, response: AnnotationResponse) -> "AnnotationTable":
+        """Flatten the regions of every annotation into columns sorted by position."""
+        labels: List[str] = []
+        positions, substitutions, scores = [], [], []
+        for annotation in response.annotation:
+            if annotation.description not in labels:
+                labels.append(annotation.description)
+            code = labels.index(annotation.description)
+            for region in annotation.regions or []:
+                values = np.asarray(region.annotation_value or [], dtype=np.float32)
+                positions.append(np.arange(region.start, region.start + len(values), dtype=np.int32))
+                substitutions.append(np.full(len(values), code, dtype=np.int16))
+                scores.append(values)
+
+        table = cls(
+            accession=response.accession,
+            id=response.id,
+            sequence=response.sequence,
+            sources=[
+                annotation.model_dump(mode="json", exclude={"residues", "regions"}, exclude_none=True)
+                for annotation in response.annotation
+            ],
+            labels=labels,
+            position=np.concatenate(positions) if positions else np.empty(0, dtype=np.int32),
+            substitution=np.concatenate(substitutions) if substitutions else np.empty(0, dtype=np.int16),
+            score=np.concatenate(scores) if scores else np.empty(0, dtype=np.float32),
+        )
+        return table.take(np.argsort(table.position, kind="stable"))
+
+    def take(self, index: np.ndarray) -> "AnnotationTable":
+        """Return the rows at the given indices or boolean mask."""
+        return self.model_copy(
+            update={
+                "position": self.position[index],
+                "substitution": self.substitution[index],
+                "score": self.score[index],
+            }
+        )
+
+    def select(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> "AnnotationTable":
+        """Return the rows within a residue range and at or above a score threshold."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.position >= start
+        if end is not None:
+            mask &= self.position <= end
+        if min_score is not None:
+            mask &= self.score >= min_score
+        return self.take(mask)
+
+    def top_k(self, k: int) -> "AnnotationTable":
+        """Return the `k` highest-scoring rows, highest first."""
+        if k < len(self):
+            index = np.argpartition(-self.score, k - 1)[:k]
+        else:
+            index = np.arange(len(self))
+        return self.take(index[np.argsort(-self.score[index], kind="stable")])
+
+    def residues(self, positions: np.ndarray) -> List[str]:
+        """Return the amino acid at each position, or an empty string outside the sequence."""
+        return [self.sequence[p - 1] if 0 < p <= len(self.sequence) else "" for p in positions.tolist()]
+
+    def position_summary(self) -> Dict[str, np.ndarray]:
+        """Aggregate the scores of every position, in position order."""
+        position, score = self.position, self.score
+        if np.any(np.diff(position) < 0):
+            order = np.argsort(position, kind="stable")
+            position, score = position[order], score[order]
+        positions, starts, counts = np.unique(position, return_index=True, return_counts=True)
+        if len(positions) == 0:
+            empty = np.empty(0, dtype=np.float32)
+            return {"position": positions, "count": counts, "mean": empty, "min": empty, "max": empty}
+        return {
+            "position": positions,
+            "count": counts,
+            "mean": np.add.reduceat(score, starts, dtype=np.float64) / counts,
+            "min": np.minimum.reduceat(score, starts),
+            "max": np.maximum.reduceat(score, starts),
+        }
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Return the rows as a list of small dictionaries."""
+        labels = np.asarray(self.labels, dtype=object)
+        return [
+            {"position": position, "residue": residue, "substitution": substitution, "score": round(score, 4)}
+            for position, residue, substitution, score in zip(
+                self.position.tolist(),
+                self.residues(self.position),
+                labels[self.substitution].tolist() if len(labels) else [],
+                self.score.tolist(),
+                strict=True,
+            )
+        ]
+
+
+def query_annotations(
+    table: AnnotationTable,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    min_score: Optional[float] = None,
+    top_k: Optional[int] = None,
+    per_position: bool = False,
+    max_results: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Filter an annotation table and return a compact response.
+
+    Args:
+        table (AnnotationTable): Annotations of an accession
+        start (int, optional): First residue of the range
+        end (int, optional): Last residue of the range
+        min_score (float, optional): Lowest score to return
+        top_k (int, optional): Only return the `k` highest scores, highest first
+        per_position (bool): Aggregate the scores of every position instead of returning them
+        max_results (int, optional): Largest number of rows returned, `top_k` included
+    """
+    requested = top_k
+    if top_k is not None and max_results is not None:
+        top_k = min(top_k, max_results)
+    selected = table.select(start=start, end=end, min_score=min_score)
+    data: Dict[str, Any] = {
+        "accession": table.accession,
+        "id": table.id,
+        "annotations": table.sources,
+    }
+
+    if per_position:
+        summary = selected.position_summary()
+        total = len(summary["position"])
+        if top_k is not None:
+            order = np.argsort(-summary["mean"], kind="stable")[:top_k]
+        else:
+            order = np.arange(total if max_results is None else min(total, max_results))
+        positions = summary["position"][order]
+        data["total"] = total
+        data["positions"] = [
+            {
+                "position": position,
+                "residue": residue,
+                "count": count,
+                "mean": round(mean, 4),
+                "min": round(low, 4),
+                "max": round(high, 4),
+            }
+            for position, residue, count, mean, low, high in zip(
+                positions.tolist(),
+                table.residues(positions),
+                summary["count"][order].tolist(),
+                summary["mean"][order].tolist(),
+                summary["min"][order].tolist(),
+                summary["max"][order].tolist(),
+                strict=True,
+            )
+        ]
+        returned = len(order)
+    else:
+        total = len(selected)
+        if top_k is not None:
+            selected = selected.top_k(top_k)
+        elif max_results is not None and total > max_results:
+            selected = selected.take(np.arange(max_results))
+        data["total"] = total
+        data["scores"] = selected.records()
+        returned = len(selected)
+
+    data["truncated"] = returned < (total if requested is None else min(total, requested))
+    return data
@@ -0,0 +1,234 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from fastmcp import FastMCP
+from pydantic import BaseModel
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.files import get_latest_entry
+from mcp_alphafold.utils.doc import DocLoader
+from mcp_alphafold.utils.http import RequestError, cache_response, get_cache_response
+from mcp_alphafold.utils.metrics import instrument_tool
+from mcp_alphafold.utils.store import get_file_store
+
+if TYPE_CHECKING:
+    # numpy and the model parser are imported where used, so starting the server does not load them
+    import numpy as np
+
+# pLDDT confidence bands used by the AlphaFold Database, as (name, lower bound, upper bound)
+PLDDT_BANDS: List[Tuple[str, float, float]] = [
+    ("veryHigh", 90.0, 100.0),
+    ("confident", 70.0, 90.0),
+    ("low", 50.0, 70.0),
+    ("veryLow", 0.0, 50.0),
+]
+PLDDT_MAX_BINS = 100
+# Version of the cached summary layout, raised when its fields change so that older summaries are not read back
+PLDDT_SUMMARY_VERSION = 2
+doc_loader = DocLoader()
+
+
+# Field names are camelCase, like those of the AlphaFold Database API
+class PlddtSegment(BaseModel):
+    start: int
+    end: int
+    length: int
+    meanPlddt: float
+
+
+class PlddtSummary(BaseModel):
+    entryId: str
+    uniprotAccession: str
+    modelVersion: int
+    residues: int
+    meanPlddt: float
+    medianPlddt: float
+    bands: Dict[str, float]
+    histogram: Dict[str, List[float]]
+    highConfidenceSegments: List[PlddtSegment]
+    lowConfidenceSegments: List[PlddtSegment]
+
+
+def confidence_tools(mcp: FastMCP):
+    """Add model confidence tools to the MCP server."""
+    mcp.add_tool(instrument_tool(get_plddt_summary))
+
+
+def find_segments(
+    residue_numbers: "np.ndarray",
+    plddt: "np.ndarray",
+    mask: "np.ndarray",
+    min_length: int = 1,
+) -> List[PlddtSegment]:
+    """
+    Find contiguous runs of residues selected by a mask.
+
+    A run also ends at a gap in the residue numbering.
+
+    Args:
+        residue_numbers (np.ndarray): Residue numbers, in model order
+        plddt (np.ndarray): pLDDT of every residue
+        mask (np.ndarray): Boolean mask of the residues to group into segments
+        min_length (int): Shortest segment to return
+    """
+    import numpy as np
+
+    if not mask.any():
+        return []
+    breaks = np.diff(residue_numbers) != 1
+    starts = np.flatnonzero(mask & np.concatenate(([True], ~mask[:-1] | breaks)))
+    ends = np.flatnonzero(mask & np.concatenate((~mask[1:] | breaks, [True]))) + 1
+    keep = ends - starts >= min_length
+    starts, ends = starts[keep], ends[keep]
+    # Mean of every segment from the cumulative sum, without a loop over residues
+    totals = np.concatenate(([0.0], np.cumsum(plddt, dtype=np.float64)))
+    means = (totals[ends] - totals[starts]) / (ends - starts)
+    return [
+        PlddtSegment(
+            start=int(residue_numbers[start]),
+            end=int(residue_numbers[end - 1]),
+            length=int(end - start),
+            meanPlddt=round(float(mean), 2),
+        )
+        for start, end, mean in zip(starts, ends, means, strict=True)
+    ]
+
+
+def summarize_plddt(
+    residue_numbers: "np.ndarray",
+    plddt: "np.ndarray",
+    bins: int = 10,
+    high_threshold: float = 70.0,
+    low_threshold: float = 50.0,
+    min_segment_length: int = 5,
+) -> Dict[str, Any]:
+    """
+    Compute the pLDDT distribution and confidence segments of a model.
+
+    Args:
+        residue_numbers (np.ndarray): Residue numbers, in model order
+        plddt (np.ndarray): pLDDT of every residue
+        bins (int): Number of equal-width histogram bins between 0 and 100
+        high_threshold (float): Lowest pLDDT of a high-confidence residue
+        low_threshold (float): pLDDT below which a residue has low confidence
+        min_segment_length (int): Shortest segment to return
+    """
+    import numpy as np
+
+    n = len(plddt)
+    bands = {}
+    for name, lower, upper in PLDDT_BANDS:
+        in_band = (plddt >= lower) & ((plddt < upper) if upper < 100 else (plddt <= upper))
+        bands[name] = round(float(in_band.sum()) / n, 4) if n else 0.0
+    counts, edges = np.histogram(plddt, bins=bins, range=(0.0, 100.0))
+
+    return {
+        "residues": n,
+        "meanPlddt": round(float(plddt.mean()), 2) if n else 0.0,
+        "medianPlddt": round(float(np.median(plddt)), 2) if n else 0.0,
+        "bands": bands,
+        "histogram": {"edges": edges.round(2).tolist(), "counts": counts.tolist()},
+        "highConfidenceSegments": find_segments(
+            residue_numbers, plddt, plddt >= high_threshold, min_length=min_segment_length
+        ),
+        "lowConfidenceSegments": find_segments(
+            residue_numbers, plddt, plddt < low_threshold, min_length=min_segment_length
+        ),
+    }
+
+
+def read_residue_plddt(path: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Read the residue numbers and pLDDT of an mmCIF model file."""
+    from mcp_alphafold.tools.structure import parse_mmcif
+
+    with open(path, "rb") as fh:
+        return parse_mmcif(fh).residue_plddt()
+
+
+async def fetch_plddt_summary(
+    qualifier: str,
+    bins: int = 10,
+    high_threshold: float = 70.0,
+    low_threshold: float = 50.0,
+    min_segment_length: int = 5,
+) -> Tuple[Optional[PlddtSummary], Optional[RequestError]]:
+    """
+    Compute the pLDDT summary of the latest model of an accession.
+
+    Summaries are cached per model version and parameters, so the model file is
+    only downloaded and parsed once.
+    """
+    if bins < 1 or min_segment_length < 1:
+        return None, RequestError(code=400, message="bins and min_segment_length must be at least 1")
+    if bins > PLDDT_MAX_BINS:
+        return None, RequestError(code=400, message=f"bins must be at most {PLDDT_MAX_BINS}")
+    if high_threshold < low_threshold:
+        return None, RequestError(code=400, message="high_threshold must not be below low_threshold")
+
+    entry, error = await get_latest_entry(qualifier)
+    if not entry:
+        return None, error
+
+    cache_key = (
+        f"plddt:{PLDDT_SUMMARY_VERSION}:{entry.entryId}:v{entry.latestVersion}:{bins}:{high_threshold:g}:"
+        f"{low_threshold:g}:{min_segment_length}"
+    )
+    cached = get_cache_response(cache_key)
+    if cached:
+        return PlddtSummary.model_validate_json(cached), None
+
+    # BinaryCIF needs a msgpack decoder, so pLDDT is read from the text mmCIF file
+    stored, error = await get_file_store().fetch(entry.cifUrl)
+    if not stored:
+        return None, error
+
+    try:
+        residue_numbers, plddt = await asyncio.to_thread(read_residue_plddt, stored.path)
+    except ValueError as e:
+        return None, RequestError(code=502, message=f"Could not parse model file: {str(e)}")
+
+    summary = PlddtSummary(
+        entryId=entry.entryId,
+        uniprotAccession=entry.uniprotAccession,
+        modelVersion=entry.latestVersion,
+        **summarize_plddt(residue_numbers, plddt, bins, high_threshold, low_threshold, min_segment_length),
+    )
+    cache_response(cache_key, summary.model_dump_json(), settings.STRUCTURE_CACHE_TTL)
+    return summary, None
+
+
+@doc_loader.with_docstring("plddt_summary.md")
+async def get_plddt_summary(
+    qualifier: str,
+    bins: int = 10,
+    high_threshold: float = 70.0,
+    low_threshold: float = 50.0,
+    min_segment_length: int = 5,
+    output_json: bool = True,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Summarize the per-residue pLDDT of the latest AlphaFold model of a UniProt accession.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'Q5VSL9')
+        bins (int): Number of equal-width histogram bins between 0 and 100, at most 100
+        high_threshold (float): Lowest pLDDT of a high-confidence residue, at least `low_threshold`
+        low_threshold (float): pLDDT below which a residue has low confidence
+        min_segment_length (int): Shortest segment to return
+
+    Returns:
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: pLDDT summary or error dictionary
+    """
+    summary, error = await fetch_plddt_summary(qualifier, bins, high_threshold, low_threshold, min_segment_length)
+
+    data: Dict[str, Any]
+    if summary:
+        data = summary.model_dump()
+    else:
+        error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
+        data = {"error": error_msg}
+
+    return json.dumps(data) if output_json else data
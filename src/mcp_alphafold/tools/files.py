@@ -0,0 +1,182 @@
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple, Union
+
+from fastmcp import FastMCP
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.alphafold import get_backend
+from mcp_alphafold.tools.models import EntrySummary
+from mcp_alphafold.utils.doc import DocLoader
+from mcp_alphafold.utils.http import RequestError
+from mcp_alphafold.utils.metrics import instrument_tool
+from mcp_alphafold.utils.store import StoredFile, get_file_store
+
+MODEL_FILE_URL_FIELDS = {
+    "pdb": "pdbUrl",
+    "cif": "cifUrl",
+    "mmcif": "cifUrl",
+    "bcif": "bcifUrl",
+}
+BINARY_FILE_FORMATS = {"bcif"}
+MODEL_FILE_URI = "alphafold://files/{qualifier}/{file_format}"
+MODEL_FILE_RANGE_URI = "alphafold://files/{qualifier}/{file_format}/{offset}"
+doc_loader = DocLoader()
+
+
+def files_tools(mcp: FastMCP):
+    """Add model file tools to the MCP server."""
+    mcp.add_tool(instrument_tool(get_model_file))
+
+
+def files_resources(mcp: FastMCP):
+    """Add model file resources to the MCP server."""
+    mcp.add_resource_fn(
+        read_model_file,
+        uri=MODEL_FILE_URI,
+        name="alphafold_model_file",
+        description=(
+            "Metadata of the AlphaFold model file of a UniProt accession in PDB, mmCIF or BinaryCIF format, "
+            "with the resource URIs of its consecutive byte ranges"
+        ),
+        mime_type="application/json",
+    )
+    mcp.add_resource_fn(
+        read_model_file_range,
+        uri=MODEL_FILE_RANGE_URI,
+        name="alphafold_model_file_range",
+        description="Byte range of an AlphaFold model file starting at an offset, of at most FILE_READ_MAX_BYTES",
+    )
+
+
+async def get_latest_entry(qualifier: str) -> Tuple[Optional[EntrySummary], Optional[RequestError]]:
+    """
+    Get the latest AlphaFold model entry of a UniProt accession.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'Q5VSL9')
+
+    Returns:
+        Tuple[Optional[EntrySummary], Optional[RequestError]]: The entry or an error
+    """
+    response, error = await get_backend().get_prediction(qualifier)
+    if not response:
+        return None, error
+    if not response.root:
+        return None, RequestError(code=404, message=f"No AlphaFold model found for {qualifier}")
+    return response.root[0], None
+
+
+async def fetch_model_file(
+    qualifier: str,
+    file_format: str = "cif",
+) -> Tuple[Optional[StoredFile], Optional[RequestError]]:
+    """
+    Download the latest AlphaFold model file of a UniProt accession into the file store.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'Q5VSL9')
+        file_format (str): One of 'pdb', 'cif' (or 'mmcif') and 'bcif'
+
+    Returns:
+        Tuple[Optional[StoredFile], Optional[RequestError]]: The stored file or an error
+    """
+    field = MODEL_FILE_URL_FIELDS.get(file_format.lower())
+    if field is None:
+        return None, RequestError(code=400, message=f"Unsupported file format: {file_format}")
+
+    entry, error = await get_latest_entry(qualifier)
+    if not entry:
+        return None, error
+
+    return await get_file_store().fetch(getattr(entry, field))
+
+
+def check_range(offset: int, length: Optional[int] = None) -> Optional[RequestError]:
+    """Return an error for a byte range that does not start within a file or is empty."""
+    if offset < 0:
+        return RequestError(code=400, message="offset must be at least 0")
+    if length is not None and length < 1:
+        return RequestError(code=400, message="length must be at least 1")
+    return None
+
+
+@doc_loader.with_docstring("model_file.md")
+async def get_model_file(
+    qualifier: str,
+    file_format: str = "cif",
+    offset: int = 0,
+    length: Optional[int] = None,
+    output_json: bool = True,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Download an AlphaFold model file and return its metadata and optionally a slice of it.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'Q5VSL9')
+        file_format (str): One of 'pdb', 'cif' (or 'mmcif') and 'bcif'
+        offset (int): First byte of the slice to return, at least 0
+        length (int, optional): Number of bytes to return, at least 1 and capped at FILE_READ_MAX_BYTES
+
+    Returns:
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: File metadata or error dictionary
+    """
+    stored: Optional[StoredFile] = None
+    error = check_range(offset, length)
+    if not error:
+        stored, error = await fetch_model_file(qualifier, file_format)
+
+    data: Dict[str, Any]
+    if stored:
+        data = stored.model_dump(exclude={"path", "fetched_at"}, exclude_none=True)
+        data["resource_uri"] = MODEL_FILE_URI.format(qualifier=qualifier, file_format=file_format.lower())
+        if length is not None:
+            chunk = get_file_store().read_range(stored, offset, min(length, settings.FILE_READ_MAX_BYTES))
+            data["offset"] = offset
+            if file_format.lower() in BINARY_FILE_FORMATS:
+                data["content_base64"] = base64.b64encode(chunk).decode("ascii")
+            else:
+                data["content"] = chunk.decode("utf-8", errors="replace")
+    else:
+        error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
+        data = {"error": error_msg}
+
+    return json.dumps(data) if output_json else data
+
+
+async def read_model_file(qualifier: str, file_format: str) -> str:
+    """
+    Describe an AlphaFold model file in the file store, downloading it first if needed.
+
+    The file is not read: it is served in ranges of at most FILE_READ_MAX_BYTES
+    by `read_model_file_range`, whose resource URIs are listed in `ranges`.
+    """
+    stored, error = await fetch_model_file(qualifier, file_format)
+    if not stored:
+        raise ValueError(f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}")
+
+    data = stored.model_dump(exclude={"path", "fetched_at"}, exclude_none=True)
+    data["range_size"] = settings.FILE_READ_MAX_BYTES
+    data["ranges"] = [
+        MODEL_FILE_RANGE_URI.format(qualifier=qualifier, file_format=file_format.lower(), offset=offset)
+        for offset in range(0, stored.size, settings.FILE_READ_MAX_BYTES)
+    ]
+    return json.dumps(data)
+
+
+async def read_model_file_range(qualifier: str, file_format: str, offset: int) -> Union[str, bytes]:
+    """Read up to FILE_READ_MAX_BYTES of an AlphaFold model file from the file store, starting at `offset`."""
+    offset = int(offset)
+    stored: Optional[StoredFile] = None
+    error = check_range(offset)
+    if not error:
+        stored, error = await fetch_model_file(qualifier, file_format)
+    if error or not stored:
+        raise ValueError(f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}")
+
+    chunk = get_file_store().read_range(stored, offset, settings.FILE_READ_MAX_BYTES)
+    if file_format.lower() in BINARY_FILE_FORMATS:
+        return chunk
+    return chunk.decode("utf-8", errors="replace")
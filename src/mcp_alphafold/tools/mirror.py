@@ -0,0 +1,329 @@
+"""Index of a local mirror of AlphaFold Database files.
+
+The mirror is a directory tree of files named like the AlphaFold Database
+downloads (`AF-Q5VSL9-F1-model_v4.cif`, `AF-Q5VSL9-F1-predicted_aligned_error_v4.json.gz`,
+...), such as an extracted proteome archive. The index maps accessions to files
+in SQLite and is refreshed incrementally: directories whose modification time
+did not change are not listed again. Entry metadata is read from the mmCIF
+header of a model the first time the accession is requested.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from mcp_alphafold.tools.models import EntrySummary
+
+logger = logging.getLogger(__name__)
+
+MIRROR_FILE = re.compile(
+    r"^AF-(?P<accession>[A-Z0-9]+)-F(?P<fragment>\d+)-"
+    r"(?P<kind>model|predicted_aligned_error|aa-substitutions|hg19|hg38)"
+    r"(?:_v(?P<version>\d+))?\.(?P<ext>cif|pdb|bcif|json|csv)(?:\.gz)?$"
+)
+# EntrySummary field of each (kind, extension) found in the mirror
+MIRROR_URL_FIELDS = {
+    ("model", "cif"): "cifUrl",
+    ("model", "pdb"): "pdbUrl",
+    ("model", "bcif"): "bcifUrl",
+    ("predicted_aligned_error", "json"): "paeDocUrl",
+    ("aa-substitutions", "csv"): "amAnnotationsUrl",
+    ("hg19", "csv"): "amAnnotationsHg19Url",
+    ("hg38", "csv"): "amAnnotationsHg38Url",
+}
+CIF_TOKEN = re.compile(r"'[^']*'|\"[^\"]*\"|\S+")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    accession TEXT NOT NULL,
+    fragment INTEGER NOT NULL,
+    version INTEGER,
+    field TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_accession ON files (accession, fragment);
+CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+CREATE TABLE IF NOT EXISTS metadata (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+def _open_text(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def _iter_cif_tokens(fh: IO[str]) -> Iterator[str]:
+    """Yield the tokens of an mmCIF file, with semicolon text fields as single tokens."""
+    text: Optional[List[str]] = None
+    for line in fh:
+        if text is not None:
+            if line.startswith(";"):
+                yield "\n".join(text).strip()
+                text = None
+            else:
+                text.append(line.rstrip("\n"))
+        elif line.startswith(";"):
+            text = [line[1:].rstrip("\n")]
+        elif not line.startswith("#"):
+            for token in CIF_TOKEN.findall(line):
+                yield token[1:-1] if token[0] in "'\"" and len(token) > 1 else token
+
+
+def read_cif_header(fh: IO[str], stop_category: str = "_atom_site.") -> Dict[str, List[str]]:
+    """
+    Read the items of an mmCIF file up to the first item of a category.
+
+    Args:
+        fh: mmCIF file opened in text mode
+        stop_category: Prefix of the first item not to read, by default the coordinates
+
+    Returns:
+        The values of every item; items of a loop have one value per row
+    """
+    items: Dict[str, List[str]] = {}
+    loop: Optional[List[str]] = None
+    position = 0
+    pending: Optional[str] = None
+    for token in _iter_cif_tokens(fh):
+        if token.startswith(stop_category):
+            break
+        if token == "loop_":
+            loop, position, pending = [], 0, None
+        elif token.startswith("_"):
+            if loop is not None and position == 0:
+                loop.append(token)
+                items[token] = []
+            else:
+                loop, pending = None, token
+        elif token.startswith("data_"):
+            loop, pending = None, None
+        elif pending is not None:
+            items[pending] = [token]
+            pending = None
+        elif loop:
+            items[loop[position % len(loop)]].append(token)
+            position += 1
+    return items
+
+
+def read_entry_metadata(path: str) -> Dict[str, Any]:
+    """Read the fields of an EntrySummary available in the header of an AlphaFold mmCIF model."""
+    with _open_text(path) as fh:
+        items = read_cif_header(fh)
+
+    def first(*names: str) -> Optional[str]:
+        for name in names:
+            values = items.get(name)
+            if values and values[0] not in ("?", "."):
+                return values[0]
+        return None
+
+    metadata: Dict[str, Any] = {
+        "uniprotId": first("_ma_target_ref_db_details.db_code"),
+        "uniprotDescription": first("_entity.pdbx_description", "_ma_target_entity.details"),
+        "organismScientificName": first("_ma_target_ref_db_details.organism_scientific"),
+        "gene": first("_ma_target_ref_db_details.gene_name"),
+        "sequenceChecksum": first("_ma_target_ref_db_details.seq_db_sequence_checksum"),
+        "sequenceVersionDate": first("_ma_target_ref_db_details.seq_db_sequence_version_date"),
+        "modelCreatedDate": first(
+            "_pdbx_database_status.recvd_initial_deposition_date",
+            "_pdbx_audit_revision_history.revision_date",
+        ),
+    }
+    for field, name in (
+        ("taxId", "_ma_target_ref_db_details.ncbi_taxonomy_id"),
+        ("uniprotStart", "_ma_target_ref_db_details.seq_db_align_begin"),
+        ("uniprotEnd", "_ma_target_ref_db_details.seq_db_align_end"),
+    ):
+        value = first(name)
+        metadata[field] = int(value) if value and value.isdigit() else None
+    sequence = first("_entity_poly.pdbx_seq_one_letter_code_can", "_entity_poly.pdbx_seq_one_letter_code")
+    metadata["uniprotSequence"] = re.sub(r"\s+", "", sequence) if sequence else None
+    return {key: value for key, value in metadata.items() if value is not None}
+
+
+class MirrorIndex:
+    """Persisted index of the AlphaFold files in a local mirror directory."""
+
+    def __init__(self, root: str, path: str):
+        self.root = os.path.abspath(root)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # Worker processes of the server share the index, and wait for each other's writes
+        self.db = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the mirror directory.
+
+        Directories whose modification time is unchanged are not listed again;
+        their subdirectories are still visited.
+
+        Returns:
+            Counts of scanned and skipped directories, and of indexed and removed files
+        """
+        counts = {"scanned": 0, "skipped": 0, "indexed": 0, "removed": 0}
+        if not os.path.isdir(self.root):
+            logger.warning(f"Local mirror directory {self.root} does not exist")
+            return counts
+
+        with self._lock, self.db:
+            known = dict(self.db.execute("SELECT path, mtime FROM directories").fetchall())
+            children: Dict[str, List[str]] = {}
+            for path, parent in self.db.execute("SELECT path, parent FROM directories"):
+                children.setdefault(parent, []).append(path)
+
+            seen: Set[str] = set()
+            stack: List[Tuple[str, Optional[str]]] = [(self.root, None)]
+            while stack:
+                directory, parent = stack.pop()
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                seen.add(directory)
+                if known.get(directory) == mtime:
+                    counts["skipped"] += 1
+                    stack.extend((child, directory) for child in children.get(directory, []))
+                    continue
+
+                counts["scanned"] += 1
+                indexed = {
+                    path: (size, file_mtime)
+                    for path, size, file_mtime in self.db.execute(
+                        "SELECT path, size, mtime FROM files WHERE directory = ?", (directory,)
+                    )
+                }
+                found: Set[str] = set()
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, directory))
+                            continue
+                        match = MIRROR_FILE.match(entry.name)
+                        field = match and MIRROR_URL_FIELDS.get((match["kind"], match["ext"]))
+                        if not match or not field:
+                            continue
+                        found.add(entry.path)
+                        stat = entry.stat()
+                        if indexed.get(entry.path) == (stat.st_size, stat.st_mtime_ns):
+                            continue
+                        self.db.execute(
+                            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (
+                                entry.path,
+                                directory,
+                                match["accession"],
+                                int(match["fragment"]),
+                                int(match["version"]) if match["version"] else None,
+                                field,
+                                stat.st_size,
+                                stat.st_mtime_ns,
+                            ),
+                        )
+                        counts["indexed"] += 1
+                for path in indexed.keys() - found:
+                    self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+                    counts["removed"] += 1
+                self.db.execute(
+                    "INSERT OR REPLACE INTO directories VALUES (?, ?, ?)",
+                    (directory, parent, mtime),
+                )
+
+            for directory in known.keys() - seen:
+                counts["removed"] += self.db.execute("DELETE FROM files WHERE directory = ?", (directory,)).rowcount
+                self.db.execute("DELETE FROM directories WHERE path = ?", (directory,))
+        return counts
+
+    def metadata(self, path: str) -> Dict[str, Any]:
+        """Return the metadata of a model file, reading its header when it changed since the last time."""
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            row = self.db.execute("SELECT mtime, data FROM metadata WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == mtime:
+            return json.loads(row[1])
+
+        try:
+            metadata = read_entry_metadata(path)
+        except (OSError, UnicodeError) as e:
+            logger.warning(f"Could not read the header of {path}: {str(e)}")
+            metadata = {}
+        metadata.setdefault("modelCreatedDate", datetime.fromtimestamp(mtime / 1e9, tz=timezone.utc).date().isoformat())
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?)",
+                (path, mtime, json.dumps(metadata)),
+            )
+        return metadata
+
+    def entries(self, accession: str) -> List[EntrySummary]:
+        """Synthesize the entries of an accession from the files and model headers in the mirror."""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT path, fragment, version, field FROM files WHERE accession = ? ORDER BY fragment, version",
+                (accession,),
+            ).fetchall()
+
+        fragments: Dict[int, List[Any]] = {}
+        for row in rows:
+            fragments.setdefault(row[1], []).append(row)
+
+        entries = []
+        for fragment, files in fragments.items():
+            versions = sorted({version for _, _, version, _ in files if version is not None})
+            latest = versions[-1] if versions else 1
+            urls = {
+                field: Path(path).as_uri() for path, _, version, field in files if version is None or version == latest
+            }
+            model = next(
+                (path for path, _, version, field in files if field == "cifUrl" and version in (None, latest)), None
+            )
+            metadata = self.metadata(model) if model else {}
+            sequence = metadata.get("uniprotSequence", "")
+            start = metadata.get("uniprotStart", 1)
+            entries.append(
+                EntrySummary.model_validate({
+                    "uniprotId": accession,
+                    "uniprotDescription": "",
+                    "taxId": 0,
+                    "organismScientificName": "",
+                    "uniprotStart": start,
+                    "uniprotEnd": start + len(sequence) - 1 if sequence else start,
+                    "uniprotSequence": sequence,
+                    "modelCreatedDate": "",
+                    **metadata,
+                    "entryId": f"AF-{accession}-F{fragment}",
+                    "uniprotAccession": accession,
+                    "latestVersion": latest,
+                    "allVersions": versions or [latest],
+                    "bcifUrl": "",
+                    "cifUrl": "",
+                    "pdbUrl": "",
+                    "paeImageUrl": "",
+                    "paeDocUrl": "",
+                    **urls,
+                })
+            )
+        return entries
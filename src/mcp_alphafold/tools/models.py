@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, RootModel
+from pydantic import BaseModel, ConfigDict, Field, RootModel
+
+# Response models are frozen: validated responses are cached in memory and shared between requests
+FROZEN = ConfigDict(frozen=True)
 
 
 class AnnotationType(Enum):
@@ -101,6 +104,8 @@ class ModelCategory(str, Enum):
 class EntrySummary(BaseModel):
     """Schema for AlphaFold prediction response"""
 
+    model_config = FROZEN
+
     entryId: str = Field(..., description="Unique identifier for the entry")
     gene: Optional[str] = Field(None, description="Gene associated with the entry")
     sequenceChecksum: Optional[str] = Field(None, description="Checksum of the sequence")
@@ -131,6 +136,8 @@ class EntrySummary(BaseModel):
 
 
 class EntrySummaryResponse(RootModel):
+    model_config = FROZEN
+
     root: List[EntrySummary]
 
 
@@ -138,6 +145,8 @@ class EntrySummaryResponse(RootModel):
 class UniprotEntry(BaseModel):
     """Schema for UniProt entry in the response"""
 
+    model_config = FROZEN
+
     ac: str = Field(..., description="UniProt accession")
     id: Optional[str] = Field(None, description="UniProt identifier")
     uniprot_checksum: Optional[str] = Field(None, description="CRC64 checksum of the UniProt sequence")
@@ -149,6 +158,8 @@ class UniprotEntry(BaseModel):
 class Entity(BaseModel):
     """Schema for entity in structure summary"""
 
+    model_config = FROZEN
+
     entity_type: EntityType = Field(..., description="Type of the entity")
     entity_poly_type: Optional[EntityPolyType] = Field(
         None, description="The type of the molecular entity; similar to _entity_poly.type in mmCIF"
@@ -162,6 +173,8 @@ class Entity(BaseModel):
 class StructureSummary(BaseModel):
     """Schema for structure summary"""
 
+    model_config = FROZEN
+
     model_identifier: str = Field(..., description="Identifier of the model, such as PDB id")
     model_category: ModelCategory = Field(..., description="Category of the model")
     model_url: str = Field(..., description="URL of the model coordinates")
@@ -220,12 +233,16 @@ class StructureSummary(BaseModel):
 class Structure(BaseModel):
     """Schema for structure in the response"""
 
+    model_config = FROZEN
+
     summary: StructureSummary
 
 
 class UniprotSummaryResponse(BaseModel):
     """Schema for complete UniProt summary API response"""
 
+    model_config = FROZEN
+
     uniprot_entry: UniprotEntry = Field(..., description="UniProt entry data")
     structures: List[Structure] = Field(..., description="List of structures associated with the UniProt entry")
 
@@ -234,6 +251,8 @@ class UniprotSummaryResponse(BaseModel):
 class Region(BaseModel):
     """Schema for annotation region"""
 
+    model_config = FROZEN
+
     start: int = Field(..., description="The first position of the sequence")
     end: int = Field(..., description="The last position of the sequence")
     annotation_value: Optional[List[float]] = Field(None, description="List of annotation scores")
@@ -243,6 +262,8 @@ class Region(BaseModel):
 class Annotation(BaseModel):
     """Schema for annotation"""
 
+    model_config = FROZEN
+
     type: AnnotationType = Field(..., description="Type of annotation (e.g., 'MUTAGEN')")
     description: str = Field(..., description="Description of the annotation")
     source_name: str = Field(..., description="Name of the source of the annotation")
@@ -255,6 +276,8 @@ class Annotation(BaseModel):
 class AnnotationResponse(BaseModel):
     """Schema for complete annotation response"""
 
+    model_config = FROZEN
+
     accession: str = Field(..., description="UniProt accession (e.g., 'Q5VSL9')")
     id: str = Field(..., description="UniProt ID (e.g., 'STRP1_HUMAN')")
     sequence: str = Field(..., description="Full protein sequence")
@@ -0,0 +1,350 @@
+import asyncio
+import functools
+import json
+import math
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from fastmcp import FastMCP
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.files import get_latest_entry
+from mcp_alphafold.utils.doc import DocLoader
+from mcp_alphafold.utils.http import RequestError
+from mcp_alphafold.utils.metrics import instrument_tool
+from mcp_alphafold.utils.store import StoredFile, get_file_store
+
+if TYPE_CHECKING:
+    # numpy is imported where used, so starting the server does not load it
+    import numpy as np
+
+# Matrix of the current PAE format, or the flat list of older (v1/v2) files
+PAE_KEY = re.compile(rb'"(?:predicted_aligned_error|distance)"\s*:\s*\[')
+PAE_QUANTUM = 0.25  # Å per step of uint8-encoded matrices
+doc_loader = DocLoader()
+_conversions: Dict[Path, "asyncio.Future[None]"] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _number_chars() -> "np.ndarray":
+    """Return the lookup table of the bytes that can appear in a JSON number."""
+    import numpy as np
+
+    table = np.zeros(256, dtype=bool)
+    table[np.frombuffer(b"0123456789.-+eE", dtype=np.uint8)] = True
+    return table
+
+
+def pae_tools(mcp: FastMCP):
+    """Add PAE tools to the MCP server."""
+    tools = [
+        get_pae_matrix,
+        get_pae_domain_stats,
+    ]
+    for tool in tools:
+        mcp.add_tool(instrument_tool(tool))
+
+
+def _parse_numbers(buf: "np.ndarray") -> "np.ndarray":
+    """Parse every JSON number in a byte buffer that ends on a delimiter."""
+    import numpy as np
+
+    from mcp_alphafold.tools.structure import gather_fields
+
+    is_number = _number_chars()[buf]
+    starts = np.flatnonzero(is_number & ~np.concatenate(([False], is_number[:-1])))
+    ends = np.flatnonzero(is_number & ~np.concatenate((is_number[1:], [False]))) + 1
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.float32)
+    fields = gather_fields(buf, starts, ends - starts)
+    if fields.dtype.itemsize > 8:
+        return fields.astype(np.float32)
+    # PAE files repeat a few hundred distinct values, so every distinct value is converted once
+    unique, inverse = np.unique(fields.astype("S8").view(np.uint64), return_inverse=True)
+    return unique.view("S8").astype(np.float32)[inverse]
+
+
+def parse_pae(fh: IO[bytes], chunk_size: Optional[int] = None) -> "np.ndarray":
+    """
+    Parse the PAE matrix of an AlphaFold PAE JSON file into an (N, N) float32 array.
+
+    The file is read in blocks and the numbers of every block are parsed with
+    vectorized NumPy operations, so no Python object is created per value.
+    """
+    import numpy as np
+
+    chunk_size = chunk_size or settings.STRUCTURE_PARSE_CHUNK_SIZE
+
+    head = b""
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            raise ValueError("No PAE matrix found")
+        head += chunk
+        match = PAE_KEY.search(head)
+        if match:
+            break
+        # Keep enough of the tail to find a key split across two blocks
+        head = head[-64:]
+
+    parts = []
+    depth = 1
+    data = head[match.end() :]
+    while True:
+        buf = np.frombuffer(data, dtype=np.uint8)
+        # Only parse up to the last delimiter; a number cut by the block end is kept for the next block
+        tail = max(0, len(buf) - 64)
+        delimiters = np.flatnonzero(~_number_chars()[buf[tail:]])
+        cut = tail + int(delimiters[-1]) + 1 if len(delimiters) else 0
+        nesting = depth + np.cumsum((buf[:cut] == ord("[")).astype(np.int64) - (buf[:cut] == ord("]")))
+        closed = np.flatnonzero(nesting == 0)
+        if len(closed):
+            parts.append(_parse_numbers(buf[: closed[0]]))
+            break
+        if cut:
+            depth = int(nesting[-1])
+            parts.append(_parse_numbers(buf[:cut]))
+
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            raise ValueError("Truncated PAE matrix")
+        data = data[cut:] + chunk
+
+    values = np.concatenate(parts)
+    size = math.isqrt(len(values))
+    if size * size != len(values):
+        raise ValueError(f"PAE matrix has {len(values)} values, which is not a square number")
+    return values.reshape(size, size)
+
+
+def encode_pae(matrix: "np.ndarray", dtype: str) -> "np.ndarray":
+    """Encode a PAE matrix for storage as float16, or as uint8 in steps of `PAE_QUANTUM`."""
+    import numpy as np
+
+    if dtype == "uint8":
+        return np.clip(np.rint(matrix / PAE_QUANTUM), 0, 255).astype(np.uint8)
+    return matrix.astype(np.float16)
+
+
+class PaeMatrix:
+    """A PAE matrix stored in a memory-mapped .npy file.
+
+    Only the blocks that are read are loaded from disk and decoded.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        import numpy as np
+
+        self.path = Path(path)
+        self.data = np.load(self.path, mmap_mode="r")
+
+    @property
+    def size(self) -> int:
+        return self.data.shape[0]
+
+    def block(self, rows: slice, cols: slice) -> "np.ndarray":
+        """Return a block of the matrix in Å as float32."""
+        import numpy as np
+
+        values = np.asarray(self.data[rows, cols], dtype=np.float32)
+        if self.data.dtype == np.uint8:
+            values *= PAE_QUANTUM
+        return values
+
+    def block_stats(self, rows: Tuple[int, int], cols: Tuple[int, int]) -> Dict[str, float]:
+        """Return summary statistics of the PAE between two 1-based, inclusive residue ranges."""
+        import numpy as np
+
+        values = self.block(slice(rows[0] - 1, rows[1]), slice(cols[0] - 1, cols[1]))
+        return {
+            "mean": round(float(values.mean()), 2),
+            "median": round(float(np.median(values)), 2),
+            "min": round(float(values.min()), 2),
+            "max": round(float(values.max()), 2),
+        }
+
+
+def convert_pae(stored: StoredFile, path: Path) -> None:
+    """Parse a stored PAE JSON file and save it as a compact .npy file."""
+    import numpy as np
+
+    with open(stored.path, "rb") as fh:
+        matrix = parse_pae(fh)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Each conversion writes its own file, so concurrent conversions in other processes do not collide
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as tmp:
+        try:
+            np.save(tmp, encode_pae(matrix, settings.PAE_DTYPE))
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, path)
+
+
+async def fetch_pae(qualifier: str) -> Tuple[Optional[PaeMatrix], Optional[RequestError], Dict[str, Any]]:
+    """
+    Get the PAE matrix of the latest AlphaFold model of a UniProt accession.
+
+    The PAE JSON is downloaded into the file store and converted once into a
+    .npy file named after the SHA-256 of the JSON, so a changed upstream file
+    gets a new matrix.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'Q5VSL9')
+
+    Returns:
+        Tuple[Optional[PaeMatrix], Optional[RequestError], Dict[str, Any]]:
+            The matrix or an error, and the entry id and model version
+    """
+    entry, error = await get_latest_entry(qualifier)
+    if not entry:
+        return None, error, {}
+    info = {"entryId": entry.entryId, "modelVersion": entry.latestVersion}
+
+    stored, error = await get_file_store().fetch(entry.paeDocUrl)
+    if not stored:
+        return None, error, info
+
+    path = get_file_store().directory / "pae" / f"{stored.sha256}.{settings.PAE_DTYPE}.npy"
+    if not path.exists():
+        # Concurrent calls for the same file share one conversion
+        conversion = _conversions.get(path)
+        if conversion is None:
+            conversion = asyncio.ensure_future(asyncio.to_thread(convert_pae, stored, path))
+            _conversions[path] = conversion
+            conversion.add_done_callback(lambda _: _conversions.pop(path, None))
+        try:
+            await asyncio.shield(conversion)
+        except ValueError as e:
+            return None, RequestError(code=502, message=f"Could not parse PAE file: {str(e)}"), info
+        except OSError as e:
+            return None, RequestError(code=500, message=f"Could not store PAE matrix: {str(e)}"), info
+    return PaeMatrix(path), None, info
+
+
+def _parse_range(value: str, size: int) -> Tuple[int, int]:
+    """Parse a 1-based, inclusive residue range such as '1-120'."""
+    start, sep, end = value.partition("-")
+    try:
+        first, last = int(start), int(end if sep else start)
+    except ValueError:
+        raise ValueError(f"Invalid residue range: {value}") from None
+    if not 1 <= first <= last <= size:
+        raise ValueError(f"Residue range {value} is outside 1-{size}")
+    return first, last
+
+
+def _check_block(size: int, rows: Tuple[int, int], cols: Tuple[int, int], stride: int) -> Optional[RequestError]:
+    """Return an error if a block is outside the matrix or larger than `PAE_MAX_SLICE_CELLS`."""
+    for first, last in (rows, cols):
+        if not 1 <= first <= last <= size:
+            return RequestError(code=400, message=f"Residue range {first}-{last} is outside 1-{size}")
+    if stride < 1:
+        return RequestError(code=400, message="stride must be at least 1")
+    cells = len(range(rows[0], rows[1] + 1, stride)) * len(range(cols[0], cols[1] + 1, stride))
+    if cells > settings.PAE_MAX_SLICE_CELLS:
+        return RequestError(
+            code=400,
+            message=f"Block has {cells} cells, more than {settings.PAE_MAX_SLICE_CELLS}; use a smaller range or a larger stride",
+        )
+    return None
+
+
+@doc_loader.with_docstring("pae_matrix.md")
+async def get_pae_matrix(
+    qualifier: str,
+    row_start: int = 1,
+    row_end: Optional[int] = None,
+    col_start: int = 1,
+    col_end: Optional[int] = None,
+    stride: int = 1,
+    output_json: bool = True,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Get a block of the predicted aligned error (PAE) matrix of the latest AlphaFold model.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'Q5VSL9')
+        row_start (int): First aligned residue (1-based)
+        row_end (int, optional): Last aligned residue, defaults to the last residue
+        col_start (int): First scored residue (1-based)
+        col_end (int, optional): Last scored residue, defaults to the last residue
+        stride (int): Return every `stride`-th row and column
+
+    Returns:
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: Matrix block or error dictionary
+    """
+    pae, error, info = await fetch_pae(qualifier)
+    if pae:
+        rows = (row_start, pae.size if row_end is None else row_end)
+        cols = (col_start, pae.size if col_end is None else col_end)
+        error = _check_block(pae.size, rows, cols, stride)
+
+    data: Dict[str, Any]
+    if pae and not error:
+        block = pae.block(slice(rows[0] - 1, rows[1], stride), slice(cols[0] - 1, cols[1], stride))
+        data = {
+            **info,
+            "size": pae.size,
+            "rows": list(rows),
+            "cols": list(cols),
+            "stride": stride,
+            "matrix": block.round(2).tolist(),
+        }
+    else:
+        error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
+        data = {"error": error_msg}
+
+    return json.dumps(data) if output_json else data
+
+
+@doc_loader.with_docstring("pae_domain_stats.md")
+async def get_pae_domain_stats(
+    qualifier: str,
+    domains: List[str],
+    output_json: bool = True,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Get PAE statistics within and between residue ranges of the latest AlphaFold model.
+
+    Args:
+        qualifier (str): UniProt accession (e.g., 'Q5VSL9')
+        domains (List[str]): Residue ranges such as '1-120'
+
+    Returns:
+        Union[str, Dict[str, Any]]:
+            - If output_json=True: JSON string
+            - If output_json=False: Statistics for every pair of domains or error dictionary
+    """
+    pae, error, info = await fetch_pae(qualifier)
+
+    ranges: List[Tuple[int, int]] = []
+    if pae and not domains:
+        error = RequestError(code=400, message="At least one domain is required")
+    elif pae:
+        try:
+            ranges = [_parse_range(domain, pae.size) for domain in domains]
+        except ValueError as e:
+            error = RequestError(code=400, message=str(e))
+
+    data: Dict[str, Any]
+    if pae and not error:
+        data = {
+            **info,
+            "size": pae.size,
+            "pairs": [
+                {"aligned": domains[i], "scored": domains[j], **pae.block_stats(ranges[i], ranges[j])}
+                for i in range(len(ranges))
+                for j in range(len(ranges))
+            ],
+        }
+    else:
+        error_msg = f"Error {error.code if error else 'Unknown'}: {error.message if error else 'Unknown error'}"
+        data = {"error": error_msg}
+
+    return json.dumps(data) if output_json else data
@@ -0,0 +1,303 @@
+"""Streaming parser for AlphaFold mmCIF and PDB coordinate files.
+
+Files are read in blocks of complete lines and every block is parsed with
+vectorized NumPy operations over its raw bytes, so no Python object is
+created per atom and memory use stays close to the size of the output arrays.
+"""
+
+import gzip
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union, cast
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from mcp_alphafold.settings import settings
+
+# Fixed columns (0-based start, end) of the ATOM/HETATM records of the PDB format
+PDB_COLUMNS: Dict[str, Tuple[int, int]] = {
+    "record": (0, 6),
+    "atom_name": (12, 16),
+    "residue_name": (17, 20),
+    "chain_id": (21, 22),
+    "residue_number": (22, 26),
+    "x": (30, 38),
+    "y": (38, 46),
+    "z": (46, 54),
+    "b_factor": (60, 66),
+}
+
+# mmCIF _atom_site items read for each output field
+MMCIF_COLUMNS: Dict[str, str] = {
+    "atom_name": "label_atom_id",
+    "residue_name": "label_comp_id",
+    "chain_id": "auth_asym_id",
+    "residue_number": "auth_seq_id",
+    "x": "Cartn_x",
+    "y": "Cartn_y",
+    "z": "Cartn_z",
+    "b_factor": "B_iso_or_equiv",
+}
+# A loop ends at a comment, a new loop, a new item or a new data block
+MMCIF_LOOP_END = (b"#", b"loop_", b"_", b"data_")
+MMCIF_LOOP_END_FIRST = np.frombuffer(b"#l_d", dtype=np.uint8)
+
+
+class ModelCoordinates(BaseModel):
+    """Columnar atom data of a model file.
+
+    For AlphaFold models the B-factor column holds the per-residue pLDDT.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    coords: np.ndarray  # (n_atoms, 3) float32
+    b_factor: np.ndarray  # (n_atoms,) float32
+    residue_number: np.ndarray  # (n_atoms,) int32
+    atom_name: np.ndarray  # (n_atoms,) bytes
+    residue_name: np.ndarray  # (n_atoms,) bytes
+    chain_id: np.ndarray  # (n_atoms,) bytes
+
+    @property
+    def n_atoms(self) -> int:
+        return len(self.b_factor)
+
+    def ca_mask(self) -> np.ndarray:
+        """Return a boolean mask selecting the C-alpha atoms."""
+        return self.atom_name == b"CA"
+
+    def ca_coords(self) -> np.ndarray:
+        """Return the (n_residues, 3) C-alpha coordinates."""
+        return self.coords[self.ca_mask()]
+
+    def residue_plddt(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the residue numbers and pLDDT of every residue, read from its C-alpha atom."""
+        mask = self.ca_mask()
+        return self.residue_number[mask], self.b_factor[mask]
+
+
+def _open_binary(path: Union[str, Path]) -> IO[bytes]:
+    if str(path).endswith(".gz"):
+        return cast(IO[bytes], gzip.open(path, "rb"))
+    return open(path, "rb")
+
+
+def _iter_line_blocks(fh: IO[bytes], chunk_size: int) -> Iterator[bytes]:
+    """Yield blocks of complete lines read from a binary file."""
+    remainder = b""
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            if remainder:
+                yield remainder if remainder.endswith(b"\n") else remainder + b"\n"
+            return
+        chunk = remainder + chunk
+        cut = chunk.rfind(b"\n") + 1
+        if cut == 0:
+            remainder = chunk
+            continue
+        yield chunk[:cut]
+        remainder = chunk[cut:]
+
+
+def gather_fields(buf: np.ndarray, starts: np.ndarray, lengths: Union[int, np.ndarray]) -> np.ndarray:
+    """Gather byte fields of the given offsets and lengths into a fixed-width bytes array.
+
+    Bytes past the length of each field are replaced by spaces.
+    """
+    lengths = np.broadcast_to(lengths, starts.shape)
+    width = max(1, int(np.max(lengths, initial=1)))
+    chars = np.empty((len(starts), width), dtype=np.uint8)
+    # One column at a time is faster than a single (n, width) fancy index
+    for j in range(width):
+        column = buf.take(starts + j, mode="clip")
+        column[lengths <= j] = ord(" ")
+        chars[:, j] = column
+    return chars.view(f"S{width}").ravel()
+
+
+def _to_float(field: np.ndarray) -> np.ndarray:
+    return field.astype(np.float32)
+
+
+def _to_int(field: np.ndarray) -> np.ndarray:
+    return field.astype(np.int32)
+
+
+def _strip(field: np.ndarray) -> np.ndarray:
+    return np.char.strip(field)
+
+
+def _concat(parts: List[Dict[str, np.ndarray]]) -> ModelCoordinates:
+    def column(name: str, dtype: str) -> np.ndarray:
+        if not parts:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate([part[name] for part in parts])
+
+    x, y, z = column("x", "float32"), column("y", "float32"), column("z", "float32")
+    return ModelCoordinates(
+        coords=np.stack([x, y, z], axis=1),
+        b_factor=column("b_factor", "float32"),
+        residue_number=column("residue_number", "int32"),
+        atom_name=column("atom_name", "S4"),
+        residue_name=column("residue_name", "S3"),
+        chain_id=column("chain_id", "S4"),
+    )
+
+
+# --------------------------------
+# PDB
+# --------------------------------
+def _parse_pdb_block(block: bytes) -> Optional[Dict[str, np.ndarray]]:
+    buf = np.frombuffer(block, dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    line_lengths = ends - starts
+
+    record = gather_fields(buf, starts, np.minimum(line_lengths, 6))
+    is_atom = (record == b"ATOM  ") | (record == b"HETATM")
+    if not is_atom.any():
+        return None
+    starts, line_lengths = starts[is_atom], line_lengths[is_atom]
+
+    fields = {}
+    for name, (start, end) in PDB_COLUMNS.items():
+        if name == "record":
+            continue
+        # Short lines (e.g. with trimmed trailing columns) must not read into the next line
+        lengths = np.clip(line_lengths - start, 0, end - start)
+        fields[name] = gather_fields(buf, starts + start, lengths)
+
+    return {
+        "x": _to_float(fields["x"]),
+        "y": _to_float(fields["y"]),
+        "z": _to_float(fields["z"]),
+        "b_factor": _to_float(fields["b_factor"]),
+        "residue_number": _to_int(fields["residue_number"]),
+        "atom_name": _strip(fields["atom_name"]),
+        "residue_name": _strip(fields["residue_name"]),
+        "chain_id": _strip(fields["chain_id"]),
+    }
+
+
+def parse_pdb(fh: IO[bytes], chunk_size: Optional[int] = None) -> ModelCoordinates:
+    """Parse the first model of a PDB file into columnar arrays."""
+    parts = []
+    for block in _iter_line_blocks(fh, chunk_size or settings.STRUCTURE_PARSE_CHUNK_SIZE):
+        # Only the first model of multi-model files is read
+        end_model = block.find(b"ENDMDL")
+        if end_model != -1:
+            block = block[: block.rfind(b"\n", 0, end_model) + 1]
+        part = _parse_pdb_block(block)
+        if part is not None:
+            parts.append(part)
+        if end_model != -1:
+            break
+    return _concat(parts)
+
+
+# --------------------------------
+# mmCIF
+# --------------------------------
+def _parse_mmcif_rows(block: bytes, column_index: Dict[str, int], n_columns: int) -> Optional[Dict[str, np.ndarray]]:
+    buf = np.frombuffer(block, dtype=np.uint8)
+    # Space, tab, CR and LF are all at or below the space character
+    is_space = buf <= ord(" ")
+    token_starts = np.flatnonzero(~is_space & np.concatenate(([True], is_space[:-1])))
+    token_ends = np.flatnonzero(~is_space & np.concatenate((is_space[1:], [True]))) + 1
+    if len(token_starts) == 0:
+        return None
+    if len(token_starts) % n_columns:
+        raise ValueError("Malformed _atom_site loop: rows do not have the same number of values")
+
+    # One row per atom, one column per _atom_site item
+    starts = token_starts.reshape(-1, n_columns)
+    ends = token_ends.reshape(-1, n_columns)
+
+    fields = {}
+    for name, item in MMCIF_COLUMNS.items():
+        j = column_index[item]
+        fields[name] = gather_fields(buf, starts[:, j], ends[:, j] - starts[:, j])
+
+    return {
+        "x": _to_float(fields["x"]),
+        "y": _to_float(fields["y"]),
+        "z": _to_float(fields["z"]),
+        "b_factor": _to_float(fields["b_factor"]),
+        "residue_number": _to_int(fields["residue_number"]),
+        "atom_name": _strip(fields["atom_name"]).astype("S4"),
+        "residue_name": _strip(fields["residue_name"]).astype("S3"),
+        "chain_id": _strip(fields["chain_id"]).astype("S4"),
+    }
+
+
+def _find_loop_end(block: bytes, start: int) -> int:
+    """Return the offset of the line that ends an mmCIF loop, or -1."""
+    buf = np.frombuffer(block, dtype=np.uint8)
+    line_starts = np.flatnonzero(buf[start:-1] == ord("\n")) + start + 1
+    line_starts = np.concatenate(([start], line_starts))
+    candidates = line_starts[np.isin(buf[line_starts], MMCIF_LOOP_END_FIRST)]
+    for offset in candidates:
+        if block.startswith(MMCIF_LOOP_END, offset):
+            return int(offset)
+    return -1
+
+
+def parse_mmcif(fh: IO[bytes], chunk_size: Optional[int] = None) -> ModelCoordinates:
+    """Parse the _atom_site loop of an mmCIF file into columnar arrays.
+
+    Reading stops at the end of the loop, so categories after it are never read.
+    """
+    columns: List[str] = []
+    parts = []
+    state = "search"
+    for block in _iter_line_blocks(fh, chunk_size or settings.STRUCTURE_PARSE_CHUNK_SIZE):
+        offset = 0
+        if state == "search":
+            header = block.find(b"\n_atom_site.")
+            if block.startswith(b"_atom_site."):
+                header = -1
+            elif header == -1:
+                continue
+            offset = header + 1
+            state = "header"
+
+        if state == "header":
+            while offset < len(block) and block.startswith(b"_atom_site.", offset):
+                line_end = block.index(b"\n", offset)
+                columns.append(block[offset + len(b"_atom_site.") : line_end].strip().decode())
+                offset = line_end + 1
+            if offset >= len(block):
+                continue
+            missing = set(MMCIF_COLUMNS.values()) - set(columns)
+            if missing:
+                raise ValueError(f"_atom_site loop is missing items: {', '.join(sorted(missing))}")
+            state = "rows"
+
+        end = _find_loop_end(block, offset)
+        part = _parse_mmcif_rows(
+            block[offset:] if end == -1 else block[offset:end],
+            column_index={item: j for j, item in enumerate(columns)},
+            n_columns=len(columns),
+        )
+        if part is not None:
+            parts.append(part)
+        if end != -1:
+            break
+
+    if not columns:
+        raise ValueError("No _atom_site loop found")
+    return _concat(parts)
+
+
+def parse_model_file(path: Union[str, Path], chunk_size: Optional[int] = None) -> ModelCoordinates:
+    """Parse an mmCIF or PDB model file, optionally gzip-compressed, into columnar arrays."""
+    name = str(path).lower().removesuffix(".gz")
+    if name.endswith((".cif", ".mmcif")):
+        parse = parse_mmcif
+    elif name.endswith((".pdb", ".ent")):
+        parse = parse_pdb
+    else:
+        raise ValueError(f"Unsupported model file format: {path}")
+    with _open_binary(path) as fh:
+        return parse(fh, chunk_size)
@@ -0,0 +1,96 @@
+"""Per-host circuit breakers for upstream requests."""
+
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from mcp_alphafold.settings import settings
+
+_circuit_breakers: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state; an open circuit becomes half-open once the recovery timeout has passed."""
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent to the upstream.
+
+        A half-open circuit lets a single trial request through at a time. A trial
+        that never reports back (e.g. a cancelled call) is replaced after the
+        recovery timeout.
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN:
+            now = time.monotonic()
+            if self._probe_started_at is None or now - self._probe_started_at >= self.recovery_timeout:
+                self._probe_started_at = now
+                return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit when the threshold is reached."""
+        self.failures += 1
+        if self._probe_started_at is not None or (
+            self.failure_threshold > 0 and self.failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+        self._probe_started_at = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the circuit state for health and metrics reporting."""
+        state = self.state
+        retry_in = None
+        if state == CircuitState.OPEN and self.opened_at is not None:
+            retry_in = round(self.recovery_timeout - (time.monotonic() - self.opened_at), 3)
+        return {
+            "state": state.value,
+            "failures": self.failures,
+            "retry_in": retry_in,
+        }
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Return the circuit breaker shared by all requests to the URL's host."""
+    host = urlsplit(url).netloc
+    breaker = _circuit_breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_RECOVERY_TIMEOUT,
+        )
+        _circuit_breakers[host] = breaker
+    return breaker
+
+
+def get_circuit_states() -> Dict[str, Dict[str, Any]]:
+    """Return the state of the circuit breaker of every upstream host."""
+    return {host: breaker.snapshot() for host, breaker in _circuit_breakers.items()}
@@ -0,0 +1,102 @@
+"""Transparent compression of cached response bodies.
+
+Compressed values are stored as bytes that start with `COMPRESSION_MAGIC`
+followed by one byte naming the codec. Responses below the size threshold,
+and entries written before compression was enabled, are plain strings and
+are returned as they are.
+"""
+
+import logging
+import threading
+import zlib
+from typing import Any, Optional, Union
+
+from mcp_alphafold.settings import settings
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, installed with the 'zstd' extra
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_MAGIC = b"\x00afc"
+CODEC_IDS = {"zlib": b"d", "zstd": b"z"}
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+DECOMPRESSION_ERRORS = (zstandard.ZstdError,) if zstandard is not None else ()
+_local = threading.local()
+_warned = False
+
+
+def get_codec() -> Optional[str]:
+    """Return the codec used for new cache values, or None when compression is disabled."""
+    global _warned
+    codec = settings.CACHE_COMPRESSION
+    if codec == "none":
+        return None
+    if codec == "auto":
+        return "zstd" if zstandard is not None else "zlib"
+    if codec == "zstd" and zstandard is None:
+        if not _warned:
+            logger.warning("CACHE_COMPRESSION is zstd but the 'zstandard' package is not installed, using zlib")
+            _warned = True
+        return "zlib"
+    return codec
+
+
+def _zstd_compressor() -> Any:
+    # zstandard (de)compressors are reused per thread; they are not thread-safe
+    if not hasattr(_local, "zstd_compressor"):
+        _local.zstd_compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return _local.zstd_compressor
+
+
+def _zstd_decompressor() -> Any:
+    if not hasattr(_local, "zstd_decompressor"):
+        _local.zstd_decompressor = zstandard.ZstdDecompressor()
+    return _local.zstd_decompressor
+
+
+def compress_value(content: str) -> Union[str, bytes]:
+    """Compress a response body for the disk cache if it is at least `CACHE_COMPRESSION_MIN_SIZE` bytes."""
+    codec = get_codec()
+    data = content.encode("utf-8")
+    if codec is None or len(data) < settings.CACHE_COMPRESSION_MIN_SIZE:
+        return content
+
+    if codec == "zstd":
+        compressed = _zstd_compressor().compress(data)
+    else:
+        compressed = zlib.compress(data, ZLIB_LEVEL)
+    if len(compressed) + len(COMPRESSION_MAGIC) + 1 >= len(data):
+        return content
+    return COMPRESSION_MAGIC + CODEC_IDS[codec] + compressed
+
+
+def decompress_value(value: Union[str, bytes]) -> Optional[str]:
+    """
+    Return the response body of a disk cache value.
+
+    Returns None for values that cannot be decoded, e.g. zstd values when the
+    'zstandard' package is not installed, so that they are treated as misses.
+    """
+    if isinstance(value, str):
+        return value
+    if not value.startswith(COMPRESSION_MAGIC):
+        return value.decode("utf-8")
+
+    codec_id = value[len(COMPRESSION_MAGIC) : len(COMPRESSION_MAGIC) + 1]
+    payload = value[len(COMPRESSION_MAGIC) + 1 :]
+    try:
+        if codec_id == CODEC_IDS["zlib"]:
+            data = zlib.decompress(payload)
+        elif codec_id == CODEC_IDS["zstd"] and zstandard is not None:
+            data = _zstd_decompressor().decompress(payload)
+        else:
+            logger.debug(f"Cache value uses an unavailable codec {codec_id!r}")
+            return None
+        return data.decode("utf-8")
+    except (zlib.error, UnicodeDecodeError, *DECOMPRESSION_ERRORS) as e:
+        logger.warning(f"Could not decompress a cache value: {str(e)}")
+        return None
@@ -1,24 +1,61 @@
 import asyncio
 import csv
 import hashlib
+import importlib.util
 import json
 import logging
+import math
 import os
 import random
+import re
+import shutil
+import sqlite3
+import sys
+import time
+import uuid
+import warnings
+from enum import Enum
+from functools import lru_cache
 from io import StringIO
-from typing import Any, Dict, Literal, Optional, Tuple, Type, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Tuple, Type, TypeVar, Union
+from urllib.parse import parse_qsl, quote_plus, urlencode, urlsplit
 
 import httpx
-from diskcache import Cache
 from platformdirs import user_cache_dir
 from pydantic import BaseModel
 
 from mcp_alphafold.settings import settings
+from mcp_alphafold.utils.circuit import CircuitState, get_circuit_breaker
+from mcp_alphafold.utils.compression import compress_value, decompress_value
+from mcp_alphafold.utils.lru import LRUCache
+from mcp_alphafold.utils.metrics import (
+    API_DURATION,
+    INFLIGHT_FETCHES,
+    UPSTREAM_DURATION,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_RETRIES,
+)
+from mcp_alphafold.utils.throttle import get_host_limiter
+from mcp_alphafold.utils.tracing import start_span
+
+if TYPE_CHECKING:
+    from diskcache import Cache, FanoutCache
 
 logger = logging.getLogger(__name__)
-_cache: Optional[Cache] = None
+_cache: Optional["FanoutCache"] = None
+_legacy_keys_until: Optional[float] = None
+_memory_cache: Optional[LRUCache] = None
+_disk_cache_stats: Dict[str, int] = {"hits": 0, "stale_hits": 0, "misses": 0}
+_http_client: Optional[httpx.AsyncClient] = None
+_inflight_requests: Dict[str, "asyncio.Task[Tuple[Any, Optional[RequestError]]]"] = {}
+_model_size_ratios: Dict[Type[BaseModel], float] = {}
 T = TypeVar("T", bound=BaseModel)
 
+THROTTLED_STATUS_CODES = (429, 503)
+LEGACY_KEYS_MARKER = "legacy-keys-until"  # time the last entry imported under a legacy key expires
+MODEL_SIZE_SAMPLE_MIN = 1024  # serialized size of the response measuring the memory ratio of a model type
+
 
 class RequestError(BaseModel):
     code: int
@@ -28,40 +65,564 @@ class RequestError(BaseModel):
 # --------------------------------
 # CACHING
 # --------------------------------
-def get_cache() -> Cache:
-    """Initialize and return the cache."""
+def get_cache_dir() -> str:
+    """Return the root directory of the on-disk caches."""
+    return settings.CACHE_DIR or user_cache_dir("alphafold-mcp")
+
+
+def get_cache() -> "FanoutCache":
+    """Initialize and return the cache.
+
+    Entries are spread over `CACHE_SHARDS` SQLite databases so that concurrent
+    writers rarely wait for each other. The size limit is shared by the shards.
+    Entries of an older layout, the single database of versions before sharding
+    or shards of another `CACHE_SHARDS`, are imported and the old databases removed.
+    """
     global _cache
     if _cache is None:
-        cache_path = os.path.join(
-            settings.CACHE_DIR or user_cache_dir("alphafold-mcp"),
-            "cache",
+        from diskcache import FanoutCache
+
+        cache_path = os.path.join(get_cache_dir(), "cache")
+        old_layouts = _set_aside_old_layouts(cache_path)
+        _cache = FanoutCache(
+            cache_path,
+            shards=settings.CACHE_SHARDS,
+            timeout=settings.CACHE_TIMEOUT,
+            size_limit=settings.CACHE_SIZE_LIMIT,
+            eviction_policy=settings.CACHE_EVICTION_POLICY,
+            statistics=settings.CACHE_STATISTICS,
         )
-        _cache = Cache(cache_path)
+        for directory, shards in old_layouts:
+            _import_entries(_cache, directory, shards)
     return _cache
 
 
+def _set_aside_old_layouts(cache_path: str) -> List[Tuple[str, int]]:
+    """
+    Move the databases of older cache layouts into directories of their own.
+
+    The databases are renamed before the cache is opened, so that only one
+    process imports them.
+
+    Returns:
+        The directory and shard count of each old layout, 0 for a single database
+    """
+    if not os.path.isdir(cache_path):
+        return []
+    layouts = []
+
+    # Versions before sharding kept a single database, with large values in two-hex-digit directories
+    target = os.path.join(cache_path, f"import-{uuid.uuid4().hex}")
+    os.makedirs(target)
+    try:
+        os.replace(os.path.join(cache_path, "cache.db"), os.path.join(target, "cache.db"))
+    except FileNotFoundError:
+        os.rmdir(target)
+    else:
+        for name in os.listdir(cache_path):
+            if name in ("cache.db-wal", "cache.db-shm") or re.fullmatch(r"[0-9a-f]{2}", name):
+                os.replace(os.path.join(cache_path, name), os.path.join(target, name))
+        layouts.append((target, 0))
+
+    shards = sorted(name for name in os.listdir(cache_path) if re.fullmatch(r"\d{3}", name))
+    if shards and len(shards) != settings.CACHE_SHARDS:
+        target = os.path.join(cache_path, f"import-{uuid.uuid4().hex}")
+        os.makedirs(target)
+        for name in shards:
+            os.replace(os.path.join(cache_path, name), os.path.join(target, name))
+        layouts.append((target, len(shards)))
+    return layouts
+
+
+def _import_entries(cache: "FanoutCache", directory: str, shards: int) -> None:
+    """Copy the unexpired entries of an old cache layout, with their lifetime and tag, then remove it."""
+    from diskcache import Cache, FanoutCache
+
+    source: Union["Cache", "FanoutCache"] = Cache(directory) if shards == 0 else FanoutCache(directory, shards=shards)
+    imported = 0
+    legacy_until = 0.0
+    try:
+        for key in source:
+            value, expire_time, tag = source.get(key, expire_time=True, tag=True, retry=True)
+            if value is None:
+                continue
+            expire = None if expire_time is None else expire_time - time.time()
+            if expire is not None and expire <= 0:
+                continue
+            cache.set(key, value, expire=expire, tag=tag, retry=True)
+            imported += 1
+            legacy_until = max(legacy_until, math.inf if expire_time is None else expire_time)
+    finally:
+        source.close()
+    shutil.rmtree(directory, ignore_errors=True)
+    if shards == 0 and imported:
+        # Versions before sharding also used the legacy keys
+        mark_legacy_entries(cache, legacy_until)
+    logger.info(f"Imported {imported} cache entries of an older layout from {directory}")
+
+
+def close_cache() -> None:
+    """Close the cache and its database connections."""
+    global _cache, _legacy_keys_until
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+    _legacy_keys_until = None
+
+
+def mark_legacy_entries(cache: "FanoutCache", until: float) -> None:
+    """Record that entries under legacy keys may be found in the cache until a given time."""
+    global _legacy_keys_until
+    expire = None if until == math.inf else until - time.time()
+    cache.set(LEGACY_KEYS_MARKER, until, expire=expire, retry=True)
+    _legacy_keys_until = until
+
+
+def has_legacy_entries() -> bool:
+    """Return whether entries imported under legacy keys may still be in the cache."""
+    global _legacy_keys_until
+    cache = get_cache()
+    if _legacy_keys_until is None:
+        _legacy_keys_until = cache.get(LEGACY_KEYS_MARKER, default=0.0, retry=True)
+    return time.time() < _legacy_keys_until
+
+
+def get_memory_cache() -> LRUCache:
+    """Initialize and return the in-memory cache tier."""
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = LRUCache(
+            max_entries=settings.MEMORY_CACHE_MAX_ENTRIES,
+            max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+        )
+    return _memory_cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Return hit/miss counters for the memory and disk cache tiers."""
+    disk_stats = dict(_disk_cache_stats)
+    disk_stats["entries"] = len(get_cache())
+    return {
+        "memory": get_memory_cache().stats(),
+        "disk": disk_stats,
+    }
+
+
+def get_cache_info() -> Dict[str, Any]:
+    """Describe the on-disk cache: settings, size, entries and statistics of every shard."""
+    cache = get_cache()
+    shards = []
+    for shard in cache._shards:
+        hits, misses = shard.stats(enable=settings.CACHE_STATISTICS)
+        shards.append({
+            "directory": shard.directory,
+            "entries": len(shard),
+            "volume": shard.volume(),
+            "hits": hits,
+            "misses": misses,
+        })
+    return {
+        "directory": cache.directory,
+        "shards": len(shards),
+        "size_limit": settings.CACHE_SIZE_LIMIT,
+        "eviction_policy": settings.CACHE_EVICTION_POLICY,
+        "statistics": settings.CACHE_STATISTICS,
+        "entries": sum(shard["entries"] for shard in shards),
+        "volume": sum(shard["volume"] for shard in shards),
+        "hits": sum(shard["hits"] for shard in shards),
+        "misses": sum(shard["misses"] for shard in shards),
+        "shard_stats": shards,
+    }
+
+
+def prune_cache(clear: bool = False) -> Dict[str, int]:
+    """
+    Remove expired entries and evict entries above the size limit.
+
+    Args:
+        clear: Remove every entry instead
+
+    Returns:
+        The number of removed entries per step
+    """
+    cache = get_cache()
+    if clear:
+        return {"cleared": cache.clear(retry=True)}
+    return {"expired": cache.expire(retry=True), "evicted": cache.cull(retry=True)}
+
+
+def vacuum_cache() -> Dict[str, int]:
+    """
+    Fix inconsistencies and rebuild the shard databases to return free pages to the filesystem.
+
+    Returns:
+        The volume in bytes before and after
+    """
+    cache = get_cache()
+    before = cache.volume()
+    with warnings.catch_warnings():
+        # check() reports every fixed inconsistency as a warning
+        warnings.simplefilter("ignore")
+        cache.check(fix=True, retry=True)
+    for shard in cache._shards:
+        db = sqlite3.connect(os.path.join(shard.directory, "cache.db"), timeout=60)
+        try:
+            db.execute("VACUUM")
+        finally:
+            db.close()
+    return {"before": before, "after": cache.volume()}
+
+
+def _query_value(value: Any) -> str:
+    """Format a query parameter value the way httpx sends it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+@lru_cache(maxsize=4096)
+def _quote(value: str) -> str:
+    # Parameter names and values such as annotation types repeat across requests
+    return quote_plus(value)
+
+
+def normalize_request(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Return the canonical form of a request, so that equivalent requests share a cache key.
+
+    The method, scheme and host are normalized, default ports and fragments are
+    dropped, and GET parameters are merged into the query string and sorted. POST
+    bodies are serialized with sorted keys. The path is kept as it is; callers
+    normalize identifiers in it, e.g. with `normalize_accession`.
+    """
+    method = method.upper()
+    # Split by hand: urlsplit only caches its last few URLs and dominates the cost
+    scheme, separator, rest = url.partition("://")
+    if separator:
+        rest = rest.partition("#")[0]
+        rest, _, query_string = rest.partition("?")
+        netloc, slash, path = rest.partition("/")
+        path = slash + path
+    else:
+        scheme, netloc, path, query_string, _ = urlsplit(url)
+    scheme = scheme.lower()
+    netloc = netloc.lower()
+    if (scheme == "https" and netloc.endswith(":443")) or (scheme == "http" and netloc.endswith(":80")):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    query = parse_qsl(query_string, keep_blank_values=True) if query_string else []
+    body = ""
+    if params:
+        if method == "GET":
+            for key, value in params.items():
+                values = value if isinstance(value, (list, tuple)) else [value]
+                query.extend((key, _query_value(item)) for item in values)
+        else:
+            body = json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+    canonical = f"{method} {scheme}://{netloc}{path or '/'}"
+    if query:
+        canonical += "?" + "&".join([f"{_quote(key)}={_quote(value)}" for key, value in sorted(query)])
+    return f"{canonical} {body}" if body else canonical
+
+
 def generate_cache_key(
     method: str,
     url: str,
     params: Optional[Dict[str, Any]] = None,
 ) -> str:
-    """Generate a cache key for a given HTTP request."""
-    sha256_hash = hashlib.sha256()
-    params_dump: str = json.dumps(params, sort_keys=True)
-    key_source: str = f"{method.upper()}:{url}:{params_dump}"
-    data: bytes = key_source.encode("utf-8")
-    sha256_hash.update(data)
-    return sha256_hash.hexdigest()
+    """Generate a cache key for a given HTTP request: a 128-bit BLAKE2b digest of its canonical form."""
+    return hashlib.blake2b(normalize_request(method, url, params).encode("utf-8"), digest_size=16).hexdigest()
 
 
-def get_cache_response(cache_key: str) -> Optional[str]:
+def generate_legacy_cache_keys(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Generate the keys the request may have been cached under before requests were normalized."""
+    sources = [(url, params)]
+    if method.upper() == "GET" and params:
+        # Query strings used to be built into the URL by hand
+        sources.append((f"{url}?{urlencode(params)}", None))
+    keys = []
+    for source_url, source_params in sources:
+        key_source = f"{method.upper()}:{source_url}:{json.dumps(source_params, sort_keys=True)}"
+        keys.append(hashlib.sha256(key_source.encode("utf-8")).hexdigest())
+    return keys
+
+
+def migrate_legacy_entry(
+    cache_key: str,
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Move the response of a request from a legacy key to its current key.
+
+    Versions using legacy keys only cached responses, not errors. The
+    remaining lifetime and the stale time of the entry are kept.
+
+    Returns:
+        Whether an entry was moved
+    """
+    cache = get_cache()
+    moved = False
+    for legacy_key in generate_legacy_cache_keys(method, url, params):
+        value, expire_time, tag = cache.get(legacy_key, expire_time=True, tag=True, retry=True)
+        if value is None:
+            continue
+        expire = None if expire_time is None else expire_time - time.time()
+        if expire is None or expire > 0:
+            cache.set(cache_key, value, expire=expire, tag=tag, retry=True)
+            moved = True
+        cache.delete(legacy_key, retry=True)
+    return moved
+
+
+def get_model_cache_key(cache_key: str, response_model_type: Type[BaseModel]) -> str:
+    """Generate the memory cache key for a validated response model."""
+    return f"{cache_key}:{response_model_type.__module__}.{response_model_type.__qualname__}"
+
+
+def get_error_cache_key(cache_key: str) -> str:
+    """Generate the cache key for a negatively cached error response."""
+    return f"{cache_key}:error"
+
+
+def get_cache_entry(
+    cache_key: str,
+    memory: bool = True,
+    allow_stale: bool = False,
+) -> Tuple[Optional[str], Optional[float]]:
+    """Retrieve the cached response content and the time it becomes stale.
+
+    The in-memory tier is checked first; fresh disk hits are promoted to
+    memory until they become stale unless `memory` is False. Stale entries
+    are kept on disk for `CACHE_STALE_TTL` seconds and only returned when
+    `allow_stale` is True.
+    """
+    memory_cache = get_memory_cache()
+    if memory:
+        content = memory_cache.get(cache_key)
+        if content is not None:
+            return content, None
+
+    # The tag holds the time the entry becomes stale; entries written without one are fresh until they expire
+    value, expires_at, stale_at = get_cache().get(cache_key, expire_time=True, tag=True, retry=True)
+    content = decompress_value(value) if value is not None else None
+    if content is None:
+        _disk_cache_stats["misses"] += 1
+        return None, None
+
+    stale_at = stale_at if stale_at is not None else expires_at
+    if stale_at is not None and stale_at <= time.time():
+        if not allow_stale:
+            _disk_cache_stats["misses"] += 1
+            return None, None
+        _disk_cache_stats["stale_hits"] += 1
+        return content, stale_at
+
+    _disk_cache_stats["hits"] += 1
+    if memory:
+        memory_cache.set(cache_key, content, expires_at=stale_at)
+    return content, stale_at
+
+
+def get_cache_response(cache_key: str, memory: bool = True) -> Optional[str]:
     """Retrieve the cache response if avialable."""
-    return get_cache().get(cache_key)
+    content, _ = get_cache_entry(cache_key, memory=memory)
+    return content
+
 
+def is_cached(url: str, method: str = "GET", params: Optional[Dict[str, Any]] = None) -> bool:
+    """Return whether a fresh response or a definitive error is cached for a request."""
+    cache_key = generate_cache_key(method=method, url=url, params=params)
+    content, _ = get_cache_entry(cache_key, memory=False)
+    return content is not None or get_cached_error(cache_key) is not None
+
+
+def cache_response(cache_key: str, content: str, cache_ttl: int, memory: bool = True) -> None:
+    """Store the response content in cache.
+
+    Large responses are compressed on disk, see `CACHE_COMPRESSION`. The
+    entry is kept on disk for an extra `CACHE_STALE_TTL` seconds after it
+    becomes stale so that it can be served while it is being refreshed.
+    """
+    stale_at = time.time() + cache_ttl
+    get_cache().set(cache_key, compress_value(content), expire=cache_ttl + settings.CACHE_STALE_TTL, tag=stale_at)
+
+    error_key = get_error_cache_key(cache_key)
+    get_cache().delete(error_key)
+    get_memory_cache().delete(error_key)
+    if memory:
+        get_memory_cache().set(cache_key, content, expires_at=stale_at)
+
+
+def get_cached_error(cache_key: str) -> Optional[RequestError]:
+    """Retrieve a negatively cached error response if available."""
+    error_key = get_error_cache_key(cache_key)
+    error = get_memory_cache().get(error_key)
+    if error is not None:
+        return error
+
+    entry, expires_at = get_cache().get(error_key, expire_time=True, retry=True)
+    if entry is None:
+        return None
+
+    error = RequestError(code=entry[0], message=entry[1])
+    get_memory_cache().set(error_key, error, expires_at=expires_at, size=len(error.message))
+    return error
+
+
+def cache_error(
+    cache_key: str,
+    error: RequestError,
+    cache_ttl: int,
+    response_model_type: Optional[Type[BaseModel]] = None,
+) -> None:
+    """Store a definitive error response in cache, replacing the content cached for the request.
+
+    Args:
+        cache_key: Cache key of the request
+        error: Error response
+        cache_ttl: Seconds until the entry expires
+        response_model_type: Model type the content may be cached as in the memory tier
+    """
+    get_cache().delete(cache_key)
+    get_memory_cache().delete(cache_key)
+    if response_model_type is not None:
+        get_memory_cache().delete(get_model_cache_key(cache_key, response_model_type))
+
+    error_key = get_error_cache_key(cache_key)
+    get_cache().set(error_key, (error.code, error.message), expire=cache_ttl)
+    get_memory_cache().set(error_key, error, expire=cache_ttl, size=len(error.message))
+
+
+def get_cached_model(cache_key: str, response_model_type: Type[T]) -> Optional[T]:
+    """Retrieve an already validated response model from the memory tier.
+
+    The returned model is shared between callers; response models are frozen.
+    """
+    return get_memory_cache().get(get_model_cache_key(cache_key, response_model_type))
+
+
+def cache_model(
+    cache_key: str,
+    model: BaseModel,
+    size: int,
+    cache_ttl: Optional[int] = None,
+    expires_at: Optional[float] = None,
+) -> None:
+    """Store a validated response model in the memory tier.
+
+    Args:
+        cache_key: Cache key of the request
+        model: Validated response model
+        size: Size of the serialized response, scaled to the memory held by the model for the memory budget
+        cache_ttl: Seconds until the entry expires
+        expires_at: Absolute expiry timestamp, used instead of `cache_ttl` when given
+    """
+    get_memory_cache().set(
+        get_model_cache_key(cache_key, type(model)),
+        model,
+        expire=cache_ttl,
+        expires_at=expires_at,
+        size=estimate_model_size(model, size),
+    )
 
-def cache_response(cache_key: str, content: str, cache_ttl: int) -> None:
-    """Store the response content in cache."""
-    get_cache().set(cache_key, content, expire=cache_ttl)
+
+def estimate_model_size(model: BaseModel, serialized_size: int) -> int:
+    """Estimate the memory held by a validated model from the size of its response.
+
+    Walking the model costs several times its validation, so the ratio of
+    memory to serialized size is measured once per model type, on the first
+    response of at least `MODEL_SIZE_SAMPLE_MIN` bytes, and applied to the
+    following ones. Smaller responses are walked until then.
+    """
+    ratio = _model_size_ratios.get(type(model))
+    if ratio is not None:
+        return int(serialized_size * ratio)
+    size = get_model_size(model)
+    if serialized_size >= MODEL_SIZE_SAMPLE_MIN:
+        _model_size_ratios[type(model)] = size / serialized_size
+    return size
+
+
+def get_model_size(model: BaseModel) -> int:
+    """Return the memory held by a validated model, in bytes.
+
+    Python objects take several times the size of their JSON, so this sums
+    the size of every object reachable from the model. Enum members and
+    constants are shared and not counted.
+    """
+    size = 0
+    seen = set()
+    stack: List[Any] = [model]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, (bool, Enum)):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, BaseModel):
+            stack.append(obj.__dict__)
+            stack.append(obj.__pydantic_fields_set__)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
+
+
+# --------------------------------
+# HTTP CLIENT
+# --------------------------------
+def get_http_client() -> httpx.AsyncClient:
+    """Initialize and return the shared HTTP client.
+
+    The client keeps a pool of keep-alive connections so that consecutive
+    requests to the same upstream host reuse an established TCP/TLS session.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        http2 = settings.HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+        _http_client = httpx.AsyncClient(
+            verify=False,
+            http2=http2,
+            timeout=settings.REQUEST_TIMEOUT,
+            trust_env=False,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def wait_for_inflight_requests() -> None:
+    """Wait for in-flight requests, including background refreshes of stale entries."""
+    while _inflight_requests:
+        await asyncio.gather(*_inflight_requests.values(), return_exceptions=True)
 
 
 # --------------------------------
@@ -76,37 +637,104 @@ async def call_http(
     backoff_factor: float = 0.5,
     rate_limit_delay: Optional[float] = None,
 ) -> Tuple[int, str]:
-    """Perform an HTTP request(GET/POST) with retries and optional rate limit."""
+    """Perform an HTTP request(GET/POST) with retries and optional rate limit.
+
+    Requests to the same host share a token-bucket rate limit and a cap on
+    in-flight requests. 429 and 503 responses are retried after the delay in
+    their `Retry-After` header, or with exponential backoff without one, and
+    slow down all requests to that host. Requests fail fast with 503 while the
+    host's circuit breaker is open.
+    """
     timeout = timeout or settings.REQUEST_TIMEOUT
 
+    if method.upper() not in ("GET", "POST"):
+        logger.error(f"Unsupported HTTP method: {method}")
+        return 405, f"Unsupported Method: {method}"
+
+    host = urlsplit(url).netloc
+    breaker = get_circuit_breaker(url)
+    if not breaker.allow_request():
+        UPSTREAM_REQUESTS.inc((host, "circuit_open"))
+        return 503, f"Circuit open: {host} is unavailable"
+
+    UPSTREAM_IN_FLIGHT.inc((host,))
+    started = time.perf_counter()
+    try:
+        status, content = await _call_http_with_retries(
+            method=method,
+            url=url,
+            params=params,
+            timeout=timeout,
+            retries=retries,
+            backoff_factor=backoff_factor,
+            rate_limit_delay=rate_limit_delay,
+        )
+    finally:
+        UPSTREAM_IN_FLIGHT.dec((host,))
+    UPSTREAM_DURATION.observe(time.perf_counter() - started, (host,))
+    UPSTREAM_REQUESTS.inc((host, str(status)))
+
+    if status >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return status, content
+
+
+async def _call_http_with_retries(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    timeout: int,
+    retries: int,
+    backoff_factor: float,
+    rate_limit_delay: Optional[float],
+) -> Tuple[int, str]:
+    """Perform the HTTP request, retrying connection errors and throttled responses."""
     if rate_limit_delay:
         await asyncio.sleep(rate_limit_delay)
 
+    limiter = get_host_limiter(url)
     last_error: Optional[Exception] = None
     for attempt in range(retries + 1):
         try:
-            async with httpx.AsyncClient(
-                verify=False,
-                http2=False,
-                timeout=timeout,
-                trust_env=False,
-            ) as client:
-                if method.upper() == "GET":
-                    resp = await client.get(url, params=params)
-                elif method.upper() == "POST":
-                    resp = await client.post(url, json=params or {})
-                else:
-                    logger.error(f"Unsupported HTTP method: {method}")
-                    return 405, f"Unsupported Method: {method}"
-
-                return resp.status_code, resp.text
+            client = get_http_client()
+            with start_span(
+                f"HTTP {method.upper()}",
+                {"http.request.method": method.upper(), "url.full": url, "http.request.resend_count": attempt},
+            ) as span:
+                queued = time.perf_counter()
+                async with limiter.slot():
+                    span.set_attribute("http.rate_limit.wait", time.perf_counter() - queued)
+                    if method.upper() == "GET":
+                        resp = await client.get(url, params=params, timeout=timeout)
+                    else:
+                        resp = await client.post(url, json=params or {}, timeout=timeout)
+                span.set_attribute("http.response.status_code", resp.status_code)
+                span.set_attribute("http.response.body.size", len(resp.content))
+
+            if resp.status_code in THROTTLED_STATUS_CODES and attempt < retries:
+                # The limiter holds back the next attempt until the delay has passed
+                delay = limiter.backoff(attempt, backoff_factor, resp.headers.get("Retry-After"))
+                UPSTREAM_RETRIES.inc((urlsplit(url).netloc, "throttled"))
+                logger.warning(
+                    f"Upstream throttled request with {resp.status_code} (attempt {attempt + 1}/{retries + 1}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                continue
+
+            if resp.status_code not in THROTTLED_STATUS_CODES:
+                limiter.record_success()
+            return resp.status_code, resp.text
 
         except (httpx.RequestError, httpx.TimeoutException) as e:
             last_error = e
             if attempt < retries:  # Not the last attempt
                 backoff = backoff_factor * (2**attempt) + random.uniform(0, 0.1)
+                UPSTREAM_RETRIES.inc((urlsplit(url).netloc, "connection"))
                 logger.warning(f"Request failed (attempt {attempt + 1}/{retries + 1}): {str(e)}")
-                await asyncio.sleep(backoff)
+                with start_span("http.backoff", {"http.backoff.delay": backoff}):
+                    await asyncio.sleep(backoff)
             else:
                 logger.error(f"Request failed after {retries + 1} attempts: {str(e)}")
 
@@ -125,8 +753,15 @@ async def request_api(
     retries: int = 3,
     rate_limit_delay: Optional[float] = None,
 ) -> Tuple[Optional[T], Optional[RequestError]]:
-    """Main method for API request with cache, retry, and parsing."""
+    """Main method for API request with cache, retry, and parsing.
+
+    Concurrent identical requests that miss the cache share a single upstream call.
+    Stale entries are served immediately while they are refreshed in the background,
+    or without a refresh while the upstream's circuit breaker is open. Definitive
+    errors such as 404 are cached for `CACHE_NEGATIVE_TTL` seconds.
+    """
 
+    started = time.perf_counter()
     cache_ttl = cache_ttl or settings.CACHE_TTL
     params: Optional[Dict[str, Any]] = None
 
@@ -146,15 +781,131 @@ async def request_api(
             retries=retries,
             rate_limit_delay=rate_limit_delay,
         )
+        _observe_request("uncached", started)
         return parse_response(status, content, response_model_type)
 
     # Handle caching
     cache_key = generate_cache_key(method=method, url=url, params=params)
-    cached_content = get_cache_response(cache_key=cache_key)
+    cache_models = settings.MEMORY_CACHE_MODELS and response_model_type is not None
+    with start_span("cache.lookup", {"cache.key": cache_key}) as span:
+        if cache_models and response_model_type is not None:
+            cached_model = get_cached_model(cache_key, response_model_type)
+            if cached_model is not None:
+                span.set_attribute("cache.result", "memory")
+                _observe_request("memory", started)
+                return cached_model, None
+
+        circuit_open = get_circuit_breaker(url).state == CircuitState.OPEN
+        cached_content, stale_at = get_cache_entry(
+            cache_key=cache_key,
+            memory=not cache_models,
+            allow_stale=settings.CACHE_STALE_TTL > 0 or circuit_open,
+        )
+
+        # Only misses look for a cached error, which replaces the content it was cached for
+        if not cached_content:
+            cached_error = get_cached_error(cache_key)
+            if cached_error is not None:
+                span.set_attribute("cache.result", "negative")
+                _observe_request("negative", started)
+                return None, cached_error
+        is_stale = bool(cached_content) and stale_at is not None and stale_at <= time.time()
+        span.set_attribute("cache.result", ("stale" if is_stale else "hit") if cached_content else "miss")
+
     if cached_content:
-        return parse_response(200, cached_content, response_model_type)
+        if is_stale and not circuit_open:
+            # Serve the stale entry now and refresh it in the background
+            _start_fetch(cache_key, method, url, params, response_model_type, cache_ttl, retries, rate_limit_delay)
+
+        model, error = parse_response(200, cached_content, response_model_type)
+        if cache_models and model is not None and not is_stale:
+            cache_model(cache_key, model, size=len(cached_content), expires_at=stale_at)
+        _observe_request("stale" if is_stale else "hit", started)
+        return model, error
+
+    # Entries cached before requests were normalized are moved to the current key once
+    if (
+        settings.CACHE_MIGRATE_LEGACY_KEYS
+        and has_legacy_entries()
+        and migrate_legacy_entry(cache_key, method, url, params)
+    ):
+        return await request_api(
+            url=url,
+            request=request,
+            response_model_type=response_model_type,
+            method=method,
+            cache_ttl=cache_ttl,
+            retries=retries,
+            rate_limit_delay=rate_limit_delay,
+        )
+
+    # Not cached, join an identical in-flight request or start a new one
+    task = _start_fetch(cache_key, method, url, params, response_model_type, cache_ttl, retries, rate_limit_delay)
+
+    # Shield the shared request so a cancelled caller does not cancel it for the others
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _observe_request("miss", started)
+
+
+def _observe_request(result: str, started: float) -> None:
+    """Record the cache result and latency of a request."""
+    API_DURATION.observe(time.perf_counter() - started, (result,))
+
+
+def _start_fetch(
+    cache_key: str,
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    response_model_type: Optional[Type[T]],
+    cache_ttl: int,
+    retries: int,
+    rate_limit_delay: Optional[float],
+) -> "asyncio.Task[Tuple[Any, Optional[RequestError]]]":
+    """Return the in-flight request for a cache key, starting it if needed."""
+    task = _inflight_requests.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _fetch_and_cache(
+                cache_key=cache_key,
+                method=method,
+                url=url,
+                params=params,
+                response_model_type=response_model_type,
+                cache_ttl=cache_ttl,
+                retries=retries,
+                rate_limit_delay=rate_limit_delay,
+            )
+        )
+        _inflight_requests[cache_key] = task
+        INFLIGHT_FETCHES.inc()
+        task.add_done_callback(_finish_fetch(cache_key))
+    return task
+
+
+def _finish_fetch(cache_key: str) -> Callable[[Any], None]:
+    """Return the callback that forgets the in-flight request of a cache key once it is done."""
+
+    def callback(_: Any) -> None:
+        _inflight_requests.pop(cache_key, None)
+        INFLIGHT_FETCHES.dec()
+
+    return callback
+
 
-    # Not cached, make HTTP request
+async def _fetch_and_cache(
+    cache_key: str,
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    response_model_type: Optional[Type[T]],
+    cache_ttl: int,
+    retries: int,
+    rate_limit_delay: Optional[float],
+) -> Tuple[Optional[T], Optional[RequestError]]:
+    """Make the HTTP request, parse the response and cache it on success or definitive error."""
     status, content = await call_http(
         method=method,
         url=url,
@@ -162,12 +913,19 @@ async def request_api(
         retries=retries,
         rate_limit_delay=rate_limit_delay,
     )
-    parsed_response = parse_response(status, content, response_model_type)
+    model, error = parse_response(status, content, response_model_type)
 
     if status == 200:
-        cache_response(cache_key, content, cache_ttl)
+        with start_span("cache.store", {"cache.key": cache_key}):
+            cache_models = settings.MEMORY_CACHE_MODELS and response_model_type is not None
+            cache_response(cache_key, content, cache_ttl, memory=not cache_models)
+            if cache_models and model is not None:
+                cache_model(cache_key, model, size=len(content), cache_ttl=cache_ttl)
+    elif error is not None and settings.CACHE_NEGATIVE_TTL > 0 and status in settings.CACHE_NEGATIVE_STATUS_CODES:
+        with start_span("cache.store", {"cache.key": cache_key, "cache.negative": True}):
+            cache_error(cache_key, error, settings.CACHE_NEGATIVE_TTL, response_model_type)
 
-    return parsed_response
+    return model, error
 
 
 # --------------------------------
@@ -182,16 +940,19 @@ def parse_response(
     if status_code != 200:
         return None, RequestError(code=status_code, message=content)
     try:
-        if response_model_type is None:
-            if content.startswith("{") or content.startswith("["):
-                response_dict = json.loads(content)
-            elif "," in content:
-                io = StringIO(content)
-                response_dict = list(csv.DictReader(io))
-            else:
-                response_dict = {"text": content}
-            return response_dict, None
-        return response_model_type.model_validate_json(content), None
+        with start_span("response.parse") as span:
+            span.set_attribute("response.size", len(content))
+            if response_model_type is None:
+                if content.startswith("{") or content.startswith("["):
+                    response_dict = json.loads(content)
+                elif "," in content:
+                    io = StringIO(content)
+                    response_dict = list(csv.DictReader(io))
+                else:
+                    response_dict = {"text": content}
+                return response_dict, None
+            span.set_attribute("response.model", response_model_type.__qualname__)
+            return response_model_type.model_validate_json(content), None
 
     except Exception as e:
         logger.exception("Error parsing HTTP response")
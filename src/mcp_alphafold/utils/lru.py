@@ -0,0 +1,108 @@
+"""Bounded in-memory LRU cache with per-entry expiry."""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LRUCache:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, Tuple[Any, Optional[float], int]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and not self._is_expired(entry[1])
+
+    @staticmethod
+    def _is_expired(expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= time.time()
+
+    @staticmethod
+    def _size_of(value: Any) -> int:
+        if isinstance(value, (str, bytes, bytearray)):
+            return len(value)
+        return sys.getsizeof(value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for a key and mark it as recently used."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if self._is_expired(expires_at):
+            self.delete(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        expire: Optional[float] = None,
+        expires_at: Optional[float] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        """Store a value, evicting the least recently used entries when over budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expire: Seconds until the entry expires
+            expires_at: Absolute expiry timestamp, used instead of `expire` when given
+            size: Size of the value in bytes, estimated when not given
+        """
+        self.delete(key)
+
+        size = self._size_of(value) if size is None else size
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        if expires_at is None and expire is not None:
+            expires_at = time.time() + expire
+
+        self._data[key] = (value, expires_at, size)
+        self.size += size
+
+        while len(self._data) > self.max_entries or self.size > self.max_bytes:
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove a key, returning whether it was present."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self.size -= entry[2]
+        return True
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current usage."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._data),
+            "size": self.size,
+        }
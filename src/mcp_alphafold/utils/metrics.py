@@ -0,0 +1,326 @@
+"""In-process Prometheus metrics for tools and upstream requests.
+
+Metrics are rendered in the Prometheus text exposition format by the
+`/metrics` route of the streamable-http transport. They are updated from the
+event loop thread, so an update is a dictionary operation without locking.
+
+Worker processes serving the same clients share a snapshot directory, see
+`enable_multiprocess`: each worker saves its metrics there, and any worker
+renders the sum of them, so a scrape sees the same series whichever worker
+answers it.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from mcp_alphafold.utils.tracing import start_tool_span
+
+F = TypeVar("F", bound=Callable[..., Any])
+Labels = Tuple[str, ...]
+
+# Seconds; covers memory cache hits (microseconds) up to retried upstream requests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry: List["Metric"] = []
+_snapshot_dir: Optional[Path] = None
+
+
+def _escape(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    # Quotes are only escaped in label values
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), register: bool = True):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        if register:
+            _registry.append(self)
+
+    def _format_labels(self, labels: Labels, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels, strict=True)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """Yield the name, formatted labels and value of every sample."""
+
+    @abstractmethod
+    def snapshot(self) -> List[Any]:
+        """Return the values of every label set, serializable as JSON."""
+
+    @abstractmethod
+    def merged(self, snapshots: List[List[Any]]) -> "Metric":
+        """Return an unregistered copy of the metric holding the sum of snapshots."""
+
+    def render(self) -> List[str]:
+        """Return the metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), register: bool = True):
+        super().__init__(name, documentation, labelnames, register)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for labels, value in list(self._values.items()):
+            yield self.name, self._format_labels(labels), value
+
+    def snapshot(self) -> List[Any]:
+        return [[list(labels), value] for labels, value in list(self._values.items())]
+
+    def merged(self, snapshots: List[List[Any]]) -> "Counter":
+        metric = type(self)(self.name, self.documentation, self.labelnames, register=False)
+        for snapshot in snapshots:
+            for labels, value in snapshot:
+                metric.inc(tuple(labels), value)
+        return metric
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        register: bool = True,
+    ):
+        super().__init__(name, documentation, labelnames, register)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: the count of each bucket, not cumulative, with +Inf last, and the sum
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def sum(self, labels: Labels = ()) -> float:
+        return self._sums.get(labels, 0.0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for labels, counts in list(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket", self._format_labels(labels, f'le="{_format_value(bound)}"'), cumulative
+            yield f"{self.name}_sum", self._format_labels(labels), self._sums[labels]
+            yield f"{self.name}_count", self._format_labels(labels), cumulative
+
+    def snapshot(self) -> List[Any]:
+        return [[list(labels), counts, self._sums[labels]] for labels, counts in list(self._counts.items())]
+
+    def merged(self, snapshots: List[List[Any]]) -> "Histogram":
+        metric = Histogram(self.name, self.documentation, self.labelnames, self.buckets, register=False)
+        for snapshot in snapshots:
+            for labels, counts, total in snapshot:
+                key = tuple(labels)
+                merged_counts = metric._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+                for index, count in enumerate(counts):
+                    merged_counts[index] += count
+                metric._sums[key] = metric._sums.get(key, 0.0) + total
+        return metric
+
+
+def render_metrics() -> str:
+    """Return all metrics in the Prometheus text exposition format, summed over the workers if shared."""
+    PROCESS_CPU.inc(amount=time.process_time() - PROCESS_CPU.value())
+    metrics = _registry
+    if _snapshot_dir is not None:
+        write_snapshot()
+        snapshots = _read_snapshots()
+        # Counters keep the counts of exited workers so they never decrease; gauges only sum live workers
+        metrics = [
+            metric.merged([
+                data.get(metric.name, []) for alive, data in snapshots if alive or not isinstance(metric, Gauge)
+            ])
+            for metric in _registry
+        ]
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def enable_multiprocess(directory: str) -> None:
+    """Share the metrics of this process with the other workers saving theirs in `directory`."""
+    global _snapshot_dir
+    _snapshot_dir = Path(directory)
+    _snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+
+def write_snapshot() -> None:
+    """Save the metrics of this process for the other workers to aggregate."""
+    if _snapshot_dir is None:
+        return
+    PROCESS_CPU.inc(amount=time.process_time() - PROCESS_CPU.value())
+    path = _snapshot_dir / f"{os.getpid()}.json"
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({metric.name: metric.snapshot() for metric in _registry}))
+    os.replace(tmp_path, path)
+
+
+async def write_snapshots(interval: float) -> None:
+    """Save the metrics of this process every `interval` seconds, and once more when cancelled."""
+    try:
+        while True:
+            write_snapshot()
+            await asyncio.sleep(interval)
+    finally:
+        write_snapshot()
+
+
+def _read_snapshots() -> List[Tuple[bool, Dict[str, List[Any]]]]:
+    """Return whether the process of each snapshot is alive, and its metrics."""
+    assert _snapshot_dir is not None
+    snapshots = []
+    for path in _snapshot_dir.glob("*.json"):
+        try:
+            data = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            continue
+        snapshots.append((_is_alive(int(path.stem)), data))
+    return snapshots
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# --------------------------------
+# METRICS
+# --------------------------------
+TOOL_CALLS = Counter(
+    "alphafold_mcp_tool_calls_total",
+    "Tool calls by tool and outcome (ok, error or exception).",
+    ("tool", "status"),
+)
+TOOL_DURATION = Histogram("alphafold_mcp_tool_duration_seconds", "Tool call latency.", ("tool",))
+TOOLS_IN_PROGRESS = Gauge("alphafold_mcp_tool_calls_in_progress", "Tool calls being processed.", ("tool",))
+
+# The _count series per result gives the cache hit ratio
+API_DURATION = Histogram(
+    "alphafold_mcp_api_request_duration_seconds",
+    "API request latency by cache result: memory (validated model), hit, stale, negative (cached error), miss or uncached.",
+    ("result",),
+)
+INFLIGHT_FETCHES = Gauge(
+    "alphafold_mcp_inflight_fetches",
+    "Upstream fetches in flight; identical concurrent requests share one.",
+)
+
+UPSTREAM_REQUESTS = Counter(
+    "alphafold_mcp_upstream_requests_total",
+    "Upstream HTTP requests by host and final status code.",
+    ("host", "status"),
+)
+UPSTREAM_DURATION = Histogram(
+    "alphafold_mcp_upstream_request_duration_seconds",
+    "Upstream HTTP request latency, including retries and rate limiting.",
+    ("host",),
+)
+UPSTREAM_RETRIES = Counter(
+    "alphafold_mcp_upstream_retries_total",
+    "Upstream HTTP requests retried, by host and reason (throttled or connection).",
+    ("host", "reason"),
+)
+UPSTREAM_IN_FLIGHT = Gauge("alphafold_mcp_upstream_requests_in_flight", "Upstream HTTP requests in flight.", ("host",))
+
+# Brought up to date when rendered; its rate is the share of one core used by the server
+PROCESS_CPU = Counter("process_cpu_seconds_total", "Total user and system CPU time spent in seconds.")
+
+
+def _is_error(result: Any) -> bool:
+    # Tools report errors as an {"error": ...} payload, serialized or not
+    if isinstance(result, str):
+        return result.startswith('{"error"')
+    return isinstance(result, dict) and "error" in result
+
+
+def instrument_tool(func: F) -> F:
+    """Record the calls, outcome and latency of a tool, in a root span when tracing is enabled."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        labels = (name,)
+        TOOLS_IN_PROGRESS.inc(labels)
+        status = "exception"
+        started = time.perf_counter()
+        try:
+            with start_tool_span(name) as span:
+                result = func(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                status = "error" if _is_error(result) else "ok"
+                span.set_attribute("mcp.tool.status", status)
+                return result
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - started, labels)
+            TOOL_CALLS.inc((name, status))
+            TOOLS_IN_PROGRESS.dec(labels)
+
+    return wrapper  # type: ignore[return-value]
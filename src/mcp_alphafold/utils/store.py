@@ -0,0 +1,450 @@
+"""Content-addressed on-disk store for files downloaded from upstream."""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+import httpx
+from pydantic import BaseModel
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils.circuit import get_circuit_breaker
+from mcp_alphafold.utils.http import RequestError, get_cache_dir, get_http_client
+from mcp_alphafold.utils.throttle import get_host_limiter
+
+logger = logging.getLogger(__name__)
+_file_store: Optional["FileStore"] = None
+
+TOUCH_INTERVAL = 60.0  # seconds between updates of the modification time of a used object
+
+
+class StoredFile(BaseModel):
+    url: str
+    sha256: str
+    size: int
+    path: str
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float
+
+
+class FileStore:
+    """Store downloaded files by the SHA-256 of their content.
+
+    An index maps each URL to its stored object and the validators needed to
+    revalidate it. Files are streamed to disk in chunks, and interrupted
+    downloads are resumed with a range request. Concurrent fetches of a URL
+    share one download, and every download writes to its own temporary file.
+
+    The index also lists the URLs of each object, so an object is removed when
+    no URL uses it anymore. Objects are evicted in least recently used order,
+    by modification time, above `FILE_STORE_SIZE_LIMIT`.
+    """
+
+    def __init__(self, directory: str):
+        from diskcache import Cache
+
+        self.directory = Path(directory)
+        self.objects_dir = self.directory / "objects"
+        self.partial_dir = self.directory / "partial"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        self.index = Cache(str(self.directory / "index"))
+        self._downloads: Dict[str, "asyncio.Task[Tuple[Optional[StoredFile], Optional[RequestError]]]"] = {}
+
+    def object_path(self, digest: str) -> Path:
+        """Return the path of the object with the given SHA-256 digest."""
+        return self.objects_dir / digest[:2] / digest
+
+    def partial_path(self, url: str) -> Path:
+        """Return the path of the partial download of a URL, kept to resume it."""
+        return self.partial_dir / hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _temp_path(self) -> Path:
+        """Create an empty temporary file for a single download."""
+        fd, path = tempfile.mkstemp(dir=self.partial_dir, prefix="download-", suffix=".tmp")
+        os.close(fd)
+        return Path(path)
+
+    def get(self, url: str) -> Optional[StoredFile]:
+        """Return the stored file for a URL if it is available on disk."""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        stored = StoredFile.model_validate(entry)
+        try:
+            mtime = os.stat(stored.path).st_mtime
+        except FileNotFoundError:
+            return None
+        if self._is_object(stored.path) and time.time() - mtime > TOUCH_INTERVAL:
+            # The modification time orders objects for eviction
+            try:
+                os.utime(stored.path)
+            except OSError:
+                pass
+        return stored
+
+    def _is_object(self, path: str) -> bool:
+        """Return whether a path is an object of the store, rather than a local file used in place."""
+        return Path(path).parent.parent == self.objects_dir
+
+    def _link(self, stored: StoredFile) -> None:
+        """Index the stored file of a URL, removing the object it replaces if no other URL uses it."""
+        with self.index.transact():
+            previous = self.index.get(stored.url)
+            self.index.set(stored.url, stored.model_dump())
+            if self._is_object(stored.path):
+                urls = self.index.get(f"refs:{stored.sha256}", [])
+                if stored.url not in urls:
+                    self.index.set(f"refs:{stored.sha256}", [*urls, stored.url])
+            if previous is None or previous["sha256"] == stored.sha256:
+                return
+            # Objects stored before their URLs were listed are left to `prune`
+            urls = self.index.get(f"refs:{previous['sha256']}")
+            if urls is None:
+                return
+            urls = [url for url in urls if url != stored.url]
+            if urls:
+                self.index.set(f"refs:{previous['sha256']}", urls)
+            else:
+                self.index.delete(f"refs:{previous['sha256']}")
+                self._remove_object(previous["sha256"])
+
+    def _remove_object(self, digest: str) -> None:
+        """Remove an object and the files derived from it, e.g. converted PAE matrices named after its digest."""
+        self.object_path(digest).unlink(missing_ok=True)
+        for path in self.directory.glob(f"*/{digest}.*"):
+            path.unlink(missing_ok=True)
+
+    def _scan_objects(self) -> List[Tuple[float, int, str]]:
+        """Return the modification time, size and digest of every object."""
+        objects = []
+        for subdir in os.scandir(self.objects_dir):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                objects.append((stat.st_mtime, stat.st_size, entry.name))
+        return objects
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove the least recently used objects until the store is within `FILE_STORE_SIZE_LIMIT`.
+
+        Args:
+            keep: Digest of an object that is never evicted, e.g. the one just stored
+
+        Returns:
+            The number of evicted objects
+        """
+        if settings.FILE_STORE_SIZE_LIMIT <= 0:
+            return 0
+        objects = self._scan_objects()
+        volume = sum(size for _, size, _ in objects)
+        evicted = 0
+        for _, size, digest in sorted(objects):
+            if volume <= settings.FILE_STORE_SIZE_LIMIT:
+                break
+            if digest == keep:
+                continue
+            with self.index.transact():
+                for url in self.index.pop(f"refs:{digest}", default=[]):
+                    entry = self.index.get(url)
+                    if entry is not None and entry["sha256"] == digest:
+                        self.index.delete(url)
+                self._remove_object(digest)
+            volume -= size
+            evicted += 1
+        return evicted
+
+    def prune(self) -> Dict[str, int]:
+        """
+        Remove stale partial downloads and objects no URL uses, and evict objects above the size limit.
+
+        Partial downloads and unused objects are removed once they are older than
+        `FILE_STORE_PARTIAL_TTL`, so files of downloads in progress are kept.
+
+        Returns:
+            The number of removed files per step
+        """
+        expired_before = time.time() - settings.FILE_STORE_PARTIAL_TTL
+        partials = 0
+        for entry in os.scandir(self.partial_dir):
+            try:
+                if entry.stat().st_mtime < expired_before:
+                    os.unlink(entry.path)
+                    partials += 1
+            except FileNotFoundError:
+                continue
+
+        used = set()
+        for key in self.index.iterkeys():
+            if isinstance(key, str) and not key.startswith(("partial:", "refs:")):
+                entry = self.index.get(key)
+                if entry is not None:
+                    used.add(entry["sha256"])
+        unused = 0
+        for mtime, _, digest in self._scan_objects():
+            if digest not in used and mtime < expired_before:
+                self.index.delete(f"refs:{digest}")
+                self._remove_object(digest)
+                unused += 1
+
+        return {"partials": partials, "unused": unused, "evicted": self.evict()}
+
+    def vacuum(self) -> Dict[str, int]:
+        """
+        Rebuild the index database to return free pages to the filesystem.
+
+        Returns:
+            The volume of the index in bytes before and after
+        """
+        before = self.index.volume()
+        db = sqlite3.connect(os.path.join(self.index.directory, "cache.db"), timeout=60)
+        try:
+            db.execute("VACUUM")
+        finally:
+            db.close()
+        return {"before": before, "after": self.index.volume()}
+
+    def close(self) -> None:
+        """Close the index database."""
+        self.index.close()
+
+    async def fetch(
+        self,
+        url: str,
+        max_age: Optional[int] = None,
+    ) -> Tuple[Optional[StoredFile], Optional[RequestError]]:
+        """Return the stored file for a URL, downloading or revalidating it when needed.
+
+        Args:
+            url: URL of the file
+            max_age: Seconds a stored file is used without revalidation, defaults to `FILE_STORE_TTL`
+
+        Returns:
+            The stored file or an error. A previously stored file is returned when
+            the upstream cannot be reached.
+        """
+        if not url:
+            return None, RequestError(code=404, message="File is not available for this entry")
+        if url.startswith("file://"):
+            try:
+                return await asyncio.to_thread(self._import_local, url), None
+            except FileNotFoundError:
+                return None, RequestError(code=404, message=f"File not found: {url}")
+
+        max_age = settings.FILE_STORE_TTL if max_age is None else max_age
+        stored = self.get(url)
+        if stored is not None and time.time() - stored.fetched_at < max_age:
+            return stored, None
+
+        # Join the download of the URL in progress, or start it
+        task = self._downloads.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._download(url, stored))
+            self._downloads[url] = task
+            task.add_done_callback(lambda _: self._downloads.pop(url, None))
+        # Shield the shared download so a cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _download(
+        self,
+        url: str,
+        stored: Optional[StoredFile],
+    ) -> Tuple[Optional[StoredFile], Optional[RequestError]]:
+        """Download or revalidate the file of a URL."""
+        breaker = get_circuit_breaker(url)
+        if not breaker.allow_request():
+            if stored is not None:
+                return stored, None
+            return None, RequestError(code=503, message=f"Circuit open: {urlsplit(url).netloc} is unavailable")
+
+        headers = {}
+        if stored is not None:
+            if stored.etag:
+                headers["If-None-Match"] = stored.etag
+            if stored.last_modified:
+                headers["If-Modified-Since"] = stored.last_modified
+
+        # Resume an interrupted download when the upstream can confirm it is the same file. The
+        # partial file is moved to this download's own file first, so no other process writes to it
+        temp = self._temp_path()
+        partial_etag = self.index.get(f"partial:{url}")
+        resumed = False
+        if partial_etag:
+            try:
+                os.replace(self.partial_path(url), temp)
+                resumed = temp.stat().st_size > 0
+            except FileNotFoundError:
+                pass
+        if resumed:
+            headers["Range"] = f"bytes={temp.stat().st_size}-"
+            headers["If-Range"] = partial_etag
+
+        try:
+            async with get_host_limiter(url).slot():
+                async with get_http_client().stream("GET", url, headers=headers) as resp:
+                    if resp.status_code == 304 and stored is not None:
+                        stored = stored.model_copy(update={"fetched_at": time.time()})
+                        self.index.set(url, stored.model_dump())
+                    elif resp.status_code in (200, 206):
+                        stored = await self._write(url, resp, temp, append=resumed and resp.status_code == 206)
+                    else:
+                        error = RequestError(code=resp.status_code, message=resp.reason_phrase)
+                        if resp.status_code >= 500:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+                        return None, error
+        except (httpx.RequestError, httpx.TimeoutException) as e:
+            logger.warning(f"Download of {url} failed: {str(e)}")
+            breaker.record_failure()
+            if stored is not None:
+                return stored, None
+            return None, RequestError(code=599, message=f"Download failed: {str(e)}")
+        finally:
+            self._keep_partial(url, temp)
+
+        breaker.record_success()
+        return stored, None
+
+    def _keep_partial(self, url: str, temp: Path) -> None:
+        """Keep the file of an interrupted download to resume it, or remove it."""
+        try:
+            if temp.stat().st_size > 0 and self.index.get(f"partial:{url}"):
+                os.replace(temp, self.partial_path(url))
+            else:
+                temp.unlink()
+        except FileNotFoundError:
+            # The download completed and its file was moved into the store
+            pass
+
+    async def _write(self, url: str, resp: httpx.Response, temp: Path, append: bool = False) -> StoredFile:
+        """Stream a response body into the store, hashing it on the way.
+
+        Args:
+            url: URL of the file
+            resp: Response with the whole body, or the rest of it when `append` is True
+            temp: Temporary file of this download
+            append: Append the body to the part of the file already in `temp`
+        """
+        sha256_hash = hashlib.sha256()
+        if append:
+            with open(temp, "rb") as fh:
+                for chunk in iter(lambda: fh.read(settings.FILE_STORE_CHUNK_SIZE), b""):
+                    sha256_hash.update(chunk)
+        self.index.set(f"partial:{url}", resp.headers.get("ETag"))
+
+        with open(temp, "ab" if append else "wb") as fh:
+            async for chunk in resp.aiter_bytes(settings.FILE_STORE_CHUNK_SIZE):
+                fh.write(chunk)
+                sha256_hash.update(chunk)
+
+        digest = sha256_hash.hexdigest()
+        path = self.object_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = temp.stat().st_size
+        os.replace(temp, path)
+        self.index.delete(f"partial:{url}")
+
+        stored = StoredFile(
+            url=url,
+            sha256=digest,
+            size=size,
+            path=str(path),
+            content_type=resp.headers.get("Content-Type"),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            fetched_at=time.time(),
+        )
+        self._link(stored)
+        self.evict(keep=digest)
+        return stored
+
+    def _import_local(self, url: str) -> StoredFile:
+        """Index a local file, decompressing gzipped files into the store.
+
+        Uncompressed files are used in place. The file size and modification
+        time are kept as the validator, so a file is only hashed again when it changes.
+        """
+        source = Path(url2pathname(urlsplit(url).path))
+        stat = source.stat()
+        validator = f"{stat.st_size}-{stat.st_mtime_ns}"
+        stored = self.get(url)
+        if stored is not None and stored.etag == validator:
+            return stored
+
+        sha256_hash = hashlib.sha256()
+        if source.suffix == ".gz":
+            temp = self._temp_path()
+            try:
+                with gzip.open(source, "rb") as src, open(temp, "wb") as dst:
+                    for chunk in iter(lambda: src.read(settings.FILE_STORE_CHUNK_SIZE), b""):
+                        dst.write(chunk)
+                        sha256_hash.update(chunk)
+                path = self.object_path(sha256_hash.hexdigest())
+                path.parent.mkdir(parents=True, exist_ok=True)
+                size = temp.stat().st_size
+                os.replace(temp, path)
+            finally:
+                temp.unlink(missing_ok=True)
+        else:
+            with open(source, "rb") as fh:
+                for chunk in iter(lambda: fh.read(settings.FILE_STORE_CHUNK_SIZE), b""):
+                    sha256_hash.update(chunk)
+            path, size = source, stat.st_size
+
+        stored = StoredFile(
+            url=url,
+            sha256=sha256_hash.hexdigest(),
+            size=size,
+            path=str(path),
+            etag=validator,
+            fetched_at=time.time(),
+        )
+        self._link(stored)
+        if self._is_object(stored.path):
+            self.evict(keep=stored.sha256)
+        return stored
+
+    def read_range(self, stored: StoredFile, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Read a byte range of a stored file without loading the rest of it."""
+        with open(stored.path, "rb") as fh:
+            fh.seek(offset)
+            return fh.read(-1 if length is None else length)
+
+    def iter_chunks(self, stored: StoredFile, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """Iterate over a stored file in chunks."""
+        chunk_size = chunk_size or settings.FILE_STORE_CHUNK_SIZE
+        with open(stored.path, "rb") as fh:
+            yield from iter(lambda: fh.read(chunk_size), b"")
+
+
+def get_file_store() -> FileStore:
+    """Initialize and return the file store."""
+    global _file_store
+    if _file_store is None:
+        _file_store = FileStore(settings.FILE_STORE_DIR or os.path.join(get_cache_dir(), "files"))
+    return _file_store
+
+
+def close_file_store() -> None:
+    """Close the file store and its index database."""
+    global _file_store
+    if _file_store is not None:
+        _file_store.close()
+        _file_store = None
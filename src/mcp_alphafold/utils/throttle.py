@@ -0,0 +1,151 @@
+"""Per-host rate limiting and concurrency control for upstream requests."""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from mcp_alphafold.settings import settings
+
+_host_limiters: Dict[str, "HostLimiter"] = {}
+_worker_count = 1  # processes the upstream limits are split between, see `share_limits`
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it.
+
+        A token is reserved immediately, so concurrent callers queue up behind
+        each other instead of all waking up at the same time.
+        """
+        now = time.monotonic()
+        wait = self._blocked_until - now
+        if self.rate > 0:
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(wait, -self._tokens / self.rate)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for the given number of seconds."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def slow_down(self) -> None:
+        """Halve the rate after the upstream signalled that it is overloaded."""
+        if self.max_rate > 0:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.max_rate / 10, self.rate / 2)
+
+    def speed_up(self) -> None:
+        """Recover the rate step by step after successful requests."""
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class HostLimiter:
+    def __init__(self, rate: float, burst: int, max_in_flight: int):
+        self.bucket = TokenBucket(rate=rate, capacity=max(1, burst))
+        self.semaphore: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+        self.loop = asyncio.get_running_loop()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a rate limit token and a free in-flight slot."""
+        await self.bucket.acquire()
+        if self.semaphore is None:
+            yield
+            return
+        async with self.semaphore:
+            yield
+
+    def backoff(
+        self,
+        attempt: int,
+        backoff_factor: float,
+        retry_after: Optional[str] = None,
+    ) -> float:
+        """Slow down all requests to the host after a 429/503 response.
+
+        Args:
+            attempt: Zero-based attempt number of the throttled request
+            backoff_factor: Base delay for exponential backoff
+            retry_after: Value of the `Retry-After` response header, if any
+
+        Returns:
+            The delay before the host accepts requests again
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = backoff_factor * (2**attempt) + random.uniform(0, 0.1)
+        delay = min(delay, settings.UPSTREAM_MAX_RETRY_AFTER)
+
+        self.bucket.slow_down()
+        self.bucket.pause(delay)
+        return delay
+
+    def record_success(self) -> None:
+        """Let the rate recover after a successful response."""
+        self.bucket.speed_up()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def share_limits(workers: int) -> None:
+    """Split the upstream limits of the settings between `workers` processes serving the same clients."""
+    global _worker_count
+    _worker_count = max(1, workers)
+    _host_limiters.clear()
+
+
+def get_process_limits() -> Tuple[float, int, int]:
+    """Return the rate limit, burst and in-flight limit of this process's share of the upstream limits."""
+    workers = _worker_count
+    max_in_flight = settings.UPSTREAM_MAX_IN_FLIGHT
+    return (
+        settings.UPSTREAM_RATE_LIMIT / workers,
+        max(1, settings.UPSTREAM_BURST // workers),
+        max(1, max_in_flight // workers) if max_in_flight > 0 else 0,
+    )
+
+
+def get_host_limiter(url: str) -> HostLimiter:
+    """Return the limiter shared by all requests to the URL's host."""
+    host = urlsplit(url).netloc
+    limiter = _host_limiters.get(host)
+    # Semaphores are bound to an event loop, so a new loop gets new limiters
+    if limiter is None or limiter.loop is not asyncio.get_running_loop():
+        rate, burst, max_in_flight = get_process_limits()
+        limiter = HostLimiter(rate=rate, burst=burst, max_in_flight=max_in_flight)
+        _host_limiters[host] = limiter
+    return limiter
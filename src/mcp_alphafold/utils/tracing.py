@@ -0,0 +1,114 @@
+"""Optional OpenTelemetry tracing of tool calls, cache operations and upstream requests.
+
+Tracing is enabled with `TRACING_ENABLED` and needs the 'opentelemetry-api'
+package, installed with the 'tracing' extra together with the SDK and the OTLP
+exporter. Spans are exported with the standard `OTEL_*` environment variables,
+e.g. `OTEL_EXPORTER_OTLP_ENDPOINT`, unless a tracer provider is already set up,
+e.g. by `opentelemetry-instrument`. When tracing is disabled, OpenTelemetry
+is not imported and `start_span` returns a shared no-op span.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from mcp_alphafold.settings import settings
+
+logger = logging.getLogger(__name__)
+_tracer: Optional[Any] = None
+
+
+class NoopSpan:
+    """Stands in for a span, and its context manager, when tracing is disabled."""
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def _configure_provider() -> None:
+    """Export spans with OTLP unless the application already set a tracer provider."""
+    from opentelemetry import trace
+
+    if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        return
+    try:
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("TRACING_ENABLED is set but 'opentelemetry-sdk' is not installed, spans are not exported")
+        return
+
+    provider = TracerProvider(resource=Resource.create({SERVICE_NAME: settings.SERVER_NAME}))
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        logger.warning("TRACING_ENABLED is set but no OTLP exporter is installed, spans are not exported")
+    else:
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+def setup_tracing() -> None:
+    """Create the tracer if tracing is enabled, or disable tracing."""
+    global _tracer
+    _tracer = None
+    if not settings.TRACING_ENABLED:
+        return
+    try:
+        from opentelemetry import trace
+    except ImportError:  # optional dependency, installed with the 'tracing' extra
+        logger.warning("TRACING_ENABLED is set but 'opentelemetry-api' is not installed, tracing is disabled")
+        return
+    _configure_provider()
+    _tracer = trace.get_tracer("mcp_alphafold")
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Start a child span of the current span, to be used as a context manager.
+
+    The context manager yields the span, or `NOOP_SPAN` when tracing is disabled.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def start_tool_span(name: str) -> Any:
+    """
+    Start the root span of a tool call.
+
+    With the streamable-http transport, the span continues the trace of the
+    client's request when it sends a W3C `traceparent` header.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    from fastmcp.server.dependencies import get_http_headers
+    from opentelemetry import propagate, trace
+
+    parent = propagate.extract(get_http_headers(include_all=True))
+    return _tracer.start_as_current_span(
+        f"tool {name}",
+        context=parent,
+        kind=trace.SpanKind.SERVER,
+        attributes={"mcp.tool.name": name},
+    )
@@ -0,0 +1,131 @@
+"""Pre-populate the response cache for a list of UniProt accessions."""
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils.http import RequestError, close_http_client, is_cached, wait_for_inflight_requests
+
+if TYPE_CHECKING:
+    from mcp_alphafold.tools.alphafold import RemoteBackend
+
+WARM_ENDPOINTS = ("prediction", "summary", "annotations")
+WARM_STATUSES = ("cached", "missing", "fetched", "failed")
+
+
+def read_accessions(path: Path) -> List[str]:
+    """
+    Read UniProt accessions from a file, one per line.
+
+    Blank lines and lines starting with '#' are skipped. Only the first
+    comma-, tab- or space-separated column is used, so CSV and TSV exports
+    can be passed as they are. Duplicates are removed, keeping the first one.
+    """
+    accessions: Dict[str, None] = {}
+    with open(path) as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            accession = line.replace(",", " ").split()[0]
+            if accession.lower() not in ("accession", "uniprot_accession", "uniprotaccession"):
+                accessions[accession] = None
+    return list(accessions)
+
+
+def _requests(
+    backend: "RemoteBackend",
+    accession: str,
+    annotation_type: str,
+) -> Dict[
+    str, Tuple[Tuple[str, Optional[Dict[str, Any]]], Callable[[], Awaitable[Tuple[Any, Optional[RequestError]]]]]
+]:
+    """Return the URL and parameters, and the request, of every endpoint for an accession."""
+    return {
+        "prediction": (
+            backend.prediction_request(accession),
+            lambda: backend.get_prediction(accession),
+        ),
+        "summary": (
+            backend.uniprot_summary_request(accession),
+            lambda: backend.get_uniprot_summary(accession),
+        ),
+        "annotations": (
+            backend.annotations_request(accession, annotation_type),
+            lambda: backend.get_annotations(accession, annotation_type),
+        ),
+    }
+
+
+async def warm_cache(
+    accessions: Iterable[str],
+    endpoints: Iterable[str] = WARM_ENDPOINTS,
+    annotation_type: str = "MUTAGEN",
+    max_concurrency: Optional[int] = None,
+    dry_run: bool = False,
+    on_progress: Optional[Callable[[str, Dict[str, str]], None]] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Request every endpoint of every accession so that the responses are cached.
+
+    Responses and definitive errors that are already cached are skipped, so an
+    interrupted run resumes where it stopped when started again. Requests go
+    through the shared HTTP client and respect the per-host upstream rate limit.
+
+    Args:
+        accessions: UniProt accessions
+        endpoints: Endpoints to warm, from 'prediction', 'summary' and 'annotations'
+        annotation_type: Annotation type requested from the annotations endpoint
+        max_concurrency: Number of accessions processed at once, defaults to `BATCH_MAX_CONCURRENCY`
+        dry_run: Only check which responses are cached, without requesting the others
+        on_progress: Called with each accession and the status of each of its endpoints
+
+    Returns:
+        The number of requests per endpoint and status ('cached', 'missing', 'fetched' or 'failed')
+    """
+    endpoints = list(dict.fromkeys(endpoints))
+    unknown = set(endpoints) - set(WARM_ENDPOINTS)
+    if unknown:
+        raise ValueError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+    from mcp_alphafold.tools.alphafold import RemoteBackend
+
+    backend = RemoteBackend()
+    counts = {endpoint: dict.fromkeys(WARM_STATUSES, 0) for endpoint in endpoints}
+    pending: Iterator[str] = iter(accessions)
+
+    async def warm_accession(accession: str) -> Dict[str, str]:
+        statuses = {}
+        requests = _requests(backend, accession, annotation_type)
+        for endpoint in endpoints:
+            (url, params), request = requests[endpoint]
+            if is_cached(url, params=params):
+                status = "cached"
+            elif dry_run:
+                status = "missing"
+            else:
+                try:
+                    response, _ = await request()
+                except Exception:
+                    response = None
+                # Definitive errors such as 404 are cached as well and count as fetched
+                status = "fetched" if response is not None or is_cached(url, params=params) else "failed"
+            counts[endpoint][status] += 1
+            statuses[endpoint] = status
+        return statuses
+
+    async def worker() -> None:
+        # Workers share one iterator, so at most `max_concurrency` accessions are in flight
+        for accession in pending:
+            statuses = await warm_accession(accession)
+            if on_progress is not None:
+                on_progress(accession, statuses)
+
+    try:
+        workers = max(1, max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        await wait_for_inflight_requests()
+    finally:
+        await close_http_client()
+    return counts
@@ -0,0 +1,14 @@
+import pytest
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils import http
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Open the response cache and the memory tier in a temporary directory for the duration of a test."""
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(http, "_cache", None)
+    monkeypatch.setattr(http, "_memory_cache", None)
+    yield tmp_path / "cache"
+    http.close_cache()
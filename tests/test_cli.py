@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from mcp_alphafold.cli import app
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils import http, store
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(http, "_cache", None)
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "CACHE_SHARDS", 2)
+    monkeypatch.setattr(store, "_file_store", None)
+    http.get_cache().set("key", "value")
+    http.close_cache()
+    return tmp_path / "cache"
+
+
+def test_cache_inspect(cache_dir):
+    """Test that the inspect command shows the location, shards and entries."""
+    result = runner.invoke(app, ["cache", "inspect"])
+
+    assert result.exit_code == 0
+    assert f"directory       {cache_dir}" in result.output
+    assert "shards          2" in result.output
+    assert "entries         1" in result.output
+
+
+def test_cache_prune_and_vacuum(cache_dir):
+    """Test that prune and vacuum report what they did."""
+    pruned = runner.invoke(app, ["cache", "prune"])
+    cleared = runner.invoke(app, ["cache", "prune", "--all"])
+    vacuumed = runner.invoke(app, ["cache", "vacuum"])
+
+    assert pruned.output.splitlines() == ["expired 0, evicted 0", "files: partials 0, unused 0, evicted 0"]
+    assert cleared.output.splitlines()[0] == "cleared 1"
+    assert vacuumed.exit_code == 0
+    assert vacuumed.output.startswith("volume ")
+
+
+def test_cache_stats_export(cache_dir, tmp_path):
+    """Test exporting the statistics as JSON to a file."""
+    output = tmp_path / "stats.json"
+
+    result = runner.invoke(app, ["cache", "stats", "--output", str(output)])
+
+    stats = json.loads(output.read_text())
+    assert result.exit_code == 0
+    assert stats["entries"] == 1
+    assert len(stats["shard_stats"]) == 2
@@ -0,0 +1,53 @@
+import json
+
+import httpx
+import pytest
+
+from mcp_alphafold.fake_api import FakeAlphaFoldAPI, load_payloads
+from mcp_alphafold.tools.alphafold import RemoteBackend
+from mcp_alphafold.tools.models import AnnotationResponse, UniprotSummaryResponse
+
+
+def make_client(api: FakeAlphaFoldAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://fake")
+
+
+def test_load_payloads_scale():
+    """Test that scaled payloads stay valid and grow"""
+    payloads = load_payloads()
+    scaled = load_payloads(3)
+
+    summary = UniprotSummaryResponse.model_validate_json(scaled["uniprot_summary"])
+    annotations = AnnotationResponse.model_validate_json(scaled["annotations"])
+    assert len(summary.structures) == 3 * len(json.loads(payloads["uniprot_summary"])["structures"])
+    assert len(annotations.sequence) == 3 * len(json.loads(payloads["annotations"])["sequence"])
+    region = annotations.annotation[0].regions[0]
+    assert region.end - region.start + 1 == len(region.annotation_value)
+
+
+@pytest.mark.asyncio
+async def test_fake_api_serves_requested_accession():
+    """Test that the fixtures are answered for the requested accession on the backend's URLs"""
+    backend = RemoteBackend("http://fake/api")
+    async with make_client(FakeAlphaFoldAPI()) as client:
+        for url, params in (
+            backend.prediction_request("Q5VSL9"),
+            backend.uniprot_summary_request("Q5VSL9"),
+            backend.annotations_request("Q5VSL9", "MUTAGEN"),
+        ):
+            response = await client.get(url, params=params)
+            assert response.status_code == 200
+            assert "Q5VSL9" in response.text
+            assert "P00520" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_fake_api_injects_errors():
+    """Test that injected errors are answered and counted"""
+    api = FakeAlphaFoldAPI(error_rate=1.0, error_status=429, seed=0)
+    async with make_client(api) as client:
+        response = await client.get("/api/prediction/P00520")
+        assert response.status_code == 429
+
+        stats = (await client.get("/api/stats")).json()
+    assert stats == {"requests": 1, "errors": 1}
@@ -0,0 +1,81 @@
+import uuid
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from mcp_alphafold.fake_api import FakeAlphaFoldAPI
+from mcp_alphafold.loadtest import metrics_url_for, parse_metrics, parse_mix, run_load_test, summarize_server
+from mcp_alphafold.server import AlphaFoldMCP
+from mcp_alphafold.tools import alphafold
+from mcp_alphafold.tools.alphafold import RemoteBackend
+
+
+def test_parse_mix():
+    """Test that weights default to one and unknown tools are rejected"""
+    assert parse_mix("get_uniprot_summary=3, get_annotations") == {"get_uniprot_summary": 3.0, "get_annotations": 1.0}
+    with pytest.raises(ValueError, match="Unknown tool"):
+        parse_mix("get_pae_matrix=1")
+    with pytest.raises(ValueError, match="Invalid weight"):
+        parse_mix("get_annotations=-1")
+    with pytest.raises(ValueError, match="empty"):
+        parse_mix("get_annotations=0")
+
+
+def test_metrics_url_for():
+    """Test that metrics are looked up at the root of the MCP server"""
+    assert metrics_url_for("http://127.0.0.1:8000/mcp/") == "http://127.0.0.1:8000/metrics"
+
+
+def test_summarize_server():
+    """Test that gauges are summarized by their peak and counters by their increase"""
+    scrapes = [
+        (
+            elapsed,
+            parse_metrics(
+                "# TYPE alphafold_mcp_tool_calls_in_progress gauge\n"
+                f'alphafold_mcp_tool_calls_in_progress{{tool="get_annotations"}} {in_progress}\n'
+                f'alphafold_mcp_tool_calls_in_progress{{tool="get_uniprot_summary"}} {in_progress}\n'
+                f'alphafold_mcp_api_request_duration_seconds_count{{result="miss"}} {misses}\n'
+                f'alphafold_mcp_upstream_requests_total{{host="fake",status="503"}} {misses}\n'
+                f"process_cpu_seconds_total {cpu}\n"
+            ),
+        )
+        for elapsed, in_progress, misses, cpu in ((0.0, 0, 10, 1.0), (1.0, 3, 12, 1.25), (2.0, 0, 20, 2.0))
+    ]
+
+    server = summarize_server(scrapes)
+
+    assert server["cpu_utilization"] == 0.5
+    assert server["peak_tool_calls_in_progress"] == 6
+    assert server["api_requests"] == {"miss": 10}
+    assert server["upstream_requests"] == {"503": 10}
+    assert summarize_server(scrapes[:1]) is None
+
+
+@pytest.mark.asyncio
+async def test_run_load_test(mocker, monkeypatch):
+    """Test a load test of an in-process server answering from the fake API"""
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=FakeAlphaFoldAPI(error_rate=0.2, seed=0).app))
+    mocker.patch("mcp_alphafold.utils.http.get_http_client", return_value=client)
+    monkeypatch.setattr(alphafold, "_backend", RemoteBackend("http://fake/api"))
+    server = AlphaFoldMCP()
+    accessions = [f"Q{uuid.uuid4().hex[:5].upper()}" for _ in range(5)]
+
+    report = await run_load_test(
+        lambda: Client(server.app),
+        accessions,
+        sessions=3,
+        duration=0.5,
+        mix=parse_mix("get_alphafold_prediction"),
+        seed=0,
+    )
+    await client.aclose()
+
+    total = report["total"]
+    assert report["sessions"] == 3
+    assert report["session_errors"] == []
+    assert total["calls"] == report["tools"]["get_alphafold_prediction"]["calls"] > 0
+    assert total["ok"] + total["error"] + total["exception"] == total["calls"]
+    assert total["p50_ms"] <= total["p99_ms"] <= total["max_ms"]
+    assert report["server"] is None
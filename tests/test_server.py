@@ -1,10 +1,17 @@
+import asyncio
+import json
+import os
 import signal
+import tempfile
 
 import pytest
 from fastmcp import FastMCP
 
-from mcp_alphafold.server import AlphaFoldMCP
+from mcp_alphafold.server import AlphaFoldMCP, create_http_app
 from mcp_alphafold.settings import settings
+from mcp_alphafold.utils import http
+from mcp_alphafold.utils.circuit import get_circuit_breaker
+from mcp_alphafold.utils.throttle import get_process_limits, share_limits
 
 
 def test_init_with_defaults():
@@ -92,3 +99,133 @@ def test_signal_handlers_cleanup(mocker):
     # Verify handlers were restored
     mock_signal.assert_any_call(signal.SIGINT, original_sigint_handler)
     mock_signal.assert_any_call(signal.SIGTERM, original_sigterm_handler)
+
+
+@pytest.mark.asyncio
+async def test_lifespan_manages_http_client():
+    """Test that the shared HTTP client lives as long as the last session."""
+    await http.close_http_client()
+    server = AlphaFoldMCP()
+
+    async with server._lifespan(server.app):
+        # The client is opened by the first upstream request, not by the session
+        assert http._http_client is None
+        client = http.get_http_client()
+
+        async with server._lifespan(server.app):
+            assert http.get_http_client() is client
+
+        assert not client.is_closed
+
+    assert client.is_closed
+    assert http._http_client is None
+
+
+@pytest.mark.asyncio
+async def test_health_check():
+    """Test that the health route reports circuit states and cache stats."""
+    server = AlphaFoldMCP()
+    breaker = get_circuit_breaker("https://health.example.com/api")
+
+    response = await server._health_check(None)
+    body = json.loads(response.body)
+    assert body["status"] == "ok"
+    assert body["pid"] == os.getpid()
+    assert body["circuits"]["health.example.com"]["state"] == "closed"
+    assert set(body["cache"]) == {"memory", "disk"}
+
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    body = json.loads((await server._health_check(None)).body)
+    assert body["status"] == "degraded"
+    breaker.record_success()
+
+
+@pytest.mark.asyncio
+async def test_metrics():
+    """Test that the metrics route exposes the registered metrics."""
+    server = AlphaFoldMCP()
+
+    response = await server._metrics(None)
+    assert response.media_type.startswith("text/plain; version=0.0.4")
+    assert b"# TYPE alphafold_mcp_tool_calls_total counter" in response.body
+    assert any(route.path == "/metrics" for route in server.app._additional_http_routes)
+
+
+def test_run_workers(mocker, monkeypatch):
+    """Test that several workers are run by uvicorn's supervisor from the application factory."""
+    monkeypatch.setenv("SERVER_NAME", settings.SERVER_NAME)
+    monkeypatch.setenv("SERVER_WORKERS", "1")
+    monkeypatch.delenv("METRICS_DIR", raising=False)
+    mock_uvicorn_run = mocker.patch("mcp_alphafold.server.uvicorn.run")
+    mock_get_cache = mocker.patch("mcp_alphafold.server.get_cache")
+    mocker.patch("mcp_alphafold.server.close_cache")
+    server = AlphaFoldMCP(name="WorkersMCP")
+    mock_run = mocker.patch.object(server.app, "run")
+
+    server.run(transport="streamable-http", host="127.0.0.1", port=9001, workers=3)
+
+    mock_run.assert_not_called()
+    mock_uvicorn_run.assert_called_once()
+    args, kwargs = mock_uvicorn_run.call_args
+    assert args == ("mcp_alphafold.server:create_http_app",)
+    assert kwargs["factory"] is True
+    assert kwargs["workers"] == 3
+    assert (kwargs["host"], kwargs["port"]) == ("127.0.0.1", 9001)
+    assert os.environ["SERVER_NAME"] == "WorkersMCP"
+    assert os.environ["SERVER_WORKERS"] == "3"
+    assert os.environ["METRICS_DIR"].startswith(os.path.join(tempfile.gettempdir(), "alphafold-mcp-metrics-"))
+    assert not os.path.exists(os.environ["METRICS_DIR"])
+    mock_get_cache.assert_called_once()
+
+
+def test_create_http_app_splits_upstream_limits(monkeypatch):
+    """Test that the upstream limits are split between the workers."""
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 4)
+    monkeypatch.setattr(settings, "UPSTREAM_RATE_LIMIT", 10.0)
+    monkeypatch.setattr(settings, "UPSTREAM_BURST", 20)
+    monkeypatch.setattr(settings, "UPSTREAM_MAX_IN_FLIGHT", 0)
+
+    try:
+        create_http_app()
+        create_http_app()
+
+        assert get_process_limits() == (2.5, 5, 0)
+        assert (settings.UPSTREAM_RATE_LIMIT, settings.UPSTREAM_BURST) == (10.0, 20)
+    finally:
+        share_limits(1)
+
+
+@pytest.mark.asyncio
+async def test_stateless_http_app_keeps_http_client():
+    """Test that the HTTP client of a stateless application lives as long as the application."""
+    await http.close_http_client()
+    server = AlphaFoldMCP()
+    app = server.http_app(stateless=True)
+
+    assert server.app.settings.stateless_http
+    async with app.router.lifespan_context(app):
+        client = http.get_http_client()
+        assert server._active_sessions == 1
+
+        # A stateless request enters and leaves the lifespan
+        async with server._lifespan(server.app):
+            pass
+        assert not client.is_closed
+
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_http_app_saves_metric_snapshots(tmp_path, monkeypatch):
+    """Test that a worker application saves its metrics to the shared directory while it runs."""
+    monkeypatch.setattr("mcp_alphafold.utils.metrics._snapshot_dir", None)
+    monkeypatch.setattr(settings, "METRICS_DIR", str(tmp_path))
+    try:
+        app = create_http_app()
+
+        async with app.router.lifespan_context(app):
+            await asyncio.sleep(0)
+            assert (tmp_path / f"{os.getpid()}.json").exists()
+    finally:
+        share_limits(1)
@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+
+from mcp_alphafold.__main__ import parse_serve_args
+
+# Modules only needed by tool calls or by the other commands
+DEFERRED_MODULES = (
+    "typer",
+    "numpy",
+    "opentelemetry",
+    "diskcache",
+    "mcp_alphafold.cli",
+    "mcp_alphafold.fake_api",
+    "mcp_alphafold.loadtest",
+    "mcp_alphafold.tools.annotations",
+)
+# Heavy third-party modules, unless the MCP SDK imports them itself
+HEAVY_MODULES = ("numpy", "httpx", "diskcache", "opentelemetry")
+
+
+def loaded_modules(script: str) -> set:
+    """Return the modules loaded after running `script` in a new interpreter."""
+    script += "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))\n"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def test_parse_serve_args():
+    """Test that plain server launches are parsed and everything else is left to the CLI"""
+    assert parse_serve_args([]) == {}
+    assert parse_serve_args(["--transport", "stdio", "--port=8080", "--workers", "2"]) == {
+        "transport": "stdio",
+        "port": 8080,
+        "workers": 2,
+    }
+    assert parse_serve_args(["--help"]) is None
+    assert parse_serve_args(["warm", "accessions.txt"]) is None
+    assert parse_serve_args(["--port", "http"]) is None
+    assert parse_serve_args(["--host"]) is None
+
+
+def test_server_start_defers_heavy_imports():
+    """Test that creating the server does not import the modules of tool calls and other commands"""
+    modules = loaded_modules(
+        "import mcp_alphafold.__main__\nfrom mcp_alphafold.server import AlphaFoldMCP\nAlphaFoldMCP()"
+    )
+    assert "mcp_alphafold.tools.pae" in modules
+    assert [name for name in DEFERRED_MODULES if name in modules] == []
+
+
+def test_server_import_leaves_heavy_modules_unloaded():
+    """Test that importing the server module does not load heavy modules beyond those of the MCP SDK"""
+    sdk_modules = loaded_modules("import fastmcp")
+    modules = loaded_modules("import mcp_alphafold.server")
+
+    assert "mcp_alphafold.server" in modules
+    assert [name for name in HEAVY_MODULES if name in modules and name not in sdk_modules] == []
@@ -0,0 +1,87 @@
+import uuid
+
+import pytest
+from typer.testing import CliRunner
+
+from mcp_alphafold.cli import app
+from mcp_alphafold.settings import settings
+from mcp_alphafold.warm import read_accessions, warm_cache
+
+runner = CliRunner()
+
+
+def mock_endpoints(httpx_mock, accession):
+    httpx_mock.add_response(url=f"{settings.ALPHAFOLD_API_URL}/prediction/{accession}", json=[])
+    httpx_mock.add_response(url=f"{settings.ALPHAFOLD_API_URL}/uniprot/summary/{accession}.json", status_code=404)
+    httpx_mock.add_response(
+        url=f"{settings.ALPHAFOLD_API_URL}/annotations/{accession}?annotation_type=MUTAGEN", status_code=500
+    )
+
+
+@pytest.fixture
+def accessions():
+    # New accessions per test keep responses cached by earlier runs out of the way
+    return [f"P{uuid.uuid4().hex[:5].upper()}" for _ in range(2)]
+
+
+def test_read_accessions(tmp_path):
+    """Test that comments, headers, extra columns and duplicates are skipped"""
+    path = tmp_path / "accessions.csv"
+    path.write_text("# proteome\naccession,version\nP12345,4\n\nQ5VSL9\tF1\nP12345,4\n")
+
+    assert read_accessions(path) == ["P12345", "Q5VSL9"]
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_resumes(httpx_mock, accessions):
+    """Test that cached responses and definitive errors are not requested again"""
+    for accession in accessions:
+        mock_endpoints(httpx_mock, accession)
+    progress = []
+
+    first = await warm_cache(accessions, on_progress=lambda accession, statuses: progress.append(accession))
+    httpx_mock.reset()
+    second = await warm_cache(accessions, endpoints=["prediction", "summary"])
+
+    assert sorted(progress) == sorted(accessions)
+    assert first["prediction"]["fetched"] == 2
+    assert first["summary"]["fetched"] == 2
+    assert first["annotations"]["failed"] == 2
+    assert second == {
+        "prediction": {"cached": 2, "missing": 0, "fetched": 0, "failed": 0},
+        "summary": {"cached": 2, "missing": 0, "fetched": 0, "failed": 0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_dry_run(httpx_mock, accessions):
+    """Test that a dry run only reports missing responses"""
+    counts = await warm_cache(accessions, endpoints=["prediction"], dry_run=True)
+
+    assert counts == {"prediction": {"cached": 0, "missing": 2, "fetched": 0, "failed": 0}}
+    assert httpx_mock.get_requests() == []
+
+
+def test_warm_command(tmp_path, accessions):
+    """Test the warm subcommand in dry-run mode and invalid endpoints"""
+    path = tmp_path / "accessions.txt"
+    path.write_text("\n".join(accessions))
+
+    result = runner.invoke(app, ["warm", str(path), "--dry-run", "--endpoint", "summary"])
+    invalid = runner.invoke(app, ["warm", str(path), "--endpoint", "structures"])
+
+    assert result.exit_code == 0
+    assert "2 accessions" in result.output
+    assert "summary" in result.output and "missing" in result.output
+    assert invalid.exit_code == 2
+    assert "Unknown endpoints: structures" in invalid.output
+
+
+def test_run_without_subcommand(mocker):
+    """Test that the server still runs when no subcommand is given"""
+    mock_server = mocker.patch("mcp_alphafold.server.AlphaFoldMCP")
+
+    result = runner.invoke(app, ["--transport", "stdio"])
+
+    assert result.exit_code == 0
+    mock_server.return_value.run.assert_called_once_with(transport="stdio")
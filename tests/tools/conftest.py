@@ -0,0 +1,39 @@
+import pytest
+
+from mcp_alphafold.tools.models import EntrySummary, EntrySummaryResponse
+from mcp_alphafold.utils.store import FileStore
+
+
+@pytest.fixture
+def prediction_response():
+    return EntrySummaryResponse(
+        root=[
+            EntrySummary(
+                entryId="AF-P12345-F1",
+                uniprotAccession="P12345",
+                uniprotId="TEST_HUMAN",
+                uniprotDescription="Test protein",
+                taxId=9606,
+                organismScientificName="Homo sapiens",
+                uniprotStart=1,
+                uniprotEnd=100,
+                uniprotSequence="MVKVGVNG",
+                modelCreatedDate="2024-03-21",
+                latestVersion=4,
+                allVersions=[4],
+                bcifUrl="https://files.example.com/AF-P12345-F1-model_v4.bcif",
+                cifUrl="https://files.example.com/AF-P12345-F1-model_v4.cif",
+                pdbUrl="https://files.example.com/AF-P12345-F1-model_v4.pdb",
+                paeImageUrl="https://files.example.com/AF-P12345-F1-predicted_aligned_error_v4.png",
+                paeDocUrl="https://files.example.com/AF-P12345-F1-predicted_aligned_error_v4.json",
+            )
+        ]
+    )
+
+
+@pytest.fixture
+def file_store(tmp_path, mocker):
+    store = FileStore(str(tmp_path / "files"))
+    for module in ("files", "confidence", "pae"):
+        mocker.patch(f"mcp_alphafold.tools.{module}.get_file_store", return_value=store)
+    return store
@@ -1,9 +1,17 @@
+import asyncio
+import json
+
 import pytest
 
+from mcp_alphafold.settings import settings
 from mcp_alphafold.tools.alphafold import (
+    AlphaFoldBackend,
+    RemoteBackend,
     get_alphafold_prediction,
+    get_alphafold_predictions_batch,
     get_annotations,
     get_uniprot_summary,
+    iter_alphafold_predictions,
 )
 from mcp_alphafold.tools.models import (
     Annotation,
@@ -22,6 +30,47 @@ from mcp_alphafold.tools.models import (
     UniprotEntry,
     UniprotSummaryResponse,
 )
+from mcp_alphafold.utils.http import RequestError
+
+
+def make_entry_summary_response(accession: str) -> EntrySummaryResponse:
+    return EntrySummaryResponse(
+        root=[
+            EntrySummary(
+                entryId=f"AF-{accession}-F1",
+                uniprotAccession=accession,
+                uniprotId=f"{accession}_HUMAN",
+                uniprotDescription="Description of the protein",
+                taxId=9606,
+                organismScientificName="Homo sapiens",
+                uniprotStart=1,
+                uniprotEnd=100,
+                uniprotSequence="MKTAYIAKQRQISFVKSHFSRYAEHHHFAADHSF",
+                modelCreatedDate="2021-07-01",
+                latestVersion=4,
+                allVersions=[1, 2, 3, 4],
+                bcifUrl="http://example.com/bcif",
+                cifUrl="http://example.com/cif",
+                pdbUrl="http://example.com/pdb",
+                paeImageUrl="http://example.com/pae_image",
+                paeDocUrl="http://example.com/pae_doc",
+            )
+        ]
+    )
+
+
+def test_backend_requires_all_requests():
+    """Test that a backend must implement every request before it can be created."""
+
+    class PredictionsOnly(AlphaFoldBackend):
+        async def get_prediction(self, qualifier: str):
+            return None, None
+
+    with pytest.raises(TypeError):
+        AlphaFoldBackend()
+    with pytest.raises(TypeError):
+        PredictionsOnly()
+    assert isinstance(RemoteBackend(), AlphaFoldBackend)
 
 
 @pytest.mark.asyncio
@@ -51,7 +100,7 @@ async def test_get_alphafold_prediction_success(mocker):
     )
 
     mock_request_api = mocker.patch(
-        "mcp_alphafold.utils.http.request_api",
+        "mcp_alphafold.tools.alphafold.request_api",
         autospec=True,
     )
 
@@ -104,7 +153,7 @@ async def test_get_uniprot_summary_success(mocker):
     )
 
     mock_request_api = mocker.patch(
-        "mcp_alphafold.utils.http.request_api",
+        "mcp_alphafold.tools.alphafold.request_api",
         autospec=True,
     )
     mock_request_api.return_value = (mock_response, None)
@@ -119,7 +168,7 @@ async def test_get_uniprot_summary_success(mocker):
 async def test_get_annotations_success(mocker):
     """Test successful annotations retrieval"""
     mock_response = AnnotationResponse(
-        accession="P12345",
+        accession="Q5VSL9",
         id="TEST_HUMAN",
         sequence="MVKVGVNG",
         annotation=[
@@ -133,7 +182,7 @@ async def test_get_annotations_success(mocker):
     )
 
     mock_request_api = mocker.patch(
-        "mcp_alphafold.utils.http.request_api",
+        "mcp_alphafold.tools.alphafold.request_api",
         autospec=True,
     )
     mock_request_api.return_value = (mock_response, None)
@@ -143,3 +192,79 @@ async def test_get_annotations_success(mocker):
     assert isinstance(result, str)
 
     assert "Q5VSL9" in result
+
+
+@pytest.mark.asyncio
+async def test_iter_alphafold_predictions_bounded_and_streamed(mocker):
+    """Test that batch requests respect the concurrency limit and stream in completion order."""
+    delays = {"P1": 0.05, "P2": 0.01, "P3": 0.03}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_request_api(url, **kwargs):
+        nonlocal in_flight, max_in_flight
+        accession = url.rsplit("/", 1)[-1]
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(delays[accession])
+        in_flight -= 1
+        return make_entry_summary_response(accession), None
+
+    mock_request_api = mocker.patch("mcp_alphafold.tools.alphafold.request_api", side_effect=fake_request_api)
+
+    results = [item async for item in iter_alphafold_predictions(["P1", "P2", "P3", "P2"], max_concurrency=2)]
+
+    assert [accession for accession, _, _ in results] == ["P2", "P3", "P1"]
+    assert mock_request_api.call_count == 3
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency, expected", [(None, 3), (100, 3), (2, 2), (0, 1), (-5, 1)])
+async def test_iter_alphafold_predictions_clamps_concurrency(mocker, monkeypatch, max_concurrency, expected):
+    """Test that the requested concurrency is kept between 1 and the server's limit."""
+    monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 3)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_request_api(url, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return make_entry_summary_response(url.rsplit("/", 1)[-1]), None
+
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", side_effect=fake_request_api)
+    accessions = [f"P{index}" for index in range(6)]
+
+    results = [item async for item in iter_alphafold_predictions(accessions, max_concurrency=max_concurrency)]
+
+    assert len(results) == 6
+    assert max_in_flight == expected
+
+
+@pytest.mark.asyncio
+async def test_get_alphafold_predictions_batch_per_item_errors(mocker):
+    """Test that one failed accession does not fail the batch."""
+
+    async def fake_request_api(url, **kwargs):
+        accession = url.rsplit("/", 1)[-1]
+        if accession == "MISSING":
+            return None, RequestError(code=404, message="Not Found")
+        if accession == "BROKEN":
+            raise RuntimeError("boom")
+        return make_entry_summary_response(accession), None
+
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", side_effect=fake_request_api)
+    ctx = mocker.AsyncMock()
+
+    result = await get_alphafold_predictions_batch(["P12345", "MISSING", "BROKEN"], output_json=False, ctx=ctx)
+
+    assert result["P12345"][0]["uniprotAccession"] == "P12345"
+    assert result["MISSING"] == {"error": "Error 404: Not Found"}
+    assert result["BROKEN"] == {"error": "Error 500: boom"}
+    assert ctx.report_progress.await_count == 3
+    progress, total = ctx.report_progress.await_args_list[-1].args
+    assert (progress, total) == (3, 3)
+    assert json.loads(ctx.report_progress.await_args_list[0].kwargs["message"])
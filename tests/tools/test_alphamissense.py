@@ -0,0 +1,204 @@
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.alphamissense import (
+    AlphaMissenseStore,
+    get_alphamissense_genomic_variants,
+    get_alphamissense_variants,
+    parse_protein_variant,
+)
+from mcp_alphafold.tools.models import EntrySummary, EntrySummaryResponse
+from mcp_alphafold.utils.store import FileStore, StoredFile
+
+AM_URL = "https://files.example.com/AF-P12345-F1-aa-substitutions.csv"
+AM_HG38_URL = "https://files.example.com/AF-P12345-F1-hg38.csv"
+PROTEIN_CSV = b"protein_variant,am_pathogenicity,am_class\nM1A,0.3,LBen\nM1C,0.45,Amb\nV2E,0.9,LPath\nV2G,0.8,LPath\n"
+HG38_CSV = (
+    b"CHROM,POS,REF,ALT,genome,uniprot_id,transcript_id,protein_variant,am_pathogenicity,am_class\n"
+    b"chr9,1000,A,G,hg38,P12345,ENST1.1,M1V,0.2,LBen\n"
+    b"chr9,1000,A,T,hg38,P12345,ENST1.1,M1L,0.35,Amb\n"
+    b"chr9,1004,T,A,hg38,P12345,ENST1.1,V2E,0.9,LPath\n"
+)
+
+
+def make_stored(tmp_path, url, content, sha256="a" * 64):
+    path = tmp_path / f"{sha256}.csv"
+    path.write_bytes(content)
+    return StoredFile(url=url, sha256=sha256, size=len(content), path=str(path), fetched_at=0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AlphaMissenseStore(str(tmp_path / "alphamissense.sqlite3"))
+
+
+@pytest.fixture
+def am_source(mocker, httpx_mock, tmp_path):
+    accession = "P12345"
+    response = EntrySummaryResponse(
+        root=[
+            EntrySummary(
+                entryId=f"AF-{accession}-F1",
+                uniprotAccession=accession,
+                uniprotId="TEST_HUMAN",
+                uniprotDescription="Test protein",
+                taxId=9606,
+                organismScientificName="Homo sapiens",
+                uniprotStart=1,
+                uniprotEnd=2,
+                uniprotSequence="MV",
+                modelCreatedDate="2024-03-21",
+                latestVersion=4,
+                allVersions=[4],
+                bcifUrl="https://files.example.com/AF-P12345-F1-model_v4.bcif",
+                cifUrl="https://files.example.com/AF-P12345-F1-model_v4.cif",
+                pdbUrl="https://files.example.com/AF-P12345-F1-model_v4.pdb",
+                paeImageUrl="https://files.example.com/pae.png",
+                paeDocUrl="https://files.example.com/pae.json",
+                amAnnotationsUrl=AM_URL,
+                amAnnotationsHg38Url=AM_HG38_URL,
+            )
+        ]
+    )
+    mocker.patch("mcp_alphafold.tools.alphamissense.get_file_store", return_value=FileStore(str(tmp_path / "files")))
+    mocker.patch(
+        "mcp_alphafold.tools.alphamissense.get_alphamissense_store",
+        return_value=AlphaMissenseStore(str(tmp_path / "alphamissense.sqlite3")),
+    )
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(response, None))
+    httpx_mock.add_response(url=AM_URL, content=PROTEIN_CSV, is_optional=True)
+    httpx_mock.add_response(url=AM_HG38_URL, content=HG38_CSV, is_optional=True)
+    return accession
+
+
+def test_parse_protein_variant():
+    """Test splitting substitutions and rejecting malformed ones"""
+    assert parse_protein_variant("G250E") == ("G", 250, "E")
+    with pytest.raises(ValueError, match="Invalid protein variant"):
+        parse_protein_variant("G2x0E")
+
+
+def test_store_load_and_lookup(store, tmp_path):
+    """Test that protein and genomic files are indexed and queried"""
+    assert store.load("P12345", "protein", make_stored(tmp_path, AM_URL, PROTEIN_CSV)) == 4
+    assert store.load("P12345", "hg38", make_stored(tmp_path, AM_HG38_URL, HG38_CSV, "b" * 64)) == 3
+
+    assert store.protein_variants("P12345", variants=["V2E", "M1A"]) == [
+        {"variant": "M1A", "score": 0.3, "class": "LBen"},
+        {"variant": "V2E", "score": 0.9, "class": "LPath"},
+    ]
+    assert [row["variant"] for row in store.protein_variants("P12345", start=2, min_score=0.85)] == ["V2E"]
+    assert [row["protein_variant"] for row in store.genomic_variants("P12345", "hg38", "chr9", 1000)] == [
+        "M1V",
+        "M1L",
+    ]
+    assert store.genomic_variants("P12345", "hg38", "chr9", 1000, alt="T")[0]["transcript_id"] == "ENST1.1"
+    assert store.source("P12345", "hg38")["rows"] == 3
+
+
+def test_store_genomic_variants_of_accession(store, tmp_path):
+    """Test that genomic lookups only return the variants of the requested accession"""
+    other_csv = HG38_CSV.replace(b"P12345,ENST1.1", b"P67890,ENST2.1")
+    store.load("P12345", "hg38", make_stored(tmp_path, AM_HG38_URL, HG38_CSV, "b" * 64))
+    store.load("P67890", "hg38", make_stored(tmp_path, AM_HG38_URL, other_csv, "d" * 64))
+
+    assert [row["transcript_id"] for row in store.genomic_variants("P12345", "hg38", "chr9", 1004)] == ["ENST1.1"]
+    assert [row["transcript_id"] for row in store.genomic_variants("P67890", "hg38", "chr9", 1004)] == ["ENST2.1"]
+
+
+def test_store_concurrent_loads(store, tmp_path, monkeypatch):
+    """Test that concurrent loads of the same and other accessions all complete"""
+    monkeypatch.setattr(settings, "ALPHAMISSENSE_BATCH_SIZE", 1)
+    stored = make_stored(tmp_path, AM_URL, PROTEIN_CSV)
+    accessions = ["P12345", "P12345", "P67890", "Q11111"]
+
+    with ThreadPoolExecutor(max_workers=len(accessions)) as executor:
+        counts = list(executor.map(lambda accession: store.load(accession, "protein", stored), accessions))
+
+    assert counts == [4, 4, 4, 4]
+    assert len(store.protein_variants("Q11111")) == 4
+
+
+def test_store_reload(store, tmp_path):
+    """Test that an unchanged file is skipped and a changed one replaces the previous rows"""
+    store.load("P12345", "protein", make_stored(tmp_path, AM_URL, PROTEIN_CSV))
+    skipped = store.load("P12345", "protein", make_stored(tmp_path, AM_URL, b"not,a,csv\n"))
+    changed = store.load(
+        "P12345",
+        "protein",
+        make_stored(tmp_path, AM_URL, b"".join(PROTEIN_CSV.splitlines(keepends=True)[:2]), "c" * 64),
+    )
+
+    assert skipped == 4
+    assert changed == 1
+    assert store.protein_variants("P12345") == [{"variant": "M1A", "score": 0.3, "class": "LBen"}]
+
+
+def test_store_rejects_missing_columns(store, tmp_path, mocker):
+    """Test that files without the expected columns are rejected and closed"""
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    mocker.patch("mcp_alphafold.tools.alphamissense.open", side_effect=tracking_open, create=True)
+
+    with pytest.raises(ValueError, match="missing columns: am_pathogenicity"):
+        store.load("P12345", "protein", make_stored(tmp_path, AM_URL, b"protein_variant,am_class\nM1A,LBen\n"))
+    assert len(opened) == 1
+    assert opened[0].closed
+
+
+@pytest.mark.asyncio
+async def test_get_alphamissense_variants(am_source, httpx_mock):
+    """Test that variants are answered from the local store after the first download"""
+    first = json.loads(await get_alphamissense_variants(am_source, min_score=0.5))
+    second = await get_alphamissense_variants(am_source, variants=["M1C"], output_json=False)
+
+    assert first == {
+        "accession": am_source,
+        "variants": [
+            {"variant": "V2E", "score": 0.9, "class": "LPath"},
+            {"variant": "V2G", "score": 0.8, "class": "LPath"},
+        ],
+        "truncated": False,
+    }
+    assert second["variants"] == [{"variant": "M1C", "score": 0.45, "class": "Amb"}]
+    assert len(httpx_mock.get_requests(url=AM_URL)) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_alphamissense_variants_too_many(am_source, monkeypatch):
+    """Test that lookups of more variants than ALPHAMISSENSE_MAX_VARIANTS are rejected"""
+    monkeypatch.setattr(settings, "ALPHAMISSENSE_MAX_VARIANTS", 2)
+
+    result = await get_alphamissense_variants(am_source, variants=["M1A", "M1C", "V2E"], output_json=False)
+
+    assert result == {"error": "Error 400: At most 2 variants can be looked up at once"}
+
+
+@pytest.mark.asyncio
+async def test_get_alphamissense_variants_locked_store(am_source, mocker):
+    """Test that a store locked by another process is reported as unavailable"""
+    mocker.patch.object(AlphaMissenseStore, "load", side_effect=sqlite3.OperationalError("database is locked"))
+
+    result = await get_alphamissense_variants(am_source, output_json=False)
+
+    assert result == {"error": "Error 503: AlphaMissense store is busy: database is locked"}
+
+
+@pytest.mark.asyncio
+async def test_get_alphamissense_genomic_variants(am_source):
+    """Test genomic lookups and errors for missing files and malformed variants"""
+    result = await get_alphamissense_genomic_variants(am_source, chrom="chr9", pos=1004, output_json=False)
+    missing = await get_alphamissense_genomic_variants(am_source, chrom="9", pos=1, genome="hg19", output_json=False)
+    invalid = await get_alphamissense_variants(am_source, variants=["1A"], output_json=False)
+
+    assert [row["protein_variant"] for row in result["variants"]] == ["V2E"]
+    assert missing == {"error": f"Error 404: No AlphaMissense hg19 annotations for {am_source}"}
+    assert invalid == {"error": "Error 400: Invalid protein variant: 1A"}
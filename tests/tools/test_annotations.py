@@ -0,0 +1,140 @@
+import json
+
+import numpy as np
+import pytest
+
+from mcp_alphafold.tools.alphafold import get_annotations
+from mcp_alphafold.tools.annotations import AnnotationTable, query_annotations
+from mcp_alphafold.tools.models import Annotation, AnnotationResponse, AnnotationType, Region
+from mcp_alphafold.utils.http import RequestError
+
+
+def make_annotation_response(accession="P12345"):
+    return AnnotationResponse(
+        accession=accession,
+        id="TEST_HUMAN",
+        sequence="MVKVGVNG",
+        annotation=[
+            Annotation(
+                type=AnnotationType.MUTAGEN,
+                description="AM score",
+                source_name="AFDB",
+                evidence="COMPUTATIONAL/PREDICTED",
+                regions=[Region(start=1, end=8, annotation_value=[0.1, 0.9, 0.3, 0.7, 0.2, 0.95, 0.4, 0.5])],
+            ),
+            Annotation(
+                type=AnnotationType.MUTAGEN,
+                description="AM max score",
+                source_name="AFDB",
+                evidence="COMPUTATIONAL/PREDICTED",
+                regions=[Region(start=2, end=3, annotation_value=[0.99, 0.6])],
+            ),
+        ],
+    )
+
+
+@pytest.fixture
+def table():
+    return AnnotationTable.from_response(make_annotation_response())
+
+
+def test_annotation_table_from_response(table):
+    """Test that regions are flattened into columns sorted by position"""
+    assert len(table) == 10
+    assert table.labels == ["AM score", "AM max score"]
+    assert table.position.tolist() == [1, 2, 2, 3, 3, 4, 5, 6, 7, 8]
+    assert table.substitution.tolist() == [0, 0, 1, 0, 1, 0, 0, 0, 0, 0]
+    assert table.score.dtype == np.float32
+    assert table.sources[0] == {
+        "type": "MUTAGEN",
+        "description": "AM score",
+        "source_name": "AFDB",
+        "evidence": "COMPUTATIONAL/PREDICTED",
+    }
+
+
+def test_query_annotations_range_and_threshold(table):
+    """Test filtering by residue range and minimum score"""
+    data = query_annotations(table, start=2, end=4, min_score=0.65)
+
+    assert data["total"] == 3
+    assert data["truncated"] is False
+    assert data["scores"] == [
+        {"position": 2, "residue": "V", "substitution": "AM score", "score": 0.9},
+        {"position": 2, "residue": "V", "substitution": "AM max score", "score": 0.99},
+        {"position": 4, "residue": "V", "substitution": "AM score", "score": 0.7},
+    ]
+
+
+def test_query_annotations_top_k(table):
+    """Test that top-k returns the highest scores, highest first"""
+    data = query_annotations(table, top_k=3)
+
+    assert [row["score"] for row in data["scores"]] == [0.99, 0.95, 0.9]
+    assert [row["position"] for row in data["scores"]] == [2, 6, 2]
+    assert data["total"] == 10
+
+
+def test_query_annotations_per_position(table):
+    """Test per-position aggregates and ranking positions by mean score"""
+    data = query_annotations(table, start=1, end=3, per_position=True)
+    ranked = query_annotations(table, per_position=True, top_k=2)
+
+    assert data["positions"][1] == {"position": 2, "residue": "V", "count": 2, "mean": 0.945, "min": 0.9, "max": 0.99}
+    assert [row["position"] for row in data["positions"]] == [1, 2, 3]
+    assert [row["position"] for row in ranked["positions"]] == [6, 2]
+
+
+def test_query_annotations_max_results(table):
+    """Test that results without top-k are capped and flagged as truncated"""
+    data = query_annotations(table, max_results=4)
+
+    assert len(data["scores"]) == 4
+    assert data["total"] == 10
+    assert data["truncated"] is True
+
+
+@pytest.mark.parametrize("per_position", [False, True])
+def test_query_annotations_top_k_is_capped(table, per_position):
+    """Test that top-k cannot return more than max_results rows"""
+    data = query_annotations(table, top_k=10**9, per_position=per_position, max_results=4)
+    uncapped = query_annotations(table, top_k=4, per_position=per_position, max_results=4)
+
+    assert len(data["positions" if per_position else "scores"]) == 4
+    assert data["truncated"] is True
+    assert uncapped["truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_annotations_caches_table(mocker):
+    """Test that the columnar table is built once per accession and annotation type"""
+    accession = "P12345"
+    mock_request_api = mocker.patch(
+        "mcp_alphafold.tools.alphafold.request_api",
+        return_value=(make_annotation_response(accession), None),
+    )
+
+    first = json.loads(await get_annotations(accession, top_k=1))
+    second = await get_annotations(accession, start=6, end=6, output_json=False)
+
+    assert first["accession"] == accession
+    assert first["scores"] == [{"position": 2, "residue": "V", "substitution": "AM max score", "score": 0.99}]
+    assert second["scores"] == [{"position": 6, "residue": "V", "substitution": "AM score", "score": 0.95}]
+    assert mock_request_api.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_annotations_errors(mocker):
+    """Test that upstream errors and invalid arguments are reported"""
+    mocker.patch(
+        "mcp_alphafold.tools.alphafold.request_api",
+        return_value=(None, RequestError(code=404, message="Not Found")),
+    )
+
+    assert await get_annotations("XXXXXX", output_json=False) == {"error": "Error 404: Not Found"}
+    assert await get_annotations("XXXXXX", top_k=0, output_json=False) == {
+        "error": "Error 400: top_k must be at least 1"
+    }
+    assert await get_annotations("XXXXXX", top_k=501, output_json=False) == {
+        "error": "Error 400: top_k must be at most 500"
+    }
@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+import pytest
+
+from mcp_alphafold.tools.confidence import find_segments, get_plddt_summary, summarize_plddt
+
+CIF_URL = "https://files.example.com/AF-P12345-F1-model_v4.cif"
+PLDDT = [30.0] * 6 + [95.0] * 10 + [60.0] * 2 + [80.0] * 4
+
+
+def make_mmcif(plddt):
+    lines = [
+        "data_AF-P12345-F1",
+        "#",
+        "loop_",
+        "_atom_site.group_PDB",
+        "_atom_site.id",
+        "_atom_site.label_atom_id",
+        "_atom_site.label_comp_id",
+        "_atom_site.Cartn_x",
+        "_atom_site.Cartn_y",
+        "_atom_site.Cartn_z",
+        "_atom_site.B_iso_or_equiv",
+        "_atom_site.auth_seq_id",
+        "_atom_site.auth_asym_id",
+    ]
+    for i, value in enumerate(plddt):
+        lines.append(f"ATOM {2 * i + 1} N ALA {i}.0 0.0 0.0 {value:.2f} {i + 1} A")
+        lines.append(f"ATOM {2 * i + 2} CA ALA {i}.5 0.0 0.0 {value:.2f} {i + 1} A")
+    lines.append("#")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def test_find_segments():
+    """Test that runs are split at mask changes and numbering gaps, and short runs are dropped"""
+    residue_numbers = np.array([1, 2, 3, 4, 10, 11, 12, 13])
+    plddt = np.array([90, 92, 40, 94, 96, 98, 91, 93], dtype=np.float32)
+
+    segments = find_segments(residue_numbers, plddt, plddt >= 70, min_length=2)
+
+    assert [(s.start, s.end, s.length) for s in segments] == [(1, 2, 2), (10, 13, 4)]
+    assert segments[0].meanPlddt == 91.0
+    assert find_segments(residue_numbers, plddt, plddt > 100) == []
+
+
+def test_summarize_plddt():
+    """Test band fractions, histogram and segments of a pLDDT profile"""
+    plddt = np.array(PLDDT, dtype=np.float32)
+    residue_numbers = np.arange(1, len(plddt) + 1)
+
+    summary = summarize_plddt(residue_numbers, plddt, bins=4, min_segment_length=3)
+
+    assert summary["residues"] == 22
+    assert summary["bands"] == {"veryHigh": 0.4545, "confident": 0.1818, "low": 0.0909, "veryLow": 0.2727}
+    assert summary["histogram"] == {"edges": [0.0, 25.0, 50.0, 75.0, 100.0], "counts": [0, 6, 2, 14]}
+    assert [(s.start, s.end) for s in summary["highConfidenceSegments"]] == [(7, 16), (19, 22)]
+    assert [(s.start, s.end) for s in summary["lowConfidenceSegments"]] == [(1, 6)]
+
+
+@pytest.mark.asyncio
+async def test_get_plddt_summary_is_cached_per_model_version(mocker, httpx_mock, file_store, prediction_response):
+    """Test that the summary is computed from the mmCIF file once and then served from the cache"""
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(prediction_response, None))
+    httpx_mock.add_response(url=CIF_URL, content=make_mmcif(PLDDT))
+    fetch_spy = mocker.spy(file_store, "fetch")
+
+    first = json.loads(await get_plddt_summary("P12345", min_segment_length=3))
+    second = json.loads(await get_plddt_summary("P12345", min_segment_length=3))
+
+    assert first == second
+    assert fetch_spy.call_count == 1
+    assert first["entryId"] == prediction_response.root[0].entryId
+    assert first["modelVersion"] == 4
+    assert first["residues"] == 22
+    assert first["lowConfidenceSegments"] == [{"start": 1, "end": 6, "length": 6, "meanPlddt": 30.0}]
+
+
+@pytest.mark.asyncio
+async def test_get_plddt_summary_invalid_arguments():
+    """Test that invalid arguments are rejected before any request"""
+    too_few_bins = await get_plddt_summary("P12345", bins=0, output_json=False)
+    too_many_bins = await get_plddt_summary("P12345", bins=101, output_json=False)
+    crossed_thresholds = await get_plddt_summary("P12345", high_threshold=40, low_threshold=60, output_json=False)
+
+    assert too_few_bins == {"error": "Error 400: bins and min_segment_length must be at least 1"}
+    assert too_many_bins == {"error": "Error 400: bins must be at most 100"}
+    assert crossed_thresholds == {"error": "Error 400: high_threshold must not be below low_threshold"}
+
+
+@pytest.mark.asyncio
+async def test_get_plddt_summary_error(mocker, httpx_mock, file_store, prediction_response):
+    """Test that a failed model file download is reported as an error"""
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(prediction_response, None))
+    httpx_mock.add_response(url=CIF_URL, status_code=404)
+
+    result = await get_plddt_summary("P12345", output_json=False)
+
+    assert result == {"error": "Error 404: Not Found"}
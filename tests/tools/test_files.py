@@ -0,0 +1,110 @@
+import base64
+import json
+
+import pytest
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools.files import fetch_model_file, get_model_file, read_model_file, read_model_file_range
+from mcp_alphafold.utils.http import RequestError
+
+CONTENT = b"data_AF-P12345-F1\n#\n_entry.id AF-P12345-F1\n"
+
+
+@pytest.mark.asyncio
+async def test_fetch_model_file(mocker, httpx_mock, file_store, prediction_response):
+    """Test that the model file URL of the requested format is downloaded."""
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(prediction_response, None))
+    httpx_mock.add_response(url="https://files.example.com/AF-P12345-F1-model_v4.pdb", content=CONTENT)
+
+    stored, error = await fetch_model_file("P12345", "PDB")
+
+    assert error is None
+    assert stored.url.endswith(".pdb")
+    assert stored.size == len(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_fetch_model_file_unsupported_format():
+    """Test that unknown formats are rejected."""
+    stored, error = await fetch_model_file("P12345", "xyz")
+
+    assert stored is None
+    assert error.code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_model_file_with_slice(mocker, httpx_mock, file_store, prediction_response):
+    """Test that the tool returns metadata and the requested slice."""
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(prediction_response, None))
+    httpx_mock.add_response(url="https://files.example.com/AF-P12345-F1-model_v4.cif", content=CONTENT)
+
+    result = json.loads(await get_model_file("P12345", "cif", offset=0, length=17))
+
+    assert result["resource_uri"] == "alphafold://files/P12345/cif"
+    assert result["size"] == len(CONTENT)
+    assert result["content"] == "data_AF-P12345-F1"
+    assert "path" not in result
+
+
+@pytest.mark.asyncio
+async def test_get_model_file_binary_slice(mocker, httpx_mock, file_store, prediction_response):
+    """Test that BinaryCIF slices are base64-encoded."""
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(prediction_response, None))
+    httpx_mock.add_response(url="https://files.example.com/AF-P12345-F1-model_v4.bcif", content=b"\x00\x01\x02")
+
+    result = await get_model_file("P12345", "bcif", length=2, output_json=False)
+
+    assert base64.b64decode(result["content_base64"]) == b"\x00\x01"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "offset, length, message",
+    [(-1, 10, "offset must be at least 0"), (0, -1, "length must be at least 1"), (0, 0, "length must be at least 1")],
+)
+async def test_get_model_file_invalid_range(mocker, offset, length, message):
+    """Test that invalid ranges are rejected before the file is downloaded."""
+    fetch = mocker.patch("mcp_alphafold.tools.files.fetch_model_file")
+
+    result = await get_model_file("P12345", offset=offset, length=length, output_json=False)
+
+    assert result == {"error": f"Error 400: {message}"}
+    fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_read_model_file_range_negative_offset(mocker):
+    """Test that a resource range before the start of the file is rejected."""
+    fetch = mocker.patch("mcp_alphafold.tools.files.fetch_model_file")
+
+    with pytest.raises(ValueError, match="Error 400: offset must be at least 0"):
+        await read_model_file_range("P12345", "cif", -16)
+    fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_model_file_error(mocker):
+    """Test that prediction errors are reported."""
+    mocker.patch(
+        "mcp_alphafold.tools.alphafold.request_api", return_value=(None, RequestError(code=404, message="Not Found"))
+    )
+
+    result = await get_model_file("MISSING", output_json=False)
+
+    assert result == {"error": "Error 404: Not Found"}
+
+
+@pytest.mark.asyncio
+async def test_read_model_file(mocker, httpx_mock, file_store, prediction_response, monkeypatch):
+    """Test that the resource describes the file and its ranges, which return the file piece by piece."""
+    monkeypatch.setattr(settings, "FILE_READ_MAX_BYTES", 16)
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(prediction_response, None))
+    httpx_mock.add_response(url="https://files.example.com/AF-P12345-F1-model_v4.cif", content=CONTENT)
+
+    info = json.loads(await read_model_file("P12345", "cif"))
+
+    assert info["size"] == len(CONTENT)
+    assert info["ranges"][:2] == ["alphafold://files/P12345/cif/0", "alphafold://files/P12345/cif/16"]
+    chunks = [await read_model_file_range("P12345", "cif", int(uri.rsplit("/", 1)[1])) for uri in info["ranges"]]
+    assert all(len(chunk) <= 16 for chunk in chunks)
+    assert "".join(chunks) == CONTENT.decode("utf-8")
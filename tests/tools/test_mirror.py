@@ -0,0 +1,147 @@
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+from mcp_alphafold.tools.alphafold import LocalMirrorBackend, get_annotations, get_uniprot_summary
+from mcp_alphafold.tools.files import get_model_file
+from mcp_alphafold.tools.mirror import MirrorIndex, read_cif_header
+from mcp_alphafold.tools.pae import get_pae_matrix
+from mcp_alphafold.utils.store import FileStore
+
+MODEL_CIF = """data_AF-P12345-F1
+#
+_entry.id AF-P12345-F1
+#
+_entity.id 1
+_entity.pdbx_description 'Test protein kinase'
+_entity.type polymer
+#
+_entity_poly.entity_id 1
+_entity_poly.pdbx_seq_one_letter_code
+;MVKV
+GV
+;
+#
+loop_
+_ma_target_ref_db_details.db_accession
+_ma_target_ref_db_details.db_code
+_ma_target_ref_db_details.gene_name
+_ma_target_ref_db_details.ncbi_taxonomy_id
+_ma_target_ref_db_details.organism_scientific
+_ma_target_ref_db_details.seq_db_align_begin
+_ma_target_ref_db_details.seq_db_align_end
+P12345 TEST_HUMAN TST1 9606 "Homo sapiens" 1 6
+#
+loop_
+_pdbx_audit_revision_history.ordinal
+_pdbx_audit_revision_history.revision_date
+1 2022-06-01
+2 2024-03-21
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+ATOM 1
+"""
+PAE_JSON = json.dumps([{"predicted_aligned_error": [[0.25, 3.5], [4.0, 0.25]], "max_predicted_aligned_error": 31.75}])
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    root = tmp_path / "mirror"
+    (root / "other").mkdir(parents=True)
+    (root / "AF-P12345-F1-model_v3.cif").write_text(MODEL_CIF.replace("Test protein kinase", "Old model"))
+    (root / "AF-P12345-F1-model_v4.cif").write_text(MODEL_CIF)
+    (root / "AF-P12345-F1-predicted_aligned_error_v4.json.gz").write_bytes(gzip.compress(PAE_JSON.encode()))
+    (root / "README.txt").write_text("not indexed")
+    (root / "other" / "AF-Q99999-F1-model_v4.pdb").write_text("ATOM\n")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path, mirror):
+    return MirrorIndex(str(mirror), str(tmp_path / "mirror.sqlite3"))
+
+
+@pytest.fixture
+def local_backend(mocker, tmp_path, index):
+    backend = LocalMirrorBackend(index)
+    store = FileStore(str(tmp_path / "files"))
+    mocker.patch("mcp_alphafold.tools.alphafold.get_backend", return_value=backend)
+    mocker.patch("mcp_alphafold.tools.files.get_backend", return_value=backend)
+    mocker.patch("mcp_alphafold.tools.files.get_file_store", return_value=store)
+    mocker.patch("mcp_alphafold.tools.pae.get_file_store", return_value=store)
+    return backend
+
+
+def test_read_cif_header():
+    """Test reading single items, loops and text fields up to the coordinates"""
+    items = read_cif_header(io.StringIO(MODEL_CIF))
+
+    assert items["_entity.pdbx_description"] == ["Test protein kinase"]
+    assert items["_entity_poly.pdbx_seq_one_letter_code"] == ["MVKV\nGV"]
+    assert items["_ma_target_ref_db_details.organism_scientific"] == ["Homo sapiens"]
+    assert items["_pdbx_audit_revision_history.revision_date"] == ["2022-06-01", "2024-03-21"]
+    assert "_atom_site.group_PDB" not in items
+
+
+def test_refresh_is_incremental(index, mirror):
+    """Test that unchanged directories are skipped and changes are picked up"""
+    assert index.refresh() == {"scanned": 2, "skipped": 0, "indexed": 4, "removed": 0}
+    assert index.refresh() == {"scanned": 0, "skipped": 2, "indexed": 0, "removed": 0}
+
+    (mirror / "other" / "AF-Q88888-F1-model_v4.cif").write_text(MODEL_CIF)
+    assert index.refresh() == {"scanned": 1, "skipped": 1, "indexed": 1, "removed": 0}
+
+    for name in os.listdir(mirror / "other"):
+        os.remove(mirror / "other" / name)
+    os.rmdir(mirror / "other")
+    assert index.refresh() == {"scanned": 1, "skipped": 0, "indexed": 0, "removed": 2}
+
+
+def test_entries(index, mirror):
+    """Test that entries are synthesized from the latest version and the model header"""
+    index.refresh()
+
+    (entry,) = index.entries("P12345")
+
+    assert entry.entryId == "AF-P12345-F1"
+    assert entry.latestVersion == 4
+    assert entry.allVersions == [3, 4]
+    assert entry.uniprotId == "TEST_HUMAN"
+    assert entry.uniprotDescription == "Test protein kinase"
+    assert entry.uniprotSequence == "MVKVGV"
+    assert (entry.taxId, entry.uniprotStart, entry.uniprotEnd) == (9606, 1, 6)
+    assert entry.modelCreatedDate == "2022-06-01"
+    assert entry.cifUrl == (mirror / "AF-P12345-F1-model_v4.cif").as_uri()
+    assert entry.paeDocUrl.endswith("predicted_aligned_error_v4.json.gz")
+    assert entry.pdbUrl == ""
+    assert index.entries("P00000") == []
+
+
+@pytest.mark.asyncio
+async def test_local_backend_serves_files_offline(local_backend, mirror):
+    """Test that model and PAE files are read from the mirror without network access"""
+    model = await get_model_file("P12345", length=20, output_json=False)
+    pae = await get_pae_matrix("P12345", output_json=False)
+    missing = await get_model_file("P12345", file_format="pdb", output_json=False)
+
+    assert model["sha256"]
+    assert model["content"] == MODEL_CIF[:20]
+    assert pae["matrix"] == [[0.25, 3.5], [4.0, 0.25]]
+    assert missing == {"error": "Error 404: File is not available for this entry"}
+
+
+@pytest.mark.asyncio
+async def test_local_backend_errors(local_backend):
+    """Test unknown accessions and data that the mirror does not provide"""
+    unknown = await get_model_file("P00000", output_json=False)
+    annotations = await get_annotations("P12345", output_json=False)
+    summary = json.loads(await get_uniprot_summary("P12345"))
+
+    assert unknown == {"error": "Error 404: No AlphaFold model found for P00000 in the local mirror"}
+    assert annotations == {"error": "Error 501: Annotations are not available from the local mirror"}
+    assert summary == {"error": "Error 501: UniProt summaries are not available from the local mirror"}
@@ -54,6 +54,12 @@ def test_entry_summary_model():
     assert len(response.root) == 1
     assert response.root[0].entryId == "AF-P12345-F1"
 
+    # Test that shared responses cannot be modified
+    with pytest.raises(ValueError):
+        entry.entryId = "AF-P99999-F1"
+    with pytest.raises(ValueError):
+        response.root = []
+
 
 def test_uniprot_entry_model():
     """Test UniprotEntry model validation"""
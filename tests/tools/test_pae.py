@@ -0,0 +1,151 @@
+import asyncio
+import io
+import json
+
+import numpy as np
+import pytest
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.tools import pae
+from mcp_alphafold.tools.pae import PaeMatrix, encode_pae, get_pae_domain_stats, get_pae_matrix, parse_pae
+
+PAE_URL = "https://files.example.com/AF-P12345-F1-predicted_aligned_error_v4.json"
+SIZE = 12
+
+
+def make_matrix(size=SIZE):
+    # Low error within residues 1-6 and within 7-12, high error between them
+    matrix = np.full((size, size), 28.5, dtype=np.float32)
+    half = size // 2
+    matrix[:half, :half] = 2.25
+    matrix[half:, half:] = 4.75
+    np.fill_diagonal(matrix, 0.25)
+    return matrix
+
+
+def make_pae_json(matrix):
+    return json.dumps([{"predicted_aligned_error": matrix.tolist(), "max_predicted_aligned_error": 31.75}]).encode()
+
+
+@pytest.fixture
+def pae_source(mocker, httpx_mock, file_store, prediction_response):
+    mocker.patch("mcp_alphafold.tools.alphafold.request_api", return_value=(prediction_response, None))
+    httpx_mock.add_response(url=PAE_URL, content=make_pae_json(make_matrix()))
+    return file_store
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1024 * 1024])
+def test_parse_pae(chunk_size):
+    """Test that the matrix is parsed regardless of where block boundaries fall"""
+    matrix = np.random.default_rng(0).uniform(0, 31.75, size=(SIZE, SIZE)).round(2).astype(np.float32)
+
+    parsed = parse_pae(io.BytesIO(make_pae_json(matrix)), chunk_size=chunk_size)
+
+    np.testing.assert_array_equal(parsed, matrix)
+
+
+def test_parse_pae_flat_format():
+    """Test that the flat residue1/residue2/distance format of older files is parsed"""
+    matrix = make_matrix(3)
+    rows, cols = np.indices(matrix.shape)
+    content = json.dumps([
+        {
+            "residue1": (rows.ravel() + 1).tolist(),
+            "residue2": (cols.ravel() + 1).tolist(),
+            "distance": matrix.ravel().tolist(),
+            "max_predicted_aligned_error": 31.75,
+        }
+    ]).encode()
+
+    np.testing.assert_array_equal(parse_pae(io.BytesIO(content), chunk_size=16), matrix)
+
+
+def test_parse_pae_invalid():
+    """Test that missing, truncated and non-square matrices are rejected"""
+    with pytest.raises(ValueError, match="No PAE matrix"):
+        parse_pae(io.BytesIO(b'[{"max_predicted_aligned_error": 31.75}]'))
+    with pytest.raises(ValueError, match="Truncated"):
+        parse_pae(io.BytesIO(b'[{"predicted_aligned_error": [[0.25, 1.5], [1.5'))
+    with pytest.raises(ValueError, match="not a square number"):
+        parse_pae(io.BytesIO(b'[{"predicted_aligned_error": [[0.25, 1.5], [1.5]]}]'))
+
+
+@pytest.mark.parametrize("dtype", ["float16", "uint8"])
+def test_pae_matrix_round_trip(tmp_path, dtype):
+    """Test that stored matrices are memory-mapped and decoded to Å"""
+    matrix = make_matrix()
+    path = tmp_path / f"pae.{dtype}.npy"
+    np.save(path, encode_pae(matrix, dtype))
+
+    pae = PaeMatrix(path)
+
+    assert isinstance(pae.data, np.memmap)
+    assert pae.data.dtype == np.dtype(dtype)
+    assert pae.size == SIZE
+    np.testing.assert_array_equal(pae.block(slice(None), slice(None)), matrix)
+    assert pae.block_stats((1, 6), (7, 12)) == {"mean": 28.5, "median": 28.5, "min": 28.5, "max": 28.5}
+
+
+@pytest.mark.asyncio
+async def test_get_pae_matrix(pae_source):
+    """Test that a strided block is returned and the JSON is converted once"""
+    result = await get_pae_matrix("P12345", row_start=1, row_end=12, col_start=1, col_end=12, stride=6)
+    again = await get_pae_matrix("P12345", row_end=2, col_end=2, output_json=False)
+
+    data = json.loads(result)
+    assert data["size"] == SIZE
+    assert data["matrix"] == [[0.25, 28.5], [28.5, 0.25]]
+    assert again["matrix"] == [[0.25, 2.25], [2.25, 0.25]]
+    assert len(list((pae_source.directory / "pae").glob("*.npy"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_conversion(pae_source, mocker):
+    """Test that concurrent calls for the same PAE file convert it once"""
+    convert = mocker.spy(pae, "convert_pae")
+
+    results = await asyncio.gather(
+        *(get_pae_matrix("P12345", row_end=2, col_end=2, output_json=False) for _ in range(3))
+    )
+
+    assert [result["matrix"] for result in results] == [[[0.25, 2.25], [2.25, 0.25]]] * 3
+    assert convert.call_count == 1
+    assert [path.name for path in (pae_source.directory / "pae").iterdir()] == [convert.call_args.args[1].name]
+
+
+@pytest.mark.asyncio
+async def test_get_pae_matrix_rejects_large_blocks(pae_source, mocker):
+    """Test that blocks outside the matrix or above the cell limit are rejected"""
+    mocker.patch.object(settings, "PAE_MAX_SLICE_CELLS", 100)
+
+    too_large = await get_pae_matrix("P12345", output_json=False)
+    outside = await get_pae_matrix("P12345", row_end=13, output_json=False)
+    strided = await get_pae_matrix("P12345", stride=2, output_json=False)
+
+    assert too_large == {
+        "error": "Error 400: Block has 144 cells, more than 100; use a smaller range or a larger stride"
+    }
+    assert outside == {"error": "Error 400: Residue range 1-13 is outside 1-12"}
+    assert len(strided["matrix"]) == 6
+
+
+@pytest.mark.asyncio
+async def test_get_pae_domain_stats(pae_source):
+    """Test statistics within and between domains"""
+    result = await get_pae_domain_stats("P12345", domains=["1-6", "7-12"], output_json=False)
+
+    pairs = {(pair["aligned"], pair["scored"]): pair for pair in result["pairs"]}
+    assert len(pairs) == 4
+    assert pairs[("1-6", "7-12")]["mean"] == 28.5
+    assert pairs[("7-12", "7-12")]["min"] == 0.25
+    assert pairs[("7-12", "7-12")]["median"] == 4.75
+
+
+@pytest.mark.asyncio
+async def test_get_pae_domain_stats_invalid_domain(pae_source):
+    """Test that malformed and out-of-range domains are rejected"""
+    malformed = await get_pae_domain_stats("P12345", domains=["1-x"], output_json=False)
+    outside = await get_pae_domain_stats("P12345", domains=["5-20"], output_json=False)
+
+    assert malformed == {"error": "Error 400: Invalid residue range: 1-x"}
+    assert outside == {"error": "Error 400: Residue range 5-20 is outside 1-12"}
@@ -0,0 +1,119 @@
+import gzip
+import io
+
+import numpy as np
+import pytest
+
+from mcp_alphafold.tools.structure import parse_mmcif, parse_model_file, parse_pdb
+
+MMCIF = b"""data_AF-P12345-F1
+#
+_entry.id AF-P12345-F1
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_alt_id
+_atom_site.label_comp_id
+_atom_site.label_asym_id
+_atom_site.label_entity_id
+_atom_site.label_seq_id
+_atom_site.pdbx_PDB_ins_code
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+_atom_site.occupancy
+_atom_site.B_iso_or_equiv
+_atom_site.pdbx_formal_charge
+_atom_site.auth_seq_id
+_atom_site.auth_comp_id
+_atom_site.auth_asym_id
+_atom_site.auth_atom_id
+_atom_site.pdbx_PDB_model_num
+ATOM 1 N N   . MET A 1 1 ? -29.088 -2.542 12.095 1.0 37.75 ? 1 MET A N   1
+ATOM 2 C CA  . MET A 1 1 ? -28.262 -3.680 11.655 1.0 37.75 ? 1 MET A CA  1
+ATOM 3 N N   . GLY A 1 2 ? -26.101 -4.930  9.871 1.0 91.20 ? 2 GLY A N   1
+ATOM 4 C CA  . GLY A 1 2 ? -24.612 -5.001  9.500 1.0 91.20 ? 2 GLY A CA  1
+#
+loop_
+_ma_qa_metric_local.label_asym_id
+_ma_qa_metric_local.metric_value
+A 37.75
+A 91.20
+#
+"""
+
+PDB = b"""HEADER    PREDICTED MODEL
+ATOM      1  N   MET A   1     -29.088  -2.542  12.095  1.00 37.75           N
+ATOM      2  CA  MET A   1     -28.262  -3.680  11.655  1.00 37.75           C
+ATOM      3  N   GLY A   2     -26.101  -4.930   9.871  1.00 91.20           N
+ATOM      4  CA  GLY A   2     -24.612  -5.001   9.500  1.00 91.20           C
+TER       5      GLY A   2
+END
+"""
+
+
+@pytest.mark.parametrize("chunk_size", [16, 64, 1024 * 1024])
+def test_parse_mmcif(chunk_size):
+    """Test that the _atom_site loop is parsed into arrays regardless of the block size"""
+    model = parse_mmcif(io.BytesIO(MMCIF), chunk_size=chunk_size)
+
+    assert model.n_atoms == 4
+    assert model.coords.dtype == np.float32
+    np.testing.assert_allclose(model.coords[1], [-28.262, -3.680, 11.655], rtol=1e-6)
+    assert model.atom_name.tolist() == [b"N", b"CA", b"N", b"CA"]
+    assert model.residue_name.tolist() == [b"MET", b"MET", b"GLY", b"GLY"]
+    assert model.chain_id.tolist() == [b"A"] * 4
+
+    residues, plddt = model.residue_plddt()
+    assert residues.tolist() == [1, 2]
+    np.testing.assert_allclose(plddt, [37.75, 91.20], rtol=1e-6)
+
+
+@pytest.mark.parametrize("chunk_size", [16, 1024 * 1024])
+def test_parse_pdb(chunk_size):
+    """Test that ATOM records are parsed into arrays regardless of the block size"""
+    model = parse_pdb(io.BytesIO(PDB), chunk_size=chunk_size)
+
+    assert model.n_atoms == 4
+    np.testing.assert_allclose(model.ca_coords(), [[-28.262, -3.680, 11.655], [-24.612, -5.001, 9.500]], rtol=1e-6)
+    assert model.residue_number.tolist() == [1, 1, 2, 2]
+    assert model.residue_name.tolist() == [b"MET", b"MET", b"GLY", b"GLY"]
+    np.testing.assert_allclose(model.b_factor, [37.75, 37.75, 91.20, 91.20], rtol=1e-6)
+
+
+def test_parse_pdb_reads_first_model_only():
+    """Test that only the first model of a multi-model PDB file is read"""
+    lines = PDB.splitlines(keepends=True)
+    multi_model = b"MODEL        1\n" + b"".join(lines[1:5]) + b"ENDMDL\nMODEL        2\n" + b"".join(lines[1:5])
+
+    model = parse_pdb(io.BytesIO(multi_model))
+
+    assert model.n_atoms == 4
+
+
+def test_parse_mmcif_missing_items():
+    """Test that a loop without coordinate items is rejected"""
+    with pytest.raises(ValueError, match="Cartn_x"):
+        parse_mmcif(io.BytesIO(MMCIF.replace(b"_atom_site.Cartn_x", b"_atom_site.other")))
+
+
+def test_parse_mmcif_without_atom_site():
+    """Test that a file without an _atom_site loop is rejected"""
+    with pytest.raises(ValueError, match="No _atom_site loop"):
+        parse_mmcif(io.BytesIO(b"data_empty\n#\n"))
+
+
+def test_parse_model_file_dispatches_on_extension(tmp_path):
+    """Test that the parser is chosen from the file extension, with gzip support"""
+    cif_path = tmp_path / "model.cif.gz"
+    cif_path.write_bytes(gzip.compress(MMCIF))
+    pdb_path = tmp_path / "model.pdb"
+    pdb_path.write_bytes(PDB)
+
+    assert parse_model_file(cif_path).n_atoms == 4
+    assert parse_model_file(pdb_path).n_atoms == 4
+    with pytest.raises(ValueError, match="Unsupported"):
+        parse_model_file(tmp_path / "model.bcif")
@@ -0,0 +1,82 @@
+import time
+
+from mcp_alphafold.utils.circuit import CircuitBreaker, CircuitState, get_circuit_breaker, get_circuit_states
+
+
+def test_circuit_opens_after_threshold():
+    """Test that consecutive failures open the circuit."""
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_failures():
+    """Test that a success resets the consecutive failure count."""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_single_trial():
+    """Test that a half-open circuit lets one trial request through."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_half_open_trial_success_closes():
+    """Test that a successful trial closes the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_half_open_trial_failure_reopens():
+    """Test that a failed trial opens the circuit again."""
+    breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=0.05)
+    for _ in range(5):
+        breaker.record_failure()
+    time.sleep(0.06)
+
+    breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_disabled_circuit_never_opens():
+    """Test that a zero threshold disables the breaker."""
+    breaker = CircuitBreaker(failure_threshold=0, recovery_timeout=60)
+    for _ in range(100):
+        breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_get_circuit_states():
+    """Test that breakers are shared per host and reported by host."""
+    breaker = get_circuit_breaker("https://circuit.example.com/api/prediction/P12345")
+
+    assert get_circuit_breaker("https://circuit.example.com/api/other") is breaker
+    assert get_circuit_states()["circuit.example.com"] == {"state": "closed", "failures": 0, "retry_in": None}
@@ -0,0 +1,63 @@
+import json
+import zlib
+
+import pytest
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils import compression
+from mcp_alphafold.utils.compression import COMPRESSION_MAGIC, compress_value, decompress_value, get_codec
+from mcp_alphafold.utils.http import cache_response, get_cache, get_cache_entry
+
+CONTENT = json.dumps([{"position": i, "score": 0.5, "description": "AlphaMissense"} for i in range(200)])
+
+
+@pytest.fixture(autouse=True)
+def compression_settings(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_COMPRESSION", "auto")
+    monkeypatch.setattr(settings, "CACHE_COMPRESSION_MIN_SIZE", 1024)
+
+
+def test_compress_round_trip():
+    """Test that large values are compressed with a marker and decompressed again."""
+    value = compress_value(CONTENT)
+
+    assert isinstance(value, bytes)
+    assert value.startswith(COMPRESSION_MAGIC)
+    assert len(value) < len(CONTENT) / 5
+    assert decompress_value(value) == CONTENT
+
+
+def test_small_and_uncompressed_values(monkeypatch):
+    """Test that small values and values written without compression are stored and read as they are."""
+    assert compress_value("short") == "short"
+    assert decompress_value(CONTENT) == CONTENT
+
+    monkeypatch.setattr(settings, "CACHE_COMPRESSION", "none")
+    assert compress_value(CONTENT) == CONTENT
+
+
+def test_zstd_falls_back_to_zlib(monkeypatch):
+    """Test the codec choice when the zstandard package is missing."""
+    monkeypatch.setattr(compression, "zstandard", None)
+    monkeypatch.setattr(settings, "CACHE_COMPRESSION", "zstd")
+
+    assert get_codec() == "zlib"
+    assert compress_value(CONTENT)[len(COMPRESSION_MAGIC) : len(COMPRESSION_MAGIC) + 1] == b"d"
+    # Values written with zstd cannot be read without the package and count as misses
+    assert decompress_value(COMPRESSION_MAGIC + b"z" + b"\x28\xb5\x2f\xfd") is None
+
+
+def test_corrupt_value():
+    """Test that a corrupt compressed value is treated as a miss."""
+    assert decompress_value(COMPRESSION_MAGIC + b"d" + zlib.compress(b"data")[:-2]) is None
+
+
+def test_cache_response_is_compressed_on_disk():
+    """Test that responses are compressed on disk and read back transparently."""
+    cache_key = "test-compressed-response"
+
+    cache_response(cache_key, CONTENT, cache_ttl=60, memory=False)
+    content, _ = get_cache_entry(cache_key, memory=False)
+
+    assert get_cache().get(cache_key).startswith(COMPRESSION_MAGIC)
+    assert content == CONTENT
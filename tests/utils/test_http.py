@@ -1,19 +1,49 @@
+import asyncio
 import json
 import os
+import time
+import uuid
+from typing import List
 
 import httpx
 import pytest
-from diskcache import Cache
+from diskcache import Cache, FanoutCache
 from pydantic import BaseModel
 
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils import http
+from mcp_alphafold.utils.circuit import get_circuit_breaker
 from mcp_alphafold.utils.http import (
+    MODEL_SIZE_SAMPLE_MIN,
     RequestError,
+    cache_error,
     cache_response,
     call_http,
+    close_cache,
+    close_http_client,
+    estimate_model_size,
     generate_cache_key,
+    generate_legacy_cache_keys,
     get_cache,
+    get_cache_entry,
+    get_cache_info,
     get_cache_response,
+    get_cache_stats,
+    get_http_client,
+    get_memory_cache,
+    get_model_size,
+    normalize_request,
     parse_response,
+    prune_cache,
+    request_api,
+    vacuum_cache,
+)
+from mcp_alphafold.utils.metrics import (
+    API_DURATION,
+    INFLIGHT_FETCHES,
+    UPSTREAM_DURATION,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_REQUESTS,
 )
 
 
@@ -23,6 +53,11 @@ class ResponseModel(BaseModel):
     value: int
 
 
+@pytest.mark.skip(reason="Model class, not a test class")
+class ListModel(BaseModel):
+    names: List[str]
+
+
 @pytest.mark.parametrize(
     "status_code, content, model, expected_result, expected_error",
     [
@@ -83,52 +118,81 @@ def test_parse_response(status_code, content, model, expected_result, expected_e
 
 
 @pytest.mark.parametrize(
-    "method, url, params, expected_prefix",
+    "method, url, params",
     [
         # Test basic GET request
-        (
-            "GET",
-            "https://api.example.com",
-            {"key": "value"},
-            "GET:https://api.example.com:{",
-        ),
+        ("GET", "https://api.example.com", {"key": "value"}),
         # Test POST request
-        (
-            "post",  # Test case-insensitive handling
-            "https://api.example.com/data",
-            {"id": 123},
-            "POST:https://api.example.com/data:{",
-        ),
+        ("post", "https://api.example.com/data", {"id": 123}),
         # Test with empty params
-        (
-            "GET",
-            "https://api.example.com",
-            {},
-            "GET:https://api.example.com:{}",
-        ),
+        ("GET", "https://api.example.com", {}),
         # Test with nested params
-        (
-            "GET",
-            "https://api.example.com",
-            {"filter": {"name": "test", "value": 42}},
-            "GET:https://api.example.com:{",
-        ),
+        ("POST", "https://api.example.com", {"filter": {"name": "test", "value": 42}}),
     ],
 )
-def test_generate_cache_key(method, url, params, expected_prefix):
+def test_generate_cache_key(method, url, params):
     """Test cache key generation with different inputs."""
     cache_key = generate_cache_key(method, url, params)
 
-    # Verify it's a valid SHA-256 hash (64 characters, hexadecimal)
-    assert len(cache_key) == 64
+    # Verify it's a 128-bit BLAKE2b digest (32 characters, hexadecimal)
+    assert len(cache_key) == 32
     assert all(c in "0123456789abcdef" for c in cache_key)
 
     # Verify the key is deterministic (same input produces same output)
     assert cache_key == generate_cache_key(method, url, params)
 
-    # Verify the key source format
-    key_source = f"{method.upper()}:{url}:{params}"
-    assert key_source.startswith(expected_prefix)
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        # Method case
+        (("get", "https://api.example.com/a", None), ("GET", "https://api.example.com/a", None)),
+        # Scheme and host case, default port
+        (("GET", "HTTPS://API.Example.com:443/a", None), ("GET", "https://api.example.com/a", None)),
+        # Parameter order
+        (
+            ("GET", "https://api.example.com/a", {"b": 2, "a": 1}),
+            ("GET", "https://api.example.com/a", {"a": 1, "b": 2}),
+        ),
+        # Query string or parameters
+        (("GET", "https://api.example.com/a?b=2&a=1", None), ("GET", "https://api.example.com/a", {"a": 1, "b": 2})),
+        # Empty parameters
+        (("GET", "https://api.example.com/a", {}), ("GET", "https://api.example.com/a", None)),
+        # POST body key order
+        (
+            ("POST", "https://api.example.com/a", {"y": [1, 2], "x": {"d": 1, "c": 2}}),
+            ("POST", "https://api.example.com/a", {"x": {"c": 2, "d": 1}, "y": [1, 2]}),
+        ),
+    ],
+)
+def test_generate_cache_key_normalizes_equivalent_requests(first, second):
+    """Test that equivalent requests share a cache key."""
+    assert generate_cache_key(*first) == generate_cache_key(*second)
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        (("GET", "https://api.example.com/a", None), ("POST", "https://api.example.com/a", None)),
+        (("GET", "https://api.example.com/a", {"a": 1}), ("GET", "https://api.example.com/a", {"a": 2})),
+        (("GET", "https://api.example.com/a", {"a": 1}), ("POST", "https://api.example.com/a", {"a": 1})),
+        (("GET", "https://api.example.com/a", None), ("GET", "https://api.example.com/A", None)),
+        (("GET", "https://api.example.com:8443/a", None), ("GET", "https://api.example.com/a", None)),
+    ],
+)
+def test_generate_cache_key_distinguishes_requests(first, second):
+    """Test that different requests get different cache keys."""
+    assert generate_cache_key(*first) != generate_cache_key(*second)
+
+
+def test_normalize_request():
+    """Test the canonical form of a request."""
+    assert normalize_request("get", "HTTPS://Api.Example.com:443/p?z=1#frag", {"a": True, "b": [2, 1]}) == (
+        "GET https://api.example.com/p?a=true&b=1&b=2&z=1"
+    )
+    assert normalize_request("POST", "https://api.example.com/p", {"b": 1, "a": 2}) == (
+        'POST https://api.example.com/p {"a":2,"b":1}'
+    )
 
 
 @pytest.fixture
@@ -145,7 +209,7 @@ def test_get_cache_initialization(mock_cache_dir):
     """Test cache initialization."""
     # First call should create cache
     cache = get_cache()
-    assert isinstance(cache, Cache)
+    assert isinstance(cache, FanoutCache)
     assert os.path.exists(mock_cache_dir)
 
     # Second call should return same cache instance
@@ -153,6 +217,73 @@ def test_get_cache_initialization(mock_cache_dir):
     assert cache is cache2
 
 
+def test_cache_settings(isolated_cache, monkeypatch):
+    """Test that the shard count, size limit and eviction policy come from the settings."""
+    monkeypatch.setattr(settings, "CACHE_SHARDS", 2)
+    monkeypatch.setattr(settings, "CACHE_SIZE_LIMIT", 1024 * 1024)
+    monkeypatch.setattr(settings, "CACHE_EVICTION_POLICY", "least-frequently-used")
+    monkeypatch.setattr(settings, "CACHE_STATISTICS", True)
+
+    get_cache().set("key", "value")
+    get_cache().get("key")
+    get_cache().get("missing")
+    info = get_cache_info()
+
+    assert sorted(os.listdir(isolated_cache)) == ["000", "001"]
+    assert get_cache()._shards[0].size_limit == 512 * 1024
+    assert get_cache()._shards[0].eviction_policy == "least-frequently-used"
+    assert info["shards"] == 2
+    assert info["entries"] == 1
+    assert (info["hits"], info["misses"]) == (1, 1)
+    assert info["volume"] == sum(shard["volume"] for shard in info["shard_stats"])
+
+
+def test_cache_imports_single_database(isolated_cache):
+    """Test that entries of the single database used before sharding are imported and the database removed."""
+    legacy = Cache(str(isolated_cache))
+    legacy.set("small", "value", expire=3600, tag=123.0)
+    legacy.set("large", "x" * 100_000)
+    legacy.set("expired", "value", expire=0.01)
+    legacy.close()
+    time.sleep(0.02)
+
+    cache = get_cache()
+
+    assert cache.get("small", expire_time=True, tag=True) == ("value", pytest.approx(time.time() + 3600, abs=5), 123.0)
+    assert cache.get("large") == "x" * 100_000
+    assert cache.get("expired") is None
+    assert sorted(os.listdir(isolated_cache)) == [f"{i:03d}" for i in range(settings.CACHE_SHARDS)]
+
+
+def test_cache_moves_entries_after_shard_change(isolated_cache, monkeypatch):
+    """Test that entries are moved to the new shards when the shard count changes."""
+    monkeypatch.setattr(settings, "CACHE_SHARDS", 2)
+    for i in range(10):
+        get_cache().set(f"key{i}", i)
+    close_cache()
+
+    monkeypatch.setattr(settings, "CACHE_SHARDS", 3)
+
+    assert [get_cache().get(f"key{i}") for i in range(10)] == list(range(10))
+    assert sorted(os.listdir(isolated_cache)) == ["000", "001", "002"]
+
+
+def test_prune_and_vacuum_cache(isolated_cache):
+    """Test removing expired entries, clearing the cache and vacuuming the shards."""
+    cache = get_cache()
+    for i in range(10):
+        cache.set(f"key{i}", "x" * 100_000)
+    # Writes also remove expired entries, so the expiring one is written last
+    cache.set("expired", "value", expire=0.01)
+    time.sleep(0.02)
+
+    assert prune_cache() == {"expired": 1, "evicted": 0}
+    assert prune_cache(clear=True) == {"cleared": 10}
+    volume = vacuum_cache()
+    assert volume["after"] <= volume["before"]
+    assert len(get_cache()) == 0
+
+
 def test_cache_operations(mock_cache_dir):
     """Test storing and retrieving values from cache."""
     # Test data
@@ -184,6 +315,48 @@ def test_cache_expiration(mock_cache_dir):
     assert get_cache_response(key) is None
 
 
+def test_cache_stale_entries(mock_cache_dir):
+    """Test that stale entries are only returned when allowed."""
+    key = "stale_key"
+    content = "stale_content"
+
+    cache_response(key, content, 0, memory=False)
+
+    assert get_cache_response(key) is None
+    stale_content, stale_at = get_cache_entry(key, allow_stale=True)
+    assert stale_content == content
+    assert stale_at <= time.time()
+
+
+def test_cache_memory_tier(mock_cache_dir):
+    """Test that disk hits are promoted to the memory tier."""
+    key = "tiered_key"
+    content = "tiered_content"
+
+    cache_response(key, content, 3600)
+    get_memory_cache().delete(key)
+
+    disk_hits = get_cache_stats()["disk"]["hits"]
+    assert get_cache_response(key) == content
+    assert get_cache_stats()["disk"]["hits"] == disk_hits + 1
+
+    memory_hits = get_cache_stats()["memory"]["hits"]
+    assert get_cache_response(key) == content
+    assert get_cache_stats()["memory"]["hits"] == memory_hits + 1
+    assert get_cache_stats()["disk"]["hits"] == disk_hits + 1
+
+
+def test_cache_stats_misses(mock_cache_dir):
+    """Test that a miss is counted in both tiers."""
+    stats = get_cache_stats()
+
+    assert get_cache_response("missing_key") is None
+
+    new_stats = get_cache_stats()
+    assert new_stats["memory"]["misses"] == stats["memory"]["misses"] + 1
+    assert new_stats["disk"]["misses"] == stats["disk"]["misses"] + 1
+
+
 def test_cache_different_types(mock_cache_dir):
     """Test caching different types of content."""
     test_cases = [
@@ -256,6 +429,63 @@ async def test_call_http_network_error(httpx_mock):
     assert status == 599
 
 
+@pytest.mark.asyncio
+async def test_call_http_retries_throttled_responses(httpx_mock):
+    """Test that 429 and 503 responses are retried after Retry-After."""
+    httpx_mock.add_response(status_code=429, text="slow down", headers={"Retry-After": "0"})
+    httpx_mock.add_response(status_code=503, text="unavailable", headers={"Retry-After": "0"})
+    httpx_mock.add_response(status_code=200, text="ok")
+
+    status, content = await call_http(method="GET", url="https://throttled.example.com")
+
+    assert status == 200
+    assert content == "ok"
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.asyncio
+async def test_call_http_returns_last_throttled_response(httpx_mock):
+    """Test that the throttled response is returned once retries are exhausted."""
+    httpx_mock.add_response(status_code=429, text="slow down", headers={"Retry-After": "0"})
+    httpx_mock.add_response(status_code=429, text="still slow", headers={"Retry-After": "0"})
+
+    status, content = await call_http(method="GET", url="https://throttled.example.com", retries=1)
+
+    assert status == 429
+    assert content == "still slow"
+
+
+@pytest.mark.asyncio
+async def test_call_http_fails_fast_when_circuit_open(httpx_mock):
+    """Test that requests are not sent while the host's circuit is open."""
+    url = "https://down.example.com/api"
+    breaker = get_circuit_breaker(url)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    status, content = await call_http(method="GET", url=url)
+
+    assert status == 503
+    assert "Circuit open" in content
+    assert httpx_mock.get_requests() == []
+    breaker.record_success()
+
+
+@pytest.mark.asyncio
+async def test_call_http_records_failures(httpx_mock):
+    """Test that server errors count towards opening the circuit."""
+    url = "https://flaky.example.com/api"
+    breaker = get_circuit_breaker(url)
+    httpx_mock.add_response(status_code=500, text="error")
+    httpx_mock.add_response(status_code=200, text="ok")
+
+    await call_http(method="GET", url=url)
+    assert breaker.failures == 1
+
+    await call_http(method="GET", url=url)
+    assert breaker.failures == 0
+
+
 @pytest.mark.asyncio
 async def test_call_http_unsupported_method(httpx_mock):
     """Test handling of unsupported HTTP methods."""
@@ -265,3 +495,353 @@ async def test_call_http_unsupported_method(httpx_mock):
     )
 
     assert status == 405
+
+
+@pytest.mark.asyncio
+async def test_get_http_client_is_shared():
+    """Test that the HTTP client is created once and reused."""
+    await close_http_client()
+
+    client = get_http_client()
+    assert isinstance(client, httpx.AsyncClient)
+    assert get_http_client() is client
+
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+
+
+@pytest.mark.asyncio
+async def test_get_http_client_http2_fallback(monkeypatch):
+    """Test that HTTP/2 falls back to HTTP/1.1 when 'h2' is not installed."""
+    await close_http_client()
+    monkeypatch.setattr(settings, "HTTP2", True)
+    monkeypatch.setattr("mcp_alphafold.utils.http.importlib.util.find_spec", lambda name: None)
+
+    client = get_http_client()
+    assert isinstance(client, httpx.AsyncClient)
+
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_call_http_reuses_client(httpx_mock, mocker):
+    """Test that consecutive requests go through the shared client."""
+    httpx_mock.add_response(status_code=200, text="first")
+    httpx_mock.add_response(status_code=200, text="second")
+    spy = mocker.spy(get_http_client(), "get")
+
+    assert await call_http(method="GET", url="https://api.example.com") == (200, "first")
+    assert await call_http(method="GET", url="https://api.example.com") == (200, "second")
+    assert spy.call_count == 2
+
+
+def clear_cached_url(url):
+    """Remove a GET request for the URL from both cache tiers."""
+    cache_key = generate_cache_key("GET", url, None)
+    for key in [cache_key, *generate_legacy_cache_keys("GET", url, None)]:
+        get_cache().delete(key)
+        get_cache().delete(f"{key}:error")
+    get_memory_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_request_api_coalesces_concurrent_requests(mock_cache_dir, mocker):
+    """Test that concurrent identical requests share one upstream call."""
+
+    async def slow_call_http(**kwargs):
+        await asyncio.sleep(0.05)
+        return 200, '{"name": "coalesced", "value": 1}'
+
+    mock_call_http = mocker.patch("mcp_alphafold.utils.http.call_http", side_effect=slow_call_http)
+    url = "https://api.example.com/coalesce"
+    clear_cached_url(url)
+
+    results = await asyncio.gather(*[request_api(url=url, response_model_type=ResponseModel) for _ in range(10)])
+
+    assert mock_call_http.call_count == 1
+    assert all(result is results[0] for result in results)
+    assert results[0][0] == ResponseModel(name="coalesced", value=1)
+
+
+@pytest.mark.asyncio
+async def test_request_api_coalesced_caller_cancellation(mock_cache_dir, mocker):
+    """Test that cancelling one caller does not cancel the shared request."""
+
+    async def slow_call_http(**kwargs):
+        await asyncio.sleep(0.05)
+        return 200, '{"name": "shared", "value": 2}'
+
+    mocker.patch("mcp_alphafold.utils.http.call_http", side_effect=slow_call_http)
+    url = "https://api.example.com/coalesce-cancel"
+    clear_cached_url(url)
+
+    first = asyncio.create_task(request_api(url=url, response_model_type=ResponseModel))
+    second = asyncio.create_task(request_api(url=url, response_model_type=ResponseModel))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    result, error = await second
+    assert error is None
+    assert result == ResponseModel(name="shared", value=2)
+
+
+@pytest.mark.asyncio
+async def test_request_api_caches_validated_models(mock_cache_dir, mocker):
+    """Test that memory hits return the stored model without re-validating it."""
+    mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(200, '{"name": "model", "value": 3}'))
+    url = "https://api.example.com/model"
+    clear_cached_url(url)
+
+    first, _ = await request_api(url=url, response_model_type=ResponseModel)
+    validate = mocker.spy(ResponseModel, "model_validate_json")
+    second, error = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert error is None
+    assert second is first
+    validate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_request_api_promotes_disk_hits_to_models(mock_cache_dir, mocker):
+    """Test that a disk hit is validated once and then served from memory."""
+    url = "https://api.example.com/model-disk"
+    clear_cached_url(url)
+    cache_key = generate_cache_key("GET", url, None)
+    cache_response(cache_key, '{"name": "disk", "value": 4}', 3600, memory=False)
+    validate = mocker.spy(ResponseModel, "model_validate_json")
+
+    first, _ = await request_api(url=url, response_model_type=ResponseModel)
+    second, _ = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert first == ResponseModel(name="disk", value=4)
+    assert second is first
+    assert validate.call_count == 1
+    assert cache_key not in get_memory_cache()
+
+
+def test_estimate_model_size(mocker, monkeypatch):
+    """Test that cached models are charged their memory, measured once per model type."""
+    monkeypatch.setattr(http, "_model_size_ratios", {})
+    small = ListModel(names=["a"])
+    large = ListModel(names=[f"name-{index}" for index in range(200)])
+    assert len(large.model_dump_json()) >= MODEL_SIZE_SAMPLE_MIN
+
+    # Small responses are walked, the first large one sets the ratio of the type
+    assert estimate_model_size(small, len(small.model_dump_json())) == get_model_size(small)
+    size = estimate_model_size(large, len(large.model_dump_json()))
+    assert size == get_model_size(large)
+    assert size > 3 * len(large.model_dump_json())
+
+    walk = mocker.spy(http, "get_model_size")
+    assert estimate_model_size(large, 2 * len(large.model_dump_json())) == pytest.approx(2 * size, abs=1)
+    walk.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_request_api_without_model_cache(mock_cache_dir, mocker, monkeypatch):
+    """Test that raw text is kept in memory when model caching is disabled."""
+    monkeypatch.setattr(settings, "MEMORY_CACHE_MODELS", False)
+    mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(200, '{"name": "raw", "value": 5}'))
+    url = "https://api.example.com/model-disabled"
+    clear_cached_url(url)
+
+    first, _ = await request_api(url=url, response_model_type=ResponseModel)
+    second, _ = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert first == second
+    assert second is not first
+    assert generate_cache_key("GET", url, None) in get_memory_cache()
+
+
+@pytest.mark.asyncio
+async def test_request_api_serves_stale_while_revalidating(mock_cache_dir, mocker):
+    """Test that a stale entry is returned immediately and refreshed in the background."""
+    url = "https://api.example.com/stale"
+    clear_cached_url(url)
+    cache_key = generate_cache_key("GET", url, None)
+    cache_response(cache_key, '{"name": "stale", "value": 6}', 0, memory=False)
+
+    refreshed = asyncio.Event()
+
+    async def refresh_call_http(**kwargs):
+        refreshed.set()
+        return 200, '{"name": "fresh", "value": 7}'
+
+    mock_call_http = mocker.patch("mcp_alphafold.utils.http.call_http", side_effect=refresh_call_http)
+
+    result, error = await request_api(url=url, response_model_type=ResponseModel)
+    assert error is None
+    assert result == ResponseModel(name="stale", value=6)
+
+    await asyncio.wait_for(refreshed.wait(), timeout=1)
+    await asyncio.sleep(0)
+    result, _ = await request_api(url=url, response_model_type=ResponseModel)
+    assert result == ResponseModel(name="fresh", value=7)
+    assert mock_call_http.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_request_api_stale_disabled(mock_cache_dir, mocker, monkeypatch):
+    """Test that expired entries are re-fetched when stale serving is disabled."""
+    monkeypatch.setattr(settings, "CACHE_STALE_TTL", 0)
+    url = "https://api.example.com/stale-disabled"
+    clear_cached_url(url)
+    cache_response(generate_cache_key("GET", url, None), '{"name": "stale", "value": 8}', 0, memory=False)
+    mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(200, '{"name": "fresh", "value": 9}'))
+
+    result, _ = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert result == ResponseModel(name="fresh", value=9)
+
+
+@pytest.mark.asyncio
+async def test_request_api_negative_cache(mock_cache_dir, mocker):
+    """Test that definitive errors are cached."""
+    url = "https://api.example.com/not-found"
+    clear_cached_url(url)
+    mock_call_http = mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(404, "Not Found"))
+
+    _, first_error = await request_api(url=url, response_model_type=ResponseModel)
+    _, second_error = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert first_error == RequestError(code=404, message="Not Found")
+    assert second_error == first_error
+    assert mock_call_http.call_count == 1
+
+    # A later successful response replaces the cached error
+    cache_response(generate_cache_key("GET", url, None), '{"name": "found", "value": 10}', 3600)
+    result, error = await request_api(url=url, response_model_type=ResponseModel)
+    assert error is None
+    assert result == ResponseModel(name="found", value=10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_models", [True, False])
+async def test_request_api_memory_hits_skip_disk(mock_cache_dir, mocker, monkeypatch, cache_models):
+    """Test that memory hits of models and raw content do not read the disk tier or the negative cache."""
+    monkeypatch.setattr(settings, "MEMORY_CACHE_MODELS", cache_models)
+    mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(200, '{"name": "memory", "value": 6}'))
+    url = f"https://api.example.com/memory/{cache_models}"
+    clear_cached_url(url)
+    await request_api(url=url, response_model_type=ResponseModel)
+    disk_get = mocker.patch.object(get_cache(), "get", wraps=get_cache().get)
+
+    result, error = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert error is None
+    assert result == ResponseModel(name="memory", value=6)
+    disk_get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cached_error_replaces_content(mock_cache_dir, mocker):
+    """Test that an error cached for a request evicts its content from both tiers."""
+    mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(200, '{"name": "gone", "value": 7}'))
+    url = "https://api.example.com/removed"
+    clear_cached_url(url)
+    cache_key = generate_cache_key("GET", url, None)
+    await request_api(url=url, response_model_type=ResponseModel)
+
+    cache_error(cache_key, RequestError(code=404, message="Not Found"), 3600, ResponseModel)
+    _, error = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert error == RequestError(code=404, message="Not Found")
+    assert get_cache().get(cache_key) is None
+
+
+@pytest.mark.asyncio
+async def test_request_api_does_not_cache_transient_errors(mock_cache_dir, mocker):
+    """Test that transient errors are not cached."""
+    url = "https://api.example.com/unavailable"
+    clear_cached_url(url)
+    mock_call_http = mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(503, "Unavailable"))
+
+    await request_api(url=url, response_model_type=ResponseModel)
+    await request_api(url=url, response_model_type=ResponseModel)
+
+    assert mock_call_http.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_request_api_serves_stale_when_circuit_open(mock_cache_dir, mocker, monkeypatch):
+    """Test that stale entries are served without a refresh while the circuit is open."""
+    monkeypatch.setattr(settings, "CACHE_STALE_TTL", 0)
+    url = "https://outage.example.com/api"
+    clear_cached_url(url)
+    cache_key = generate_cache_key("GET", url, None)
+    get_cache().set(cache_key, '{"name": "stale", "value": 11}', expire=3600, tag=time.time() - 1)
+    breaker = get_circuit_breaker(url)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    mock_call_http = mocker.patch("mcp_alphafold.utils.http.call_http")
+
+    result, error = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert error is None
+    assert result == ResponseModel(name="stale", value=11)
+    mock_call_http.assert_not_called()
+    breaker.record_success()
+
+
+@pytest.mark.asyncio
+async def test_request_api_migrates_legacy_entries(isolated_cache, mocker, monkeypatch):
+    """Test that responses cached by versions before sharding are moved to the current key."""
+    url = f"https://api.example.com/legacy/{uuid.uuid4()}"
+    legacy_key = generate_legacy_cache_keys("GET", url, None)[0]
+    other_url = f"{url}/other"
+    legacy = Cache(str(isolated_cache))
+    legacy.set(legacy_key, '{"name": "legacy", "value": 12}', expire=3600)
+    legacy.set(generate_legacy_cache_keys("GET", other_url, None)[0], '{"name": "other", "value": 1}', expire=3600)
+    legacy.close()
+    mock_call_http = mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(200, "{}"))
+
+    result, error = await request_api(url=url, response_model_type=ResponseModel)
+
+    assert error is None
+    assert result == ResponseModel(name="legacy", value=12)
+    mock_call_http.assert_not_called()
+    assert get_cache().get(legacy_key) is None
+    _, expire_time = get_cache().get(generate_cache_key("GET", url, None), expire_time=True)
+    assert expire_time == pytest.approx(time.time() + 3600, abs=5)
+
+    # Legacy entries are left alone when the migration is disabled
+    monkeypatch.setattr(settings, "CACHE_MIGRATE_LEGACY_KEYS", False)
+    mock_call_http.return_value = (200, '{"name": "fresh", "value": 13}')
+    result, _ = await request_api(url=other_url, response_model_type=ResponseModel)
+    assert result == ResponseModel(name="fresh", value=13)
+
+
+@pytest.mark.asyncio
+async def test_request_api_skips_legacy_lookups_without_legacy_entries(isolated_cache, mocker):
+    """Test that misses do not look up legacy keys when no legacy entries were imported."""
+    mock_migrate = mocker.patch("mcp_alphafold.utils.http.migrate_legacy_entry", return_value=False)
+    mocker.patch("mcp_alphafold.utils.http.call_http", return_value=(200, '{"name": "fresh", "value": 13}'))
+
+    result, _ = await request_api(url=f"https://api.example.com/{uuid.uuid4()}", response_model_type=ResponseModel)
+
+    assert result == ResponseModel(name="fresh", value=13)
+    mock_migrate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_request_api_records_metrics(mock_cache_dir, mocker):
+    """Test that cache results and upstream requests are counted."""
+    url = f"https://metrics.example.com/{uuid.uuid4().hex}"
+    labels = ("metrics.example.com",)
+    mock_client = mocker.AsyncMock()
+    mock_client.get.return_value = httpx.Response(200, text='{"name": "metrics", "value": 14}')
+    mocker.patch("mcp_alphafold.utils.http.get_http_client", return_value=mock_client)
+    misses, memory_hits = API_DURATION.count(("miss",)), API_DURATION.count(("memory",))
+    upstream = UPSTREAM_REQUESTS.value((*labels, "200"))
+
+    await request_api(url=url, response_model_type=ResponseModel)
+    await request_api(url=url, response_model_type=ResponseModel)
+
+    assert API_DURATION.count(("miss",)) == misses + 1
+    assert API_DURATION.count(("memory",)) == memory_hits + 1
+    assert UPSTREAM_REQUESTS.value((*labels, "200")) == upstream + 1
+    assert UPSTREAM_DURATION.count(labels) == 1
+    assert UPSTREAM_IN_FLIGHT.value(labels) == 0
+    assert INFLIGHT_FETCHES.value() == 0
+    clear_cached_url(url)
@@ -0,0 +1,82 @@
+import time
+
+from mcp_alphafold.utils.lru import LRUCache
+
+
+def test_get_and_set():
+    """Test storing and retrieving values."""
+    cache = LRUCache(max_entries=10, max_bytes=1024)
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used_entry():
+    """Test that the entry-count limit evicts the least recently used key."""
+    cache = LRUCache(max_entries=2, max_bytes=1024)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_when_over_size_budget():
+    """Test that the byte budget is enforced."""
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+
+    assert "a" not in cache
+    assert "b" in cache
+    assert cache.size == 6
+
+
+def test_skips_values_larger_than_budget():
+    """Test that a value larger than the whole budget is not stored."""
+    cache = LRUCache(max_entries=10, max_bytes=4)
+    cache.set("big", "too large")
+
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_expiry():
+    """Test that expired entries are treated as misses."""
+    cache = LRUCache(max_entries=10, max_bytes=1024)
+    cache.set("expired", "value", expire=0)
+    cache.set("past", "value", expires_at=time.time() - 1)
+    cache.set("fresh", "value", expire=60)
+
+    assert cache.get("expired") is None
+    assert cache.get("past") is None
+    assert cache.get("fresh") == "value"
+    assert cache.size == len("value")
+
+
+def test_disabled_cache():
+    """Test that a zero entry limit disables the cache."""
+    cache = LRUCache(max_entries=0, max_bytes=1024)
+    cache.set("key", "value")
+
+    assert cache.get("key") is None
+
+
+def test_delete_and_clear():
+    """Test removing entries."""
+    cache = LRUCache(max_entries=10, max_bytes=1024)
+    cache.set("a", "1")
+    cache.set("b", "2")
+
+    assert cache.delete("a") is True
+    assert cache.delete("a") is False
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
@@ -0,0 +1,148 @@
+import inspect
+import json
+import os
+import subprocess
+import uuid
+
+import pytest
+
+from mcp_alphafold.utils.metrics import (
+    TOOL_CALLS,
+    TOOL_DURATION,
+    TOOLS_IN_PROGRESS,
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+    _registry,
+    enable_multiprocess,
+    instrument_tool,
+    render_metrics,
+)
+
+
+@pytest.fixture
+def metric_name():
+    """Return a unique metric name and unregister the metrics created with it."""
+    name = f"test_{uuid.uuid4().hex[:8]}"
+    yield name
+    _registry[:] = [metric for metric in _registry if not metric.name.startswith(name)]
+
+
+def test_counter_and_gauge(metric_name):
+    """Test counter and gauge updates per label set."""
+    counter = Counter(f"{metric_name}_total", "Requests.", ("status",))
+    counter.inc(("ok",))
+    counter.inc(("ok",), 2)
+    counter.inc(("error",))
+    assert counter.value(("ok",)) == 3
+    assert counter.value(("error",)) == 1
+    assert counter.value(("missing",)) == 0
+
+    gauge = Gauge(f"{metric_name}_in_flight", "In flight.")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert gauge.value() == 1
+    gauge.set(5)
+    assert gauge.value() == 5
+
+
+def test_histogram_render(metric_name):
+    """Test that histogram buckets are cumulative and inclusive of their upper bound."""
+    histogram = Histogram(metric_name, "Latency.", ("host",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, ("a.org",))
+
+    assert histogram.count(("a.org",)) == 4
+    assert histogram.sum(("a.org",)) == pytest.approx(2.65)
+    assert histogram.render() == [
+        f"# HELP {metric_name} Latency.",
+        f"# TYPE {metric_name} histogram",
+        f'{metric_name}_bucket{{host="a.org",le="0.1"}} 2.0',
+        f'{metric_name}_bucket{{host="a.org",le="1.0"}} 3.0',
+        f'{metric_name}_bucket{{host="a.org",le="+Inf"}} 4.0',
+        f'{metric_name}_sum{{host="a.org"}} 2.65',
+        f'{metric_name}_count{{host="a.org"}} 4.0',
+    ]
+
+
+def test_render_metrics_escapes_labels(metric_name):
+    """Test the text exposition of all registered metrics."""
+    counter = Counter(f"{metric_name}_total", 'Calls of "tools"\\', ("tool",))
+    counter.inc(('say "hi"\n',))
+
+    text = render_metrics()
+    assert text.endswith("\n")
+    assert f'# HELP {metric_name}_total Calls of "tools"\\\\\n' in text
+    assert f"# TYPE {metric_name}_total counter" in text
+    assert f'{metric_name}_total{{tool="say \\"hi\\"\\n"}} 1.0' in text
+    assert "# TYPE alphafold_mcp_upstream_request_duration_seconds histogram" in text
+    assert "# TYPE process_cpu_seconds_total counter" in text
+
+
+def test_metric_requires_samples(metric_name):
+    """Test that a metric type without samples cannot be created."""
+
+    class Incomplete(Metric):
+        type = "gauge"
+
+    with pytest.raises(TypeError):
+        Incomplete(metric_name, "Incomplete.")
+
+
+def test_render_metrics_sums_worker_snapshots(metric_name, tmp_path, monkeypatch):
+    """Test that shared metrics sum the workers, keeping the counters of exited workers only."""
+    monkeypatch.setattr("mcp_alphafold.utils.metrics._snapshot_dir", None)
+    counter = Counter(f"{metric_name}_total", "Requests.", ("status",))
+    gauge = Gauge(f"{metric_name}_in_flight", "In flight.")
+    histogram = Histogram(f"{metric_name}_seconds", "Latency.", buckets=(1.0,))
+    counter.inc(("ok",))
+    gauge.inc()
+    histogram.observe(0.5)
+
+    exited = subprocess.Popen(["true"])
+    exited.wait()
+    snapshot = {counter.name: [[["ok"], 5]], gauge.name: [[[], 3]], histogram.name: [[[], [0, 2], 4.0]]}
+    (tmp_path / f"{exited.pid}.json").write_text(json.dumps(snapshot))
+    snapshot = {counter.name: [[["ok"], 2]], gauge.name: [[[], 4]], histogram.name: [[[], [1, 0], 0.25]]}
+    (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(snapshot))
+    enable_multiprocess(str(tmp_path))
+
+    text = render_metrics()
+    assert f'{metric_name}_total{{status="ok"}} 8.0' in text
+    assert f"{metric_name}_in_flight 5.0" in text
+    assert f'{metric_name}_seconds_bucket{{le="1.0"}} 2.0' in text
+    assert f"{metric_name}_seconds_count 4.0" in text
+    assert f"{metric_name}_seconds_sum 4.75" in text
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    assert counter.value(("ok",)) == 1
+
+
+@pytest.mark.asyncio
+async def test_instrument_tool():
+    """Test that tool calls are counted by outcome and timed."""
+    name = f"tool_{uuid.uuid4().hex[:8]}"
+
+    async def tool(qualifier: str, output_json: bool = True):
+        if qualifier == "boom":
+            raise RuntimeError("boom")
+        if qualifier == "missing":
+            return '{"error": "Error 404: Not Found"}'
+        return {"qualifier": qualifier}
+
+    tool.__name__ = name
+    instrumented = instrument_tool(tool)
+    assert instrumented.__name__ == name
+    assert list(inspect.signature(instrumented).parameters) == ["qualifier", "output_json"]
+
+    assert await instrumented("P00520") == {"qualifier": "P00520"}
+    await instrumented(qualifier="missing")
+    with pytest.raises(RuntimeError):
+        await instrumented("boom")
+
+    assert TOOL_CALLS.value((name, "ok")) == 1
+    assert TOOL_CALLS.value((name, "error")) == 1
+    assert TOOL_CALLS.value((name, "exception")) == 1
+    assert TOOL_DURATION.count((name,)) == 3
+    assert TOOLS_IN_PROGRESS.value((name,)) == 0
@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import os
+
+import httpx
+import pytest
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils.store import FileStore
+
+URL = "https://files.example.com/AF-P12345-F1-model_v4.cif"
+CONTENT = b"data_AF-P12345-F1\n" * 1000
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileStore(str(tmp_path / "files"))
+
+
+@pytest.mark.asyncio
+async def test_fetch_downloads_into_content_addressed_path(store, httpx_mock):
+    """Test that a download is stored under the SHA-256 of its content."""
+    httpx_mock.add_response(url=URL, content=CONTENT, headers={"ETag": '"v1"', "Content-Type": "chemical/x-mmcif"})
+
+    stored, error = await store.fetch(URL)
+
+    digest = hashlib.sha256(CONTENT).hexdigest()
+    assert error is None
+    assert stored.sha256 == digest
+    assert stored.size == len(CONTENT)
+    assert stored.etag == '"v1"'
+    assert stored.path == str(store.object_path(digest))
+    assert store.object_path(digest).read_bytes() == CONTENT
+    assert not store.partial_path(URL).exists()
+
+
+@pytest.mark.asyncio
+async def test_fetch_uses_stored_file_within_max_age(store, httpx_mock):
+    """Test that a fresh stored file is returned without a request."""
+    httpx_mock.add_response(url=URL, content=CONTENT)
+    first, _ = await store.fetch(URL)
+
+    second, _ = await store.fetch(URL)
+
+    assert second == first
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_revalidates_with_conditional_request(store, httpx_mock):
+    """Test that an expired file is revalidated with its ETag and Last-Modified."""
+    last_modified = "Tue, 30 May 2023 08:52:02 GMT"
+    httpx_mock.add_response(url=URL, content=CONTENT, headers={"ETag": '"v1"', "Last-Modified": last_modified})
+    httpx_mock.add_response(
+        url=URL,
+        status_code=304,
+        match_headers={"If-None-Match": '"v1"', "If-Modified-Since": last_modified},
+    )
+    first, _ = await store.fetch(URL)
+
+    second, error = await store.fetch(URL, max_age=0)
+
+    assert error is None
+    assert second.sha256 == first.sha256
+    assert second.fetched_at >= first.fetched_at
+
+
+@pytest.mark.asyncio
+async def test_fetch_replaces_changed_file(store, httpx_mock):
+    """Test that a changed upstream file gets a new content address."""
+    httpx_mock.add_response(url=URL, content=CONTENT, headers={"ETag": '"v1"'})
+    httpx_mock.add_response(url=URL, content=b"new content", headers={"ETag": '"v2"'})
+    first, _ = await store.fetch(URL)
+
+    second, _ = await store.fetch(URL, max_age=0)
+
+    assert second.sha256 != first.sha256
+    assert store.read_range(second) == b"new content"
+    assert not store.object_path(first.sha256).exists()
+
+
+@pytest.mark.asyncio
+async def test_fetch_resumes_partial_download(store, httpx_mock):
+    """Test that an interrupted download is resumed with a range request."""
+    head, tail = CONTENT[:1000], CONTENT[1000:]
+    store.partial_path(URL).write_bytes(head)
+    store.index.set(f"partial:{URL}", '"v1"')
+    httpx_mock.add_response(
+        url=URL,
+        status_code=206,
+        content=tail,
+        headers={"ETag": '"v1"'},
+        match_headers={"Range": "bytes=1000-", "If-Range": '"v1"'},
+    )
+
+    stored, error = await store.fetch(URL)
+
+    assert error is None
+    assert stored.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert store.read_range(stored) == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_fetch_returns_stored_file_when_upstream_fails(store, httpx_mock):
+    """Test that a stored file is served when revalidation fails."""
+    httpx_mock.add_response(url=URL, content=CONTENT)
+    httpx_mock.add_exception(httpx.ConnectError("Connection failed"), url=URL)
+    first, _ = await store.fetch(URL)
+
+    second, error = await store.fetch(URL, max_age=0)
+
+    assert error is None
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_fetch_error(store, httpx_mock):
+    """Test that upstream errors are returned."""
+    httpx_mock.add_response(url=URL, status_code=404)
+
+    stored, error = await store.fetch(URL)
+
+    assert stored is None
+    assert error.code == 404
+
+
+@pytest.mark.asyncio
+async def test_read_range_and_chunks(store, httpx_mock):
+    """Test reading parts of a stored file."""
+    httpx_mock.add_response(url=URL, content=CONTENT)
+    stored, _ = await store.fetch(URL)
+
+    assert store.read_range(stored, offset=5, length=10) == CONTENT[5:15]
+    assert b"".join(store.iter_chunks(stored, chunk_size=100)) == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_share_one_download(store, httpx_mock):
+    """Test that concurrent fetches of a URL share a single download."""
+    httpx_mock.add_response(url=URL, content=CONTENT)
+
+    results = await asyncio.gather(*(store.fetch(URL) for _ in range(3)))
+
+    assert [error for _, error in results] == [None, None, None]
+    assert len({stored.path for stored, _ in results}) == 1
+    assert len(httpx_mock.get_requests()) == 1
+    assert list(store.partial_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_interrupted_download_is_kept_for_resume(store, httpx_mock, monkeypatch):
+    """Test that the received part of an interrupted download is resumed by the next fetch."""
+    monkeypatch.setattr(settings, "FILE_STORE_CHUNK_SIZE", 100)
+
+    async def interrupted_body():
+        yield CONTENT[:1000]
+        raise httpx.ReadError("Connection reset")
+
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(200, headers={"ETag": '"v1"'}, content=interrupted_body()), url=URL
+    )
+    httpx_mock.add_response(
+        url=URL,
+        status_code=206,
+        content=CONTENT[1000:],
+        headers={"ETag": '"v1"'},
+        match_headers={"Range": "bytes=1000-", "If-Range": '"v1"'},
+    )
+
+    _, error = await store.fetch(URL)
+    assert error.code == 599
+    assert store.partial_path(URL).read_bytes() == CONTENT[:1000]
+
+    stored, error = await store.fetch(URL)
+    assert error is None
+    assert store.read_range(stored) == CONTENT
+    assert list(store.partial_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_changed_file_keeps_object_used_by_another_url(store, httpx_mock):
+    """Test that an object replaced for one URL is kept while another URL uses it."""
+    other_url = URL.replace(".cif", "-copy.cif")
+    httpx_mock.add_response(url=URL, content=CONTENT)
+    httpx_mock.add_response(url=other_url, content=CONTENT)
+    httpx_mock.add_response(url=URL, content=b"new content")
+    first, _ = await store.fetch(URL)
+    await store.fetch(other_url)
+
+    await store.fetch(URL, max_age=0)
+
+    assert store.object_path(first.sha256).exists()
+    assert store.read_range(store.get(other_url)) == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_fetch_evicts_least_recently_used_objects(store, httpx_mock, monkeypatch):
+    """Test that the least recently used objects are evicted above the size limit."""
+    monkeypatch.setattr(settings, "FILE_STORE_SIZE_LIMIT", 2 * len(CONTENT) + 1000)
+    urls = [URL.replace("P12345", accession) for accession in ("P00001", "P00002", "P00003")]
+    for index, url in enumerate(urls):
+        httpx_mock.add_response(url=url, content=CONTENT + url.encode())
+        stored, _ = await store.fetch(url)
+        os.utime(stored.path, (index, index))
+
+    assert store.get(urls[0]) is None
+    assert store.get(urls[1]) is not None
+    assert store.get(urls[2]) is not None
+
+
+def test_prune_removes_stale_partials_and_unused_objects(store, monkeypatch):
+    """Test that prune removes old partial downloads and objects no URL uses."""
+    monkeypatch.setattr(settings, "FILE_STORE_PARTIAL_TTL", 60)
+    stale, recent = store.partial_dir / "stale", store.partial_dir / "recent"
+    unused = store.object_path("ab" * 32)
+    unused.parent.mkdir(parents=True)
+    for path in (stale, recent, unused):
+        path.write_bytes(CONTENT)
+    for path in (stale, unused):
+        os.utime(path, (0, 0))
+
+    assert store.prune() == {"partials": 1, "unused": 1, "evicted": 0}
+    assert not stale.exists()
+    assert recent.exists()
+    assert not unused.exists()
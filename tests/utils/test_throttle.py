@@ -0,0 +1,124 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils.throttle import HostLimiter, TokenBucket, get_host_limiter, parse_retry_after
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    """Test that requests beyond the burst are spread out at the configured rate."""
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+
+    assert time.monotonic() - start >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst():
+    """Test that a full bucket serves a burst without waiting."""
+    bucket = TokenBucket(rate=1, capacity=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+
+    assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_pause():
+    """Test that a pause holds back callers even when tokens are available."""
+    bucket = TokenBucket(rate=0, capacity=1)
+    bucket.pause(0.05)
+
+    start = time.monotonic()
+    await bucket.acquire()
+
+    assert time.monotonic() - start >= 0.04
+
+
+def test_token_bucket_adaptive_rate():
+    """Test that the rate is halved on throttling and recovers on success."""
+    bucket = TokenBucket(rate=10, capacity=1)
+
+    bucket.slow_down()
+    assert bucket.rate == 5
+    for _ in range(10):
+        bucket.slow_down()
+    assert bucket.rate == 1
+
+    for _ in range(100):
+        bucket.speed_up()
+    assert bucket.rate == 10
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_caps_in_flight_requests():
+    """Test that no more than max_in_flight requests run at once."""
+    limiter = HostLimiter(rate=0, burst=1, max_in_flight=2)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request():
+        nonlocal in_flight, max_in_flight
+        async with limiter.slot():
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*[request() for _ in range(6)])
+
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_backoff(monkeypatch):
+    """Test that backoff honors Retry-After and caps it."""
+    monkeypatch.setattr(settings, "UPSTREAM_MAX_RETRY_AFTER", 5)
+    limiter = HostLimiter(rate=10, burst=1, max_in_flight=0)
+
+    assert limiter.backoff(attempt=0, backoff_factor=0.5, retry_after="2") == 2
+    assert limiter.backoff(attempt=0, backoff_factor=0.5, retry_after="120") == 5
+    assert 2 <= limiter.backoff(attempt=2, backoff_factor=0.5) <= 2.1
+    assert limiter.bucket.rate < 10
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("", None),
+        ("3", 3.0),
+        ("1.5", 1.5),
+        ("-1", 0.0),
+        ("not a date", None),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    """Test parsing Retry-After given in seconds."""
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    """Test parsing Retry-After given as an HTTP date."""
+    delay = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+
+    assert delay is not None
+    assert 28 <= delay <= 30
+
+
+@pytest.mark.asyncio
+async def test_get_host_limiter_per_host():
+    """Test that limiters are shared per host."""
+    first = get_host_limiter("https://alphafold.ebi.ac.uk/api/prediction/P12345")
+
+    assert get_host_limiter("https://alphafold.ebi.ac.uk/api/uniprot/summary/P12345.json") is first
+    assert get_host_limiter("https://rest.uniprot.org/uniprotkb/P12345") is not first
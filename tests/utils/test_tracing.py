@@ -0,0 +1,127 @@
+import uuid
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from mcp_alphafold.settings import settings
+from mcp_alphafold.utils import tracing
+from mcp_alphafold.utils.http import generate_cache_key, get_cache, get_memory_cache, request_api
+from mcp_alphafold.utils.metrics import instrument_tool
+from mcp_alphafold.utils.tracing import NOOP_SPAN, setup_tracing, start_span, start_tool_span, tracing_enabled
+
+trace = pytest.importorskip("opentelemetry.trace")
+
+
+@pytest.mark.skip(reason="Model class, not a test class")
+class ResponseModel(BaseModel):
+    name: str
+    value: int
+
+
+class RecordedSpan:
+    def __init__(self, name, attributes, kwargs):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.kwargs = kwargs
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class RecordingTracer:
+    """Record started spans without the OpenTelemetry SDK."""
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None, **kwargs):
+        span = RecordedSpan(name, attributes, kwargs)
+        self.spans.append(span)
+        yield span
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """Replace the tracer with a recording one."""
+    recording = RecordingTracer()
+    monkeypatch.setattr(tracing, "_tracer", recording)
+    return recording
+
+
+def test_start_span_is_noop_when_disabled(monkeypatch):
+    """Test that no OpenTelemetry span is started when tracing is disabled."""
+    monkeypatch.setattr(settings, "TRACING_ENABLED", False)
+    setup_tracing()
+
+    assert not tracing_enabled()
+    assert start_span("cache.lookup") is NOOP_SPAN
+    assert start_tool_span("get_uniprot_summary") is NOOP_SPAN
+    with start_span("cache.lookup") as span:
+        span.set_attribute("cache.result", "hit")
+        assert not span.is_recording()
+
+
+def test_setup_tracing(monkeypatch):
+    """Test that enabling tracing creates a tracer."""
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    setup_tracing()
+    try:
+        assert tracing_enabled()
+        with start_span("cache.lookup") as span:
+            span.set_attribute("cache.result", "hit")
+    finally:
+        monkeypatch.setattr(settings, "TRACING_ENABLED", False)
+        setup_tracing()
+
+
+@pytest.mark.asyncio
+async def test_request_spans(tracer, mocker):
+    """Test the spans of a tool call that misses the cache."""
+    url = f"https://tracing.example.com/{uuid.uuid4().hex}"
+    mock_client = mocker.AsyncMock()
+    mock_client.get.return_value = httpx.Response(200, text='{"name": "traced", "value": 1}')
+    mocker.patch("mcp_alphafold.utils.http.get_http_client", return_value=mock_client)
+
+    async def get_traced(qualifier: str):
+        model, _ = await request_api(url=url, response_model_type=ResponseModel)
+        return model.model_dump()
+
+    result = await instrument_tool(get_traced)(qualifier="P00520")
+
+    assert result == {"name": "traced", "value": 1}
+    assert [span.name for span in tracer.spans] == [
+        "tool get_traced",
+        "cache.lookup",
+        "HTTP GET",
+        "response.parse",
+        "cache.store",
+    ]
+    tool, lookup, attempt, parse, _ = tracer.spans
+    assert tool.attributes["mcp.tool.status"] == "ok"
+    assert lookup.attributes["cache.result"] == "miss"
+    assert attempt.attributes["http.response.status_code"] == 200
+    assert attempt.attributes["http.request.resend_count"] == 0
+    assert attempt.attributes["http.response.body.size"] == 30
+    assert parse.attributes["response.model"] == "ResponseModel"
+    get_cache().delete(generate_cache_key("GET", url, None))
+    get_memory_cache().clear()
+
+
+def test_tool_span_continues_incoming_trace(tracer, mocker):
+    """Test that the tool span is a child of the client's traceparent."""
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    mocker.patch(
+        "fastmcp.server.dependencies.get_http_headers",
+        return_value={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"},
+    )
+
+    with start_tool_span("get_uniprot_summary"):
+        pass
+
+    (span,) = tracer.spans
+    parent = trace.get_current_span(span.kwargs["context"]).get_span_context()
+    assert format(parent.trace_id, "032x") == trace_id
+    assert span.kwargs["kind"] == trace.SpanKind.SERVER